@@ -0,0 +1,16 @@
+"""Performance benchmarks for Vyasa's render pipeline.
+
+Generates a seeded synthetic vault (`corpus`), times the hot paths against it
+(`suite`) and compares the medians with a recorded baseline:
+
+    python -m benchmarks --preset small --record   # write benchmarks/baselines/small.json
+    python -m benchmarks --preset small            # exit 1 if anything regressed
+
+Baselines are machine-specific; record them on the machine that runs the
+comparison.
+"""
+
+from .corpus import PRESETS, VaultSpec, generate_vault
+from .suite import Regression, compare, run_suite
+
+__all__ = ["PRESETS", "Regression", "VaultSpec", "compare", "generate_vault", "run_suite"]
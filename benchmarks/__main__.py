@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .corpus import PRESETS
+from .suite import DEFAULT_FLOOR_MS, DEFAULT_THRESHOLD, compare, load_report, run_suite, save_report
+
+_BASELINES = Path(__file__).resolve().parent / "baselines"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Time Vyasa hot paths on a synthetic vault.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (median is reported)")
+    parser.add_argument("--only", nargs="*", default=(), help="benchmark names to run (default: all)")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON (default: benchmarks/baselines/<preset>.json)")
+    parser.add_argument("--record", action="store_true", help="store this run as the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio")
+    parser.add_argument("--floor-ms", type=float, default=DEFAULT_FLOOR_MS, help="never flag medians below this")
+    args = parser.parse_args(argv)
+
+    baseline_path = args.baseline or _BASELINES / f"{args.preset}.json"
+    report = run_suite(PRESETS[args.preset], repeat=args.repeat, only=tuple(args.only))
+    baseline = None if args.record else load_report(baseline_path)
+    previous = (baseline or {}).get("timings_ms", {})
+    for name, current in report["timings_ms"].items():
+        before = previous.get(name)
+        delta = f"  ({current / before:.2f}x of {before:.3f} ms)" if before else ""
+        print(f"{name:28} {current:10.3f} ms{delta}")
+
+    if args.record:
+        save_report(baseline_path, report)
+        print(f"baseline recorded: {baseline_path}")
+        return 0
+    if baseline is None:
+        print(f"no baseline at {baseline_path}; run with --record first")
+        return 0
+    try:
+        regressions = compare(report, baseline, threshold=args.threshold, floor_ms=args.floor_ms)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {regression.current_ms:.3f} ms vs {regression.baseline_ms:.3f} ms "
+            f"({regression.ratio:.2f}x > {args.threshold:.2f}x)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
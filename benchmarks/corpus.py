@@ -0,0 +1,134 @@
+"""Synthetic vault generator for the benchmark suite.
+
+A vault is a folder tree of markdown notes whose size and shape are set by a
+`VaultSpec`: file count, folder depth and fan-out, wikilink density, include
+chains, and how often callouts, math and `tasks` blocks appear. Generation is
+seeded, so the same spec always produces byte-identical content and timings
+from different runs compare like for like. Every vault also carries one `.kg`
+pack for the knowledge-graph query benchmarks.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+_WORDS = (
+    "vyasa render index graph sidebar cache token folder note draft review context "
+    "schema query metric latency branch commit anchor section outline chapter figure "
+    "theorem proof lemma claim evidence source reference summary detail"
+).split()
+
+
+@dataclass(frozen=True)
+class VaultSpec:
+    files: int = 200
+    depth: int = 3
+    fanout: int = 4
+    paragraphs: int = 6
+    wikilink_density: float = 0.3
+    include_chain: int = 3
+    callout_ratio: float = 0.2
+    math_ratio: float = 0.2
+    tasks_ratio: float = 0.1
+    kg_nodes: int = 200
+    kg_contexts: int = 3
+    seed: int = 7
+
+
+PRESETS = {
+    "tiny": VaultSpec(files=12, depth=2, fanout=2, paragraphs=3, include_chain=2, kg_nodes=20, kg_contexts=2),
+    "small": VaultSpec(),
+    "medium": VaultSpec(files=1000, depth=4, fanout=5, kg_nodes=1000),
+    "large": VaultSpec(files=5000, depth=5, fanout=6, kg_nodes=5000, kg_contexts=5),
+}
+
+
+def _folders(spec: VaultSpec) -> list[Path]:
+    folders = [Path()]
+    frontier = [Path()]
+    for level in range(1, spec.depth):
+        frontier = [parent / f"section-{level}-{index}" for parent in frontier for index in range(spec.fanout)]
+        folders.extend(frontier)
+    return folders
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _note(rng: random.Random, spec: VaultSpec, index: int, stems: list[str]) -> str:
+    parts = [f"---\ntitle: Note {index}\n---\n", f"# Note {index}\n"]
+    for paragraph in range(spec.paragraphs):
+        sentences = [_sentence(rng) for _ in range(4)]
+        if rng.random() < spec.wikilink_density:
+            sentences.insert(rng.randrange(len(sentences) + 1), f"See [[{rng.choice(stems)}]].")
+        parts.append(f"## Part {paragraph}\n\n" + " ".join(sentences) + "\n")
+        if rng.random() < spec.callout_ratio:
+            parts.append(f"> [!note] Aside {paragraph}\n> {_sentence(rng)}\n")
+        if rng.random() < spec.math_ratio:
+            parts.append(f"$$\n\\sum_{{i=1}}^{{{paragraph + 2}}} x_i^2 = y_{{{index}}}\n$$\n")
+        if rng.random() < spec.tasks_ratio:
+            parts.append("```tasks\n- [ ] " + _sentence(rng, 5) + "\n- [x] " + _sentence(rng, 5) + "\n```\n")
+    return "\n".join(parts)
+
+
+def _write_kg_pack(folder: Path, rng: random.Random, spec: VaultSpec) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    nodes = [f"n{index}" for index in range(spec.kg_nodes)]
+    (folder / "kg.schema").write_text(
+        "@graph id=bench\npool=kg.nodes\nattrs=kg.attrs\ncontexts=*.context\n"
+        f"default_context=c{spec.kg_contexts - 1}\n\n@sources\nedges=kg.edges\n\n@relations\ndepends_on\n",
+        encoding="utf-8",
+    )
+    (folder / "kg.nodes").write_text("".join(f"{node}: Node {node}\n" for node in nodes), encoding="utf-8")
+    owners = {"Mia": nodes[0::2], "Lee": nodes[1::2]}
+    (folder / "kg.attrs").write_text(
+        "@node_attrs\nowner:\n" + "".join(f"  {owner}: {' '.join(ids)}\n" for owner, ids in owners.items()),
+        encoding="utf-8",
+    )
+    edges = [(nodes[index], nodes[rng.randrange(index)]) for index in range(1, len(nodes))]
+    (folder / "kg.edges").write_text(
+        "".join(f"{source}-depends_on-{target}: {source} -> {target} depends_on\n" for source, target in edges),
+        encoding="utf-8",
+    )
+    for context in range(spec.kg_contexts):
+        kept = [edge for edge in edges if rng.random() < 0.9]
+        done = [node for node in nodes if rng.random() < (context + 1) / (spec.kg_contexts + 1)]
+        (folder / f"c{context}.context").write_text(
+            f"@context id=c{context} seq={context + 1} stage=s{context}\n"
+            f"@attrs\nstatus:\n  done: {' '.join(done) or nodes[0]}\n@edges\n"
+            + "".join(f"  {source}-depends_on-{target}: {source} -> {target} depends_on\n" for source, target in kept),
+            encoding="utf-8",
+        )
+    return folder / "kg.schema"
+
+
+def generate_vault(root: Path, spec: VaultSpec = VaultSpec()) -> Path:
+    """Write a vault for `spec` under `root` (which should be empty) and return `root`."""
+    rng = random.Random(spec.seed)
+    root.mkdir(parents=True, exist_ok=True)
+    folders = _folders(spec)
+    placements = [folders[index % len(folders)] / f"note-{index}.md" for index in range(spec.files)]
+    stems = [path.stem for path in placements]
+    for index, relative in enumerate(placements):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(_note(rng, spec, index, stems), encoding="utf-8")
+    includes = root / "includes"
+    includes.mkdir(exist_ok=True)
+    for level in range(spec.include_chain):
+        body = f"### Included {level}\n\n{_sentence(rng)}\n"
+        if level + 1 < spec.include_chain:
+            body += f"\n{{ ./chain-{level + 1}.md }}\n"
+        (includes / f"chain-{level}.md").write_text(body, encoding="utf-8")
+    (root / "index.md").write_text(
+        "# Bench vault\n\n" + ("{ ./includes/chain-0.md }\n" if spec.include_chain else ""), encoding="utf-8"
+    )
+    _write_kg_pack(root / "graph.kg", rng, spec)
+    return root
+
+
+def kg_schema_path(root: Path) -> Path:
+    return root / "graph.kg" / "kg.schema"
@@ -0,0 +1,169 @@
+"""Hot-path timings over a synthetic vault, with baseline comparison.
+
+Each benchmark is timed `repeat` times after one warm-up call and reported as
+its median in milliseconds. `compare` flags any benchmark whose median exceeds
+its baseline by more than `threshold` (a ratio, so 1.25 allows 25% noise).
+Timings below `floor_ms` are never flagged: their jitter swamps the ratio.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .corpus import VaultSpec, generate_vault, kg_schema_path
+
+DEFAULT_THRESHOLD = 1.25
+DEFAULT_FLOOR_MS = 1.0
+_SAMPLE_DOCS = 25
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def _use_root(root: Path) -> None:
+    from vyasa.config import get_config, reload_config
+    from vyasa.extensions import refresh_extension_runtime
+
+    os.environ["VYASA_ROOT"] = str(root)
+    reload_config()
+    refresh_extension_runtime(get_config().get_extensions_config())
+
+
+def _benchmarks(root: Path, scratch: Path) -> dict[str, Callable[[], object]]:
+    from fasthtml.common import to_xml
+
+    from vyasa.build import build_static_site
+    from vyasa.content_tree import ContentTree
+    from vyasa.extensions_builtin.markdown.render_cache import render_cache
+    from vyasa.extensions_builtin.markdown.renderer import from_md
+    from vyasa.extensions_builtin.tasks.query import KnowledgeGraphQuery
+    from vyasa.file_search import _CACHE as file_search_cache
+    from vyasa.file_search import search_file_records
+    from vyasa.helpers import get_content_mounts
+
+    docs = sorted(root.rglob("note-*.md"))[:_SAMPLE_DOCS] + [root / "index.md"]
+    sources = [(path.read_text(encoding="utf-8"), path.relative_to(root).with_suffix("").as_posix()) for path in docs]
+    schema = kg_schema_path(root)
+
+    def render(cold: bool) -> None:
+        for text, slug in sources:
+            if cold:
+                render_cache().clear()
+            to_xml(from_md(text, current_path=slug))
+
+    def sidebar() -> None:
+        from vyasa import core
+
+        to_xml(core.build_post_tree(core.get_root_folder(), max_depth=None))
+
+    def search(cold: bool) -> None:
+        if cold:
+            file_search_cache.clear()
+        for query in ("note 1", "section", "nte42"):
+            search_file_records(query, get_content_mounts(), (".md",))
+
+    def static_build() -> None:
+        output = scratch / "dist"
+        shutil.rmtree(output, ignore_errors=True)
+        build_static_site(input_dir=root, output_dir=output, jobs=1, clean=True)
+
+    def kg_queries() -> None:
+        query = KnowledgeGraphQuery(schema)
+        query.run("nodes | where owner=Mia | select id")
+        query.run("nodes | where id=n1 | incoming* depends_on | paths | select id path")
+        query.run("diff c0 c1")
+
+    return {
+        "from_md.cold": lambda: render(True),
+        "from_md.cached": lambda: render(False),
+        "content_tree.fingerprint": lambda: ContentTree.from_runtime().fingerprint(),
+        "sidebar.render": sidebar,
+        "search_file_records.cold": lambda: search(True),
+        "search_file_records.warm": lambda: search(False),
+        "kg.query": kg_queries,
+        "build_static_site.clean": static_build,
+    }
+
+
+def run_suite(spec: VaultSpec, *, repeat: int = 5, only: tuple[str, ...] = (), workdir: Path | None = None) -> dict:
+    """Generate a vault for `spec`, time every benchmark (or those in `only`) and return the report."""
+    previous_root = os.environ.get("VYASA_ROOT")
+    with tempfile.TemporaryDirectory(prefix="vyasa-bench-", dir=workdir) as tmp:
+        root = generate_vault(Path(tmp) / "vault", spec)
+        _use_root(root)
+        try:
+            benchmarks = _benchmarks(root, Path(tmp))
+            timings = {name: _median_ms(fn, repeat) for name, fn in benchmarks.items() if not only or name in only}
+        finally:
+            if previous_root is None:
+                os.environ.pop("VYASA_ROOT", None)
+            else:
+                os.environ["VYASA_ROOT"] = previous_root
+            _restore_config()
+    return {"spec": asdict(spec), "repeat": repeat, "timings_ms": timings}
+
+
+def _restore_config() -> None:
+    from vyasa.config import get_config, reload_config
+    from vyasa.extensions import refresh_extension_runtime
+
+    reload_config()
+    refresh_extension_runtime(get_config().get_extensions_config())
+
+
+def compare(
+    report: dict,
+    baseline: dict,
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    floor_ms: float = DEFAULT_FLOOR_MS,
+) -> list[Regression]:
+    """Benchmarks slower than `threshold` x baseline. Reports for a different spec are not comparable."""
+    if baseline.get("spec") != report.get("spec"):
+        raise ValueError("baseline was recorded for a different vault spec; re-record it")
+    regressions = []
+    for name, current in report["timings_ms"].items():
+        previous = baseline.get("timings_ms", {}).get(name)
+        if previous is None or current < floor_ms:
+            continue
+        if current > previous * threshold:
+            regressions.append(Regression(name, previous, current))
+    return regressions
+
+
+def load_report(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def save_report(path: Path, report: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
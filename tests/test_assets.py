@@ -1,6 +1,7 @@
 import asyncio
+from types import SimpleNamespace
 
-from vyasa.assets import bundle_asset_nodes, requested_page_bundles, route_bundle_names
+from vyasa.assets import AssetManifest, asset_url, bundle_asset_nodes, requested_page_bundles, route_bundle_names
 from vyasa.build import build_static_site
 from vyasa.core import extension_static_asset
 from vyasa.extensions import AssetBundle, ExtensionPlan, ExtensionRuntime, build_extension_runtime, get_extension_runtime, set_extension_runtime
@@ -85,6 +86,44 @@ def test_extension_assets_require_browser_revalidation():
     assert response.headers["cache-control"] == "no-cache, max-age=0, must-revalidate"
 
 
+def test_fingerprinted_extension_assets_are_served_immutable():
+    url = asset_url("/static/extensions/tasks/tasks_graph_core.js")
+    token = url.split("?v=", 1)[1]
+
+    fresh = asyncio.run(extension_static_asset("tasks", "tasks_graph_core.js", SimpleNamespace(query_params={"v": token})))
+    stale = asyncio.run(extension_static_asset("tasks", "tasks_graph_core.js", SimpleNamespace(query_params={"v": "0"})))
+
+    assert len(token) == 16
+    assert fresh.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert stale.headers["cache-control"] == "no-cache, max-age=0, must-revalidate"
+
+
+def test_asset_manifest_rehashes_changed_assets(tmp_path, monkeypatch):
+    monkeypatch.setattr("vyasa.assets._RECHECK_SECONDS", 3600.0)  # only the watcher batch refreshes
+    static = tmp_path / "static"
+    static.mkdir()
+    script = static / "asset.js"
+    script.write_text("export const a = 1;\n", encoding="utf-8")
+    runtime = ExtensionRuntime(plan=ExtensionPlan("default", {}, ()), catalog={}, extension_static_dirs={"asset_ext": static})
+    previous = get_extension_runtime()
+    set_extension_runtime(runtime)
+    try:
+        manifest = AssetManifest()
+        before = manifest.token("/static/extensions/asset_ext/asset.js")
+        script.write_text("export const a = 2;\n", encoding="utf-8")
+        unchanged = manifest.token("/static/extensions/asset_ext/asset.js")
+        updated = manifest.apply_changes([(2, str(script))])
+        after = manifest.token("/static/extensions/asset_ext/asset.js")
+        fingerprinted = (manifest.is_fingerprinted(script, after), manifest.is_fingerprinted(script, before))
+    finally:
+        set_extension_runtime(previous)
+
+    assert before == unchanged
+    assert updated == 1
+    assert after != before
+    assert fingerprinted == (True, False)
+
+
 def test_runtime_and_static_request_annotations_when_enabled():
     default_runtime = build_extension_runtime({})
     previous = get_extension_runtime()
@@ -141,3 +180,23 @@ def test_static_build_copies_extension_assets_and_references_requested_bundles(t
     assert (output / "static" / "extensions" / "git_refs" / "git_refs.js").exists()
     assert (output / "static" / "extensions" / "link_preview" / "link_preview_stack.js").exists()
     assert (output / "static" / "extensions" / "link_preview" / "link_preview_geometry.js").exists()
+
+
+def test_asset_manifest_restats_assets_the_watcher_does_not_cover(tmp_path, monkeypatch):
+    monkeypatch.setattr("vyasa.assets._RECHECK_SECONDS", 0.0)
+    static = tmp_path / "static"
+    static.mkdir()
+    script = static / "asset.js"
+    script.write_text("export const a = 1;\n", encoding="utf-8")
+    runtime = ExtensionRuntime(plan=ExtensionPlan("default", {}, ()), catalog={}, extension_static_dirs={"asset_ext": static})
+    previous = get_extension_runtime()
+    set_extension_runtime(runtime)
+    try:
+        manifest = AssetManifest()
+        before = manifest.token("/static/extensions/asset_ext/asset.js")
+        script.write_text("export const a = 22;\n", encoding="utf-8")
+        fingerprinted = (manifest.is_fingerprinted(script, before), manifest.token("/static/extensions/asset_ext/asset.js") != before)
+    finally:
+        set_extension_runtime(previous)
+
+    assert fingerprinted == (False, True)
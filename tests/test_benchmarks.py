@@ -0,0 +1,39 @@
+import pytest
+
+from benchmarks import PRESETS, compare, generate_vault, run_suite
+from benchmarks.corpus import kg_schema_path
+
+
+def _snapshot(root):
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+def test_generate_vault_is_deterministic_for_a_spec(tmp_path):
+    spec = PRESETS["tiny"]
+    first = _snapshot(generate_vault(tmp_path / "a", spec))
+    second = _snapshot(generate_vault(tmp_path / "b", spec))
+
+    assert first == second
+    assert sum(1 for name in first if name.rsplit("/", 1)[-1].startswith("note-")) == spec.files
+    assert "includes/chain-1.md" in first
+    assert kg_schema_path(tmp_path / "a").exists()
+
+
+def test_compare_flags_only_regressions_past_threshold_and_floor():
+    spec = {"files": 1}
+    baseline = {"spec": spec, "timings_ms": {"slow": 10.0, "steady": 10.0, "tiny": 0.1}}
+    report = {"spec": spec, "timings_ms": {"slow": 20.0, "steady": 11.0, "tiny": 0.9, "new": 50.0}}
+
+    regressions = compare(report, baseline, threshold=1.25, floor_ms=1.0)
+
+    assert [(item.name, item.ratio) for item in regressions] == [("slow", 2.0)]
+    with pytest.raises(ValueError):
+        compare(report, {"spec": {"files": 2}, "timings_ms": {}})
+
+
+def test_run_suite_times_selected_benchmarks(tmp_path):
+    report = run_suite(PRESETS["tiny"], repeat=1, only=("kg.query", "content_tree.fingerprint"), workdir=tmp_path)
+
+    assert set(report["timings_ms"]) == {"kg.query", "content_tree.fingerprint"}
+    assert all(value >= 0 for value in report["timings_ms"].values())
+    assert report["spec"]["files"] == PRESETS["tiny"].files
@@ -0,0 +1,67 @@
+import json
+
+import vyasa.build as build
+from vyasa.build import build_static_site
+
+
+def _site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    root.mkdir()
+    (root / "alpha.md").write_text("# Alpha\n\n{ ./snippet.py }\n", encoding="utf-8")
+    (root / "beta.md").write_text("# Beta\n\nPlain page.\n", encoding="utf-8")
+    (root / "snippet.py").write_text("print('one')\n", encoding="utf-8")
+    monkeypatch.setenv("VYASA_ROOT", str(root))
+    return root
+
+
+def _count_renders(monkeypatch):
+    rendered = []
+    original = build._render_document_page
+    monkeypatch.setattr(build, "_render_document_page", lambda state, doc_file, adjacent: rendered.append(doc_file.name) or original(state, doc_file, adjacent))
+    return rendered
+
+
+def test_static_build_rerenders_only_pages_whose_inputs_changed(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    output = tmp_path / "dist"
+    build_static_site(input_dir=root, output_dir=output, jobs=1)
+    manifest = json.loads((output / ".vyasa-build.json").read_text(encoding="utf-8"))
+    assert set(manifest["pages"]) == {"alpha.md", "beta.md"}
+    assert any(path.endswith("snippet.py") for path, _ in manifest["pages"]["alpha.md"]["deps"])
+
+    rendered = _count_renders(monkeypatch)
+    build_static_site(input_dir=root, output_dir=output, jobs=1)
+    assert rendered == []
+
+    (root / "snippet.py").write_text("print('two, now longer')\n", encoding="utf-8")
+    build_static_site(input_dir=root, output_dir=output, jobs=1)
+    assert rendered == ["alpha.md"]
+    assert "two, now longer" in (output / "posts" / "alpha.html").read_text(encoding="utf-8")
+
+    rendered.clear()
+    build_static_site(input_dir=root, output_dir=output, jobs=1, clean=True)
+    assert sorted(rendered) == ["alpha.md", "beta.md"]
+
+
+def test_static_build_drops_output_of_deleted_documents(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    output = tmp_path / "dist"
+    build_static_site(input_dir=root, output_dir=output, jobs=1)
+    assert (output / "posts" / "beta.html").exists()
+
+    (root / "beta.md").unlink()
+    build_static_site(input_dir=root, output_dir=output, jobs=1)
+
+    assert not (output / "posts" / "beta.html").exists()
+    assert "beta.md" not in json.loads((output / ".vyasa-build.json").read_text(encoding="utf-8"))["pages"]
+
+
+def test_static_build_renders_pages_across_worker_processes(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+    build_static_site(input_dir=root, output_dir=serial, jobs=1)
+    build_static_site(input_dir=root, output_dir=parallel, jobs=2)
+
+    for name in ("alpha.html", "beta.html"):
+        assert (parallel / "posts" / name).read_text(encoding="utf-8") == (serial / "posts" / name).read_text(encoding="utf-8")
+    assert json.loads((parallel / ".vyasa-build.json").read_text(encoding="utf-8"))["pages"]["alpha.md"]["deps"]
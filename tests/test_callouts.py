@@ -261,3 +261,40 @@ def test_obsidian_wikilinks_resolve_alias_folder_note_and_self_heading(monkeypat
     assert 'href="/posts/docs"' in html
     assert 'href="/posts/docs#entry-point"' in html
     assert 'href="/posts/page#home"' in html
+
+
+def test_wikilink_index_rereads_only_the_notes_the_watcher_reports(monkeypatch, tmp_path):
+    from vyasa.content_index import content_index
+    from vyasa.extensions_builtin.wikilinks import rewrite
+
+    root = tmp_path.resolve()
+    docs = root / "docs"
+    docs.mkdir()
+    (root / "alpha.md").write_text("# Alpha\n", encoding="utf-8")
+    (docs / "guide.md").write_text("# Guide\n", encoding="utf-8")
+    monkeypatch.chdir(root)
+    reload_config(root / ".vyasa")
+    parsed = []
+    parse = rewrite.parse_frontmatter
+    monkeypatch.setattr(rewrite, "parse_frontmatter", lambda path: parsed.append(path.name) or parse(path))
+    index = content_index()
+    index.attach([root])
+    try:
+        assert rewrite.rewrite_wikilinks("[[alpha]] [[docs]]", current_path="page") == "[alpha](/posts/alpha) [[docs]]"
+        assert sorted(parsed) == ["alpha.md", "guide.md"]
+        version = rewrite._index()["version"]
+
+        (root / "alpha.md").write_text("# Alpha\n\nMore body.\n", encoding="utf-8")
+        index.apply_changes([(2, str(root / "alpha.md"))])
+        assert rewrite.rewrite_wikilinks("[[alpha]]", current_path="page") == "[alpha](/posts/alpha)"
+        assert parsed[2:] == ["alpha.md"]
+        assert rewrite._index()["version"] == version  # a body edit moves no link target
+
+        (docs / "index.md").write_text("---\naliases: [manual]\n---\n# Docs\n", encoding="utf-8")
+        index.apply_changes([(1, str(docs / "index.md"))])
+        assert rewrite.rewrite_wikilinks("[[docs]] [[manual]]", current_path="alpha") == "[docs](/posts/docs) [manual](/posts/docs)"
+        assert parsed[3:] == ["index.md"]
+        assert rewrite._index()["version"] > version
+    finally:
+        index.detach()
+        reload_config()
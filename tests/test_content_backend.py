@@ -147,3 +147,91 @@ def test_uncommitted_paths_flags_only_working_clone_drift(tmp_path, repo):
     (work / "drafty.md").write_text("new\n")  # untracked
     dirty = uncommitted_paths(classify_root(work))
     assert "a.md" in dirty and "drafty.md" in dirty
+
+
+def test_git_backend_caches_objects_and_drops_refs_when_they_move(repo, monkeypatch):
+    import vyasa.content_backend as content_backend
+
+    work, _ = repo
+    monkeypatch.setattr(content_backend, "_REFS_RECHECK_SECONDS", 0.0)
+    b = GitBackend(work / ".git", "docs")
+    first = b.resolve_ref("feature")
+    assert b.read_bytes("sub/b.md", "feature") == b"deep\n"
+
+    reads = []
+    original = b._repo.get_object
+    monkeypatch.setattr(b._repo, "get_object", lambda sha: reads.append(sha) or original(sha))
+    assert b.read_bytes("sub/b.md", "feature") == b"deep\n"
+    assert [t.name for t in b.list_dir("sub", "feature")] == ["b.md"]
+    assert b.stat_kind("feat.md", "feature") == "file"
+    assert b.read_bytes("sub/b.md", "feature") == b"deep\n"
+    assert len(reads) <= 2  # the listing's tree and feat.md's folder, once each
+
+    _git(work, "checkout", "-q", "feature")
+    (work / "feat.md").write_text("moved on\n")
+    _git(work, "commit", "-qam", "c3")
+    _git(work, "checkout", "-q", "main")
+    assert b.resolve_ref("feature") != first
+    assert b.read_bytes("feat.md", "feature") == b"moved on\n"
+
+
+def test_classify_root_reuses_one_repo_until_head_or_root_changes(tmp_path, repo, monkeypatch):
+    import dulwich.repo
+
+    import vyasa.content_backend as content_backend
+
+    work, _ = repo
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    monkeypatch.setattr(content_backend, "_ROOT_CLASSES", {})
+    monkeypatch.setattr(content_backend, "_ROOT_REPOS", {})
+    opened = []
+    original = dulwich.repo.Repo
+    monkeypatch.setattr(dulwich.repo, "Repo", lambda root, *a, **k: opened.append(root) or original(root, *a, **k))
+
+    assert classify_root(work).current_branch == "main"
+    refs = content_backend._ROOT_REPOS[work.resolve()].refs
+    follows, follow = [], refs.follow
+    monkeypatch.setattr(refs, "follow", lambda name: follows.append(name) or follow(name))
+    assert classify_root(work).current_branch == "main"
+    assert follows == []  # memoized: HEAD was not re-read
+
+    _git(work, "checkout", "-q", "feature")
+    assert classify_root(work).current_branch == "feature"
+    assert classify_root(plain).kind == "plain"
+
+    _git(plain, "init", "-q", "-b", "trunk")
+    assert classify_root(plain).current_branch == "trunk"
+    assert [root for root in opened if root == str(work.resolve())] == [str(work.resolve())]
+
+
+def test_uncommitted_paths_follow_watcher_batches_and_git_without_rescanning(repo, monkeypatch):
+    import vyasa.worktree_status as worktree_status
+
+    work, _ = repo
+    monkeypatch.setattr(worktree_status, "_GIT_RECHECK_SECONDS", 0.0)
+    scans = []
+    status_paths = worktree_status._status_paths
+    monkeypatch.setattr(worktree_status, "_status_paths", lambda rc: scans.append(rc.path) or status_paths(rc))
+    statuses = worktree_status.WorktreeStatuses()
+    statuses.attach()
+    rc = classify_root(work)
+    assert statuses.paths(rc) == frozenset()
+
+    (work / "a.md").write_text("hello MAIN\n")  # same size: caught by hashing, not stat size
+    (work / "drafty.md").write_text("new\n")
+    (work / "sub" / "b.md").unlink()
+    (work / "sub").rmdir()
+    statuses.apply_changes([(2, str(work / "a.md")), (1, str(work / "drafty.md")), (3, str(work / "sub"))])
+    assert statuses.paths(rc) == {"a.md", "drafty.md", "sub/b.md"}
+
+    _git(work, "add", "drafty.md")
+    assert statuses.paths(rc) == {"a.md", "drafty.md", "sub/b.md"}  # staged now, still uncommitted
+    _git(work, "commit", "-qam", "c3")
+    assert statuses.paths(classify_root(work)) == frozenset()
+    assert len(scans) == 1
+
+    statuses.detach()
+    (work / "a.md").write_text("offline edit\n")
+    assert statuses.paths(rc) == {"a.md"}  # no watcher: a full scan, as before
+    assert len(scans) == 2
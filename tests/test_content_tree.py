@@ -237,3 +237,140 @@ def test_content_tree_hides_pdf_and_tree_when_extensions_disabled(tmp_path):
         assert tree.resolve_document("scope") is None
     finally:
         set_extension_runtime(previous)
+
+
+def test_content_index_applies_watcher_changes_without_rescanning(monkeypatch, tmp_path):
+    from vyasa.content_index import ContentIndex
+
+    root = tmp_path
+    (root / "a.md").write_text("# A\n", encoding="utf-8")
+    tree = ContentTree(root=root)
+    index = ContentIndex()
+    index.attach([root])
+    scope = tree._index_scope()
+    before = index.generation(scope)
+
+    monkeypatch.setattr(index, "_scan", lambda scope: (_ for _ in ()).throw(AssertionError("rescanned")))
+    assert index.generation(scope) == before
+    (root / "b.md").write_text("# B\n", encoding="utf-8")
+    (root / "notes.txt").write_text("ignored\n", encoding="utf-8")
+    assert index.apply_changes([(2, str(root / "notes.txt"))]) is False
+    assert index.apply_changes([(1, str(root / "b.md"))]) is True
+    after = index.generation(scope)
+    (root / "a.md").unlink()
+    index.apply_changes([(3, str(root / "a.md"))])
+
+    assert after > before
+    assert index.generation(scope) > after
+    assert [entry.path.name for entry in index.entries(scope)] == ["b.md"]
+
+
+def test_content_index_rescans_when_watcher_is_detached(tmp_path):
+    from vyasa.content_index import ContentIndex
+
+    root = tmp_path
+    (root / "a.md").write_text("# A\n", encoding="utf-8")
+    scope = ContentTree(root=root)._index_scope()
+    index = ContentIndex()
+    before = index.generation(scope)
+    assert index.generation(scope) == before
+
+    (root / "guide").mkdir()
+    (root / "guide" / "b.md").write_text("# B\n", encoding="utf-8")
+
+    assert index.generation(scope) > before
+    assert index.title_for(scope, root / "guide" / "b.md") == "B"
+
+
+def test_home_feed_index_reuses_sorted_entries_until_content_changes(monkeypatch, tmp_path):
+    from vyasa.extensions_builtin.blog_home import HomeFeedIndex, home_entries
+    from vyasa.extensions_builtin import blog_home
+
+    root = tmp_path / "site"
+    (root / "drafts").mkdir(parents=True)
+    (root / "notes").mkdir()
+    (root / "b.md").write_text("# Bee\n", encoding="utf-8")
+    (root / "index.md").write_text("# Home\n", encoding="utf-8")
+    (root / "notes" / "a.md").write_text("# Aye\n", encoding="utf-8")
+    (root / "notes" / "wip.md").write_text("# WIP\n", encoding="utf-8")
+    (root / "drafts" / "c.md").write_text("# Sea\n", encoding="utf-8")
+    (root / ".vyasa").write_text('ignore = ["drafts"]\n', encoding="utf-8")
+    (root / "notes" / ".vyasa").write_text('ignore = ["wip"]\n', encoding="utf-8")
+    monkeypatch.chdir(root)
+    reload_config(root / ".vyasa")
+    monkeypatch.setattr(blog_home, "_home_feed_index", HomeFeedIndex())
+    kwargs = dict(
+        is_allowed_fn=lambda route, roles, rules: route != "/posts/b",
+        rbac_rules=[],
+        slug_for_path=lambda path: path.relative_to(root.resolve()).with_suffix("").as_posix(),
+        get_sort=lambda: "name_asc",
+        created_ts=lambda path: 0.0,
+    )
+    mounts = [("", root)]
+
+    first = blog_home.home_feed_index().entries(mounts, show_hidden=False, sort="name_asc", slug_for_path=kwargs["slug_for_path"], created_ts=kwargs["created_ts"])
+    again = blog_home.home_feed_index().entries(mounts, show_hidden=False, sort="name_asc", slug_for_path=kwargs["slug_for_path"], created_ts=kwargs["created_ts"])
+    assert again is first
+    assert [slug for _, slug in first] == ["b", "notes/a"]
+    assert [slug for _, slug in home_entries(mounts, ["reader"], **kwargs)] == ["notes/a"]
+
+    (root / "notes" / "aa.md").write_text("# Double\n", encoding="utf-8")
+    assert [slug for _, slug in home_entries(mounts, None, **kwargs)] == ["b", "notes/a", "notes/aa"]
+
+
+def test_post_tree_level_lists_one_level_and_prunes_invisible_folders(monkeypatch, tmp_path):
+    from vyasa.tree_rendering import visible_folder_paths
+
+    (tmp_path / "guides" / "deep").mkdir(parents=True)
+    (tmp_path / "guides" / "deep" / "step.md").write_text("---\ntitle: Step One\n---\n", encoding="utf-8")
+    (tmp_path / "guides" / "intro.md").write_text("# Intro\n", encoding="utf-8")
+    (tmp_path / "secret").mkdir()
+    (tmp_path / "secret" / "plan.md").write_text("# Plan\n", encoding="utf-8")
+    (tmp_path / "empty").mkdir()
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "x.md").write_text("# X\n", encoding="utf-8")
+    (tmp_path / "top.md").write_text("# Top\n", encoding="utf-8")
+    (tmp_path / ".vyasa").write_text("", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    reload_config(tmp_path / ".vyasa")
+    core._nav_entries_cache.clear()
+    core._cached_visible_folders.cache_clear()
+
+    try:
+        rows = core.build_post_tree_level(tmp_path)
+        nested = core.build_post_tree_level(tmp_path / "guides" / "deep")
+        paths = ContentTree(root=tmp_path).indexed_paths()
+        visible = visible_folder_paths(
+            paths, ["reader"],
+            slug_for_path=core.content_slug_for_path,
+            is_allowed_fn=lambda route, roles, rules: not route.startswith("/posts/secret"),
+            rbac_rules=[],
+        )
+    finally:
+        reload_config()
+
+    assert [(row["kind"], row["slug"]) for row in rows] == [
+        ("folder", "guides"), ("folder", "secret"), ("md", "top"),
+    ]
+    assert nested == [{"kind": "md", "slug": "guides/deep/step", "title": "Step One", "href": "/posts/guides/deep/step", "icon": "file-text"}]
+    root = str(tmp_path.resolve())
+    assert {root + "/guides", root + "/guides/deep"} <= visible
+    assert root + "/secret" not in visible
+
+
+def test_virtual_branch_skips_building_levels_that_fit_as_rows():
+    from types import SimpleNamespace
+
+    from vyasa.extensions_builtin.sidebar_routes import _virtual_branch
+
+    built = []
+    services = SimpleNamespace(
+        get_config=lambda: SimpleNamespace(get_sidebar_virtual_threshold=lambda: 2),
+        post_tree_entry_count=lambda folder: len(folder),
+        build_post_tree_level=lambda folder, roles=None: built.append(folder) or [{"slug": name} for name in folder],
+    )
+
+    assert _virtual_branch("small", ["a", "b"], [], services) is None
+    assert built == []
+    assert "a/x<\\/script>" in to_xml(_virtual_branch("large", ["a", "b", "a/x</script>"], [], services))
+    assert built == [["a", "b", "a/x</script>"]]
@@ -22,7 +22,7 @@ from vyasa.extensions import (
     set_runtime_context,
 )
 from vyasa.helpers import content_root_and_relative
-from vyasa.extensions_builtin.debug_perf import finish_trace, start_trace
+from vyasa.extensions_builtin.debug_perf import SpanMetrics, finish_trace, start_trace
 from vyasa.runtime_context import trace_span
 from vyasa.assets import bundle_asset_nodes_for_collector, extension_asset_path
 from vyasa.extensions_builtin.markdown.pipeline import RenderPipeline
@@ -460,6 +460,30 @@ def test_debug_perf_extension_records_trace_spans():
     assert [event.name for event in events] == ["markdown"]
 
 
+def test_debug_perf_metrics_report_rolling_percentiles():
+    from vyasa.extensions_builtin.debug_perf.routes import render_metrics_table
+
+    metrics = SpanMetrics(window_seconds=60)
+    metrics.record("stale", 999.0, now=0.0)
+    for value in range(1, 101):
+        metrics.record("markdown", float(value), now=100.0)
+
+    rows = metrics.snapshot(now=100.0)
+    html = render_metrics_table(rows, metrics.window_seconds)
+
+    assert rows == [{
+        "name": "markdown",
+        "count": 100,
+        "total_ms": 5050.0,
+        "p50_ms": 50.0,
+        "p95_ms": 95.0,
+        "p99_ms": 99.0,
+        "max_ms": 100.0,
+    }]
+    assert "<td>markdown</td>" in html
+    assert "stale" not in html
+
+
 def test_runtime_context_is_attached_to_extension_runtime():
     runtime = build_extension_runtime({})
     previous = get_extension_runtime()
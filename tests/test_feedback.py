@@ -59,11 +59,14 @@ def test_feedback_store_replays_until_monotonic_ack(tmp_path):
     assert store.delivered_cursor("plan") == second.cursor
 
 
-def test_feedback_store_closes_sqlite_connections(tmp_path):
+def test_feedback_store_pools_and_closes_sqlite_connections(tmp_path):
     store = FeedbackStore(tmp_path)
 
     with store._connect() as connection:
         connection.execute("SELECT 1").fetchone()
+    with store._connect() as again:
+        assert again is connection
+    store.close()
 
     try:
         connection.execute("SELECT 1").fetchone()
@@ -71,6 +74,7 @@ def test_feedback_store_closes_sqlite_connections(tmp_path):
         pass
     else:
         raise AssertionError("feedback sqlite connection stayed open")
+    assert store.after("plan", 0) == []
 
 
 def test_feedback_store_keeps_replies_out_of_agent_poll_filter(tmp_path):
@@ -188,7 +188,7 @@ def test_sidebar_uncommitted_dot_for_dirty_primary_clone_file(tmp_path, monkeypa
     reload_config(primary / ".vyasa")
     core._uncommitted_slugs.cache_clear()
     try:
-        slugs = core._uncommitted_slugs(core._posts_tree_fingerprint())
+        slugs = core._current_uncommitted_slugs()
         assert "page" in slugs
         dirty = to_xml(core._uncommitted_row_decorator(A("Page", href="/posts/page"), slug="page"))
         clean = to_xml(core._uncommitted_row_decorator(A("X", href="/posts/x"), slug="x"))
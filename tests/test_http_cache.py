@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import os
+
+from vyasa.extensions_builtin.markdown.render_cache import RenderCache, observe_render, record_render, record_render_dependency
+from vyasa.http_cache import ResponseCache, ResponseCacheMiddleware, preferred_encoding
+
+
+def _get(app, path, headers=()):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, body = messages[0], b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}, body
+
+
+def test_page_hits_answer_304_before_rendering_and_revalidate_on_edit(tmp_path):
+    source = tmp_path / "note.md"
+    source.write_text("hello " * 400)
+    renders = []
+
+    async def page(scope, receive, send):
+        renders.append(scope["path"])
+        record_render_dependency(source)
+        body = f"<html>{source.read_text()}</html>".encode()
+        headers = [(b"content-type", b"text/html; charset=utf-8"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    app = ResponseCacheMiddleware(page, probe=lambda: "tree-1", cache=ResponseCache())
+
+    status, headers, body = _get(app, "/posts/note", [("Accept-Encoding", "gzip")])
+    assert (status, headers["content-encoding"], headers["cache-control"]) == (200, "gzip", "private, no-cache")
+    assert gzip.decompress(body).startswith(b"<html>hello")
+    etag = headers["etag"]
+
+    status, headers, body = _get(app, "/posts/note", [("If-None-Match", etag)])
+    assert (status, body, len(renders)) == (304, b"", 1)
+
+    status, headers, _ = _get(app, "/posts/note")
+    assert (status, "content-encoding" in headers, len(renders)) == (200, False, 1)
+
+    source.write_text("edited " * 400)
+    os.utime(source, ns=(1, 1))
+    status, headers, body = _get(app, "/posts/note", [("If-None-Match", etag)])
+    assert (status, len(renders)) == (200, 2)
+    assert body.startswith(b"<html>edited") and headers["etag"] != etag
+
+
+def test_preferred_encoding_honours_quality_values():
+    assert preferred_encoding("gzip, deflate") == "gzip"
+    assert preferred_encoding("gzip;q=0, identity") == "identity"
+    assert preferred_encoding("") == "identity"
+
+
+def test_observe_render_collects_dependencies_of_cache_hits(tmp_path):
+    included = tmp_path / "part.md"
+    included.write_text("part")
+    cache = RenderCache()
+    with record_render() as recorder:
+        record_render_dependency(included)
+    cache.put("key", recorder, "<p>part</p>")
+
+    with observe_render() as observer:
+        assert cache.get("key").html == "<p>part</p>"
+
+    assert set(observer.files) == {str(included)}
+    assert observer.is_current()
+
+
+def test_cached_pages_rerender_when_their_updated_label_moves(tmp_path, monkeypatch):
+    import vyasa.document_pages as document_pages
+
+    source = tmp_path / "note.md"
+    source.write_text("hello")
+    label = ["Updated just now"]
+    monkeypatch.setattr(document_pages, "format_last_modified_label", lambda path: label[0])
+    renders = []
+
+    async def page(scope, receive, send):
+        renders.append(scope["path"])
+        body = f"<html>{document_pages.updated_label(source)}</html>".encode()
+        headers = [(b"content-type", b"text/html; charset=utf-8"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    app = ResponseCacheMiddleware(page, cache=ResponseCache())
+    assert _get(app, "/posts/note")[2] == b"<html>Updated just now</html>"
+    assert _get(app, "/posts/note")[2] == b"<html>Updated just now</html>" and len(renders) == 1
+
+    label[0] = "Updated 1 min ago"
+    assert _get(app, "/posts/note")[2] == b"<html>Updated 1 min ago</html>" and len(renders) == 2
+
+
+def test_large_attachments_stream_through_uncached(monkeypatch):
+    import vyasa.http_cache as http_cache
+
+    monkeypatch.setattr(http_cache, "_MAX_BODY_BYTES", 1024)
+    renders = []
+
+    async def attachment(scope, receive, send):
+        renders.append(scope["path"])
+        headers = [(b"content-type", b"application/pdf"), (b"content-length", b"2048")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"x" * 1024, "more_body": True})
+        await send({"type": "http.response.body", "body": b"y" * 1024})
+
+    app = ResponseCacheMiddleware(attachment, cache=ResponseCache())
+    status, headers, body = _get(app, "/posts/manual.pdf", [("Accept-Encoding", "gzip")])
+    assert (status, "etag" in headers, body) == (200, False, b"x" * 1024 + b"y" * 1024)
+    _get(app, "/posts/manual.pdf")
+    assert len(renders) == 2
@@ -427,6 +427,67 @@ def test_read_kg_pack_writes_and_refreshes_kg_cache(tmp_path):
     assert sorted(refreshed_cache["nodes"]) == ["n1", "n2"]
 
 
+def test_read_kg_pack_reuses_compiled_pack_until_a_source_changes(tmp_path, monkeypatch):
+    import os
+
+    from vyasa.extensions_builtin.tasks import items_pack, pack_cache
+
+    cache = pack_cache.KgPackCache(tmp_path / "compiled")
+    monkeypatch.setattr(items_pack, "kg_pack_cache", lambda: cache)
+    parsed = []
+    real_read_nodes = items_pack.read_nodes
+    monkeypatch.setattr(items_pack, "read_nodes", lambda path: parsed.append(path) or real_read_nodes(path))
+    pack = tmp_path / "pack"
+    pack.mkdir()
+    (pack / "kg.schema").write_text("@graph id=ctx\npool=kg.nodes\ncontexts=*.context\n", encoding="utf-8")
+    (pack / "kg.nodes").write_text("a1: First\nb1: Second\n", encoding="utf-8")
+    (pack / "day1.context").write_text("@context id=day1 seq=1\n@edges\n    a1 -> b1 about\n", encoding="utf-8")
+
+    first = read_kg_pack(pack / "kg.schema")
+    first["tasks"].clear()
+    stat = (pack / "kg.nodes").stat()
+    os.utime(pack / "kg.nodes", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    again = read_kg_pack(pack / "kg.schema")
+    cache.clear()
+    from_disk = read_kg_pack(pack / "kg.schema")
+
+    assert len(parsed) == 1
+    assert [task["id"] for task in again["tasks"]] == [task["id"] for task in from_disk["tasks"]] == ["a1", "b1"]
+
+    (pack / "day2.context").write_text("@context id=day2 seq=2\n@edges\n    b1 -> a1 about\n", encoding="utf-8")
+    assert read_kg_pack(pack / "kg.schema")["kg_context"]["id"] == "day2"
+    (pack / "kg.nodes").write_text("a1: Renamed\nb1: Second\n", encoding="utf-8")
+    assert read_kg_pack(pack / "kg.schema")["tasks"][0]["label"] == "Renamed"
+    assert len(parsed) == 3
+
+
+
+def test_compiled_kg_packs_are_stored_as_json_and_never_unpickled(tmp_path):
+    import pickle
+
+    from vyasa.extensions_builtin.tasks import pack_cache
+
+    source = tmp_path / "kg.nodes"
+    source.write_text("a1: First\n", encoding="utf-8")
+    graph = {"tasks": [{"id": "a1", "span": (1, 2), "tags": {"x"}}], "title": "T"}
+
+    def compile():
+        pack_cache.read_source_text(source)
+        return graph
+
+    cache = pack_cache.KgPackCache(tmp_path / "compiled")
+    assert cache.load(source, "", compile) == graph
+    stored = list((tmp_path / "compiled").iterdir())
+    assert [path.suffix for path in stored] == [".json"]
+    assert pack_cache.KgPackCache(tmp_path / "compiled").load(source, "", lambda: {}) == graph
+
+    class Boom:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('unpickled')",))
+
+    stored[0].write_bytes(pickle.dumps(Boom()))
+    assert pack_cache.KgPackCache(tmp_path / "compiled").load(source, "", compile) == graph
+
 def test_items_parser_inherits_attrs_after_attr_overlay(tmp_path):
     (tmp_path / "nest.kg.schema").write_text(
         """@graph id=nest title=Nest initial_view=module
@@ -161,6 +161,27 @@ def test_chained_traversals_keep_the_full_path(context_pack):
     ]
 
 
+def test_repeated_queries_reuse_one_index_per_context(context_pack, monkeypatch):
+    from vyasa.extensions_builtin.tasks import query as query_module
+
+    builds = []
+    real_build = query_module._GraphIndex.build.__func__
+    monkeypatch.setattr(
+        query_module._GraphIndex, "build", classmethod(lambda cls, graph: builds.append(graph) or real_build(cls, graph))
+    )
+    query = KnowledgeGraphQuery(context_pack)
+
+    first = query.run("facts at day2 | where relation=allocates_to e=new | join owner")
+    first[0]["owner"] = "changed"
+    query.run("nodes at day2 | where id=jira | incoming* allocates_to | paths")[0]["path"][0]["source"] = "changed"
+    again = query.run("facts at day2 | where relation=allocates_to e=new | join owner")
+    path = query.run("nodes at day2 | where id=jira | incoming* allocates_to | paths")[0]["path"]
+
+    assert len(builds) == 1
+    assert again[0]["owner"] == "Lee"
+    assert path[0]["source"] == "claim"
+
+
 def test_traversal_rejects_undeclared_relation(context_pack):
     with pytest.raises(QueryError, match="Undeclared KG relation: blocks"):
         KnowledgeGraphQuery(context_pack).run("nodes | follow blocks")
@@ -1,5 +1,6 @@
 import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 
 from vyasa.extensions_builtin.link_preview import routes
 
@@ -285,6 +286,34 @@ def test_link_preview_fragment_match_ignores_heading_case(tmp_path, monkeypatch)
     assert "Later" not in result
 
 
+def test_link_preview_cache_reuses_render_until_target_changes(tmp_path, monkeypatch):
+    source = tmp_path / "sample.md"
+    source.write_text("# Title\n\nFirst body.\n")
+    monkeypatch.setattr(routes, "_resolve_preview_file", lambda _slug: source)
+    monkeypatch.setattr(routes, "content_slug_for_path", lambda _path, strip_suffix=True: "sample.md")
+    renders = []
+    original = routes._render_preview_file
+    monkeypatch.setattr(routes, "_render_preview_file", lambda *a, **kw: renders.append(1) or original(*a, **kw))
+    cache = routes.LinkPreviewCache(maxsize=4)
+
+    first = cache.get(href="sample", roles=["staff"])
+    again = cache.get(href="sample", roles=["staff"])
+
+    assert first is again and len(renders) == 1
+    assert "First body." in first.html
+    assert first.not_modified(SimpleNamespace(headers={"if-none-match": first.etag}))
+    assert first.not_modified(SimpleNamespace(headers={"if-modified-since": first.last_modified}))
+    assert not first.not_modified(SimpleNamespace(headers={"if-none-match": '"stale"'}))
+    assert cache.get(href="sample", roles=["admin"]) is not first
+
+    source.write_text("# Title\n\nSecond body, longer.\n")
+    changed = cache.get(href="sample", roles=["staff"])
+
+    assert "Second body" in changed.html
+    assert changed.etag != first.etag
+    assert len(renders) == 3
+
+
 def test_link_preview_stack_keeps_nested_previews_until_each_is_closed():
     script = """
         import { LinkPreviewStack } from './vyasa/extensions_builtin/link_preview/static/link_preview_stack.js';
@@ -0,0 +1,55 @@
+import asyncio
+
+from vyasa.live import PathWatchHub, watch_path
+
+
+def test_watch_path_subscribers_share_the_attached_watcher(tmp_path):
+    target = tmp_path / "board.excalidraw"
+    target.write_text("{}")
+    hub = PathWatchHub()
+    hub.attach(lambda directory: directory == str(tmp_path))
+
+    async def run():
+        streams = [watch_path(target, hub=hub) for _ in range(100)]
+        ready = [await stream.__anext__() for stream in streams]
+        pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0)
+        watching = (hub.subscriber_count(), hub._thread)
+        target.write_text('{"elements": []}')
+        hub.apply_changes([(2, str(target))])
+        changes = await asyncio.wait_for(asyncio.gather(*pending), timeout=5)
+        for stream in streams:
+            await stream.aclose()
+        return ready, watching, changes
+
+    ready, watching, changes = asyncio.run(run())
+
+    assert {event["type"] for event in ready} == {"ready"}
+    assert watching == (100, None)
+    assert {event["type"] for event in changes} == {"change"}
+    assert hub.subscriber_count() == 0
+
+
+def test_watch_path_falls_back_to_one_watcher_for_uncovered_dirs(tmp_path):
+    target = tmp_path / "notes.json"
+    target.write_text("{}")
+    hub = PathWatchHub()
+
+    async def run():
+        streams = [watch_path(target, hub=hub) for _ in range(10)]
+        for stream in streams:
+            await stream.__anext__()
+        pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0.5)
+        thread = hub._thread
+        target.write_text('{"changed": true}')
+        changes = await asyncio.wait_for(asyncio.gather(*pending), timeout=10)
+        for stream in streams:
+            await stream.aclose()
+        return thread, changes
+
+    thread, changes = asyncio.run(run())
+
+    assert thread is not None
+    assert {event["type"] for event in changes} == {"change"}
+    assert hub._thread is None
@@ -20,3 +20,28 @@ def test_source_reload_roots_include_vyasa_package_when_enabled(monkeypatch):
     monkeypatch.setenv("VYASA_RELOAD", "true")
 
     assert any(source_root == root or source_root.is_relative_to(root) for root in core._live_reload_roots())
+
+
+def test_reload_hub_attaches_only_once_the_watch_is_registered(tmp_path, monkeypatch):
+    import threading
+
+    import watchfiles
+
+    from vyasa.content_index import content_index
+
+    watching = []
+
+    def fake_watch(*paths, stop_event, **kwargs):
+        watching.append(content_index().watching)  # descriptors are still being registered
+        yield set()
+        watching.append(content_index().watching)
+        stop_event.set()
+
+    monkeypatch.delenv("VYASA_WORKER_SYNC", raising=False)
+    monkeypatch.setattr(watchfiles, "watch", fake_watch)
+    monkeypatch.setattr(core, "_watch_targets", lambda: ([str(tmp_path)], True))
+    monkeypatch.setattr(core, "_live_reload_roots", lambda: [tmp_path])
+    core._ReloadHub()._run(threading.Event())
+
+    assert watching == [False, True]
+    assert not content_index().watching
@@ -529,3 +529,73 @@ def test_expand_markdown_includes_for_reading_counts_md_sections(tmp_path, monke
         assert "{ ./doc.md#part }" not in expanded
     finally:
         reload_config()
+
+
+def test_from_md_reuses_cached_render_until_an_include_changes(tmp_path, monkeypatch):
+    from vyasa.extensions_builtin.markdown import renderer
+    from vyasa.extensions_builtin.markdown.render_cache import render_cache
+
+    root = tmp_path / "site"
+    root.mkdir()
+    snippet = root / "snippet.py"
+    snippet.write_text("print('first')\n", encoding="utf-8")
+    monkeypatch.setenv("VYASA_ROOT", str(root))
+    reload_config()
+    render_cache().clear()
+    calls = []
+    original = renderer._render_markdown_html
+    monkeypatch.setattr(renderer, "_render_markdown_html", lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs))
+
+    try:
+        source = "# Page\n\n{ ./snippet.py }\n"
+        first = to_xml(from_md(source, current_path="page"))
+        assert to_xml(from_md(source, current_path="page")) == first
+        assert len(calls) == 1
+
+        snippet.write_text("print('second, longer')\n", encoding="utf-8")
+        updated = to_xml(from_md(source, current_path="page"))
+        assert len(calls) == 2
+        assert "second, longer" in updated
+    finally:
+        render_cache().clear()
+        reload_config()
+
+
+def test_from_md_cache_hit_replays_requested_asset_bundles(tmp_path, monkeypatch):
+    from vyasa.extensions_builtin.markdown.render_cache import render_cache
+
+    monkeypatch.setenv("VYASA_ROOT", str(tmp_path))
+    reload_config()
+    render_cache().clear()
+    source = "```mermaid\nflowchart TD\n  A --> B\n```\n"
+
+    try:
+        first = to_xml(from_md(source, current_path="page"))
+        second = to_xml(from_md(source, current_path="page"))
+        assert "/static/extensions/mermaid/mermaid.js" in first
+        assert second == first
+    finally:
+        render_cache().clear()
+        reload_config()
+
+
+def test_slide_deck_progress_is_computed_once_per_deck_version():
+    from vyasa.extensions_builtin.slides.deck import SlideRevealConfig, zen_slide_deck
+
+    source = "# Deck\n\n## One\n\nFirst.\n\nSecond.\n\n## Two\n\nThird.\n"
+    deck = zen_slide_deck(source)
+    assert zen_slide_deck(source) is deck
+    assert zen_slide_deck(source + "\nMore.\n") is not deck
+
+    calls = []
+    def render(text, current_path=None, slide_mode=False):
+        calls.append(text)
+        return "".join(f"<p>{part}</p>" for part in text.split("\n\n") if part.strip())
+
+    config = SlideRevealConfig(unit="top-level-blocks")
+    progress = deck.progress(render_fragment=render, current_path="deck", config=config)
+    rendered = len(calls)
+    assert deck.progress(render_fragment=render, current_path="deck", config=config) is progress
+    assert len(calls) == rendered
+    assert progress.offsets == (0, progress.counts[0])
+    assert progress.total == sum(progress.counts)
@@ -22,3 +22,27 @@ def test_rbac_admin_runtime_cache_services_can_be_cleared():
     assert services.cached_posts_sidebar_html is core._cached_posts_sidebar_html
     assert callable(services.cached_build_post_tree.cache_clear)
     assert callable(services.cached_posts_sidebar_html.cache_clear)
+
+
+def test_compiled_rbac_rules_match_the_rule_by_rule_policy():
+    import re
+
+    from vyasa.auth.policy import RbacRules, is_allowed, path_requires_roles
+
+    raw = [
+        (re.compile(r"^/posts/team"), {"staff"}),
+        (re.compile(r"^/posts/team/public"), {"reader", "staff"}),
+        (re.compile(r"(a)\1"), {"echo"}),
+    ]
+    rules = RbacRules(raw)
+    paths = ["/posts/team/x", "/posts/team/public/y", "/posts/open", "/posts/aa", "/posts/ab"]
+    role_sets = [[], ["reader"], ["staff"], ["echo"], ["reader", "echo"]]
+
+    for path in paths:
+        assert path_requires_roles(path, rules) == path_requires_roles(path, raw)
+        for roles in role_sets:
+            assert is_allowed(path, roles, rules) == is_allowed(path, roles, raw), (path, roles)
+            assert is_allowed(path, roles, rules) == is_allowed(path, roles, raw)
+    assert rules._any is None  # the backreference forces per-rule matching
+    assert RbacRules(raw[:2])._any is not None
+    assert not is_allowed("/posts/team/x", ["reader"], RbacRules(raw[:2]))
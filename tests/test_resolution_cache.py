@@ -0,0 +1,79 @@
+import os
+
+from vyasa.content_tree import ContentTree
+from vyasa.resolution_cache import ResolutionCache, resolution_cache
+
+
+def _covering(root):
+    root = os.path.abspath(root)
+    return lambda directory: directory == root or directory.startswith(root + os.sep)
+
+
+def test_resolution_cache_keeps_answers_only_while_the_watcher_covers_them(tmp_path):
+    cache = ResolutionCache()
+    calls = []
+
+    def resolve(path):
+        def run():
+            calls.append(path)
+            return (path if path.exists() else None), [path]
+        return run
+
+    missing = tmp_path / "missing" / "deep.md"
+    assert cache.get(("a",), resolve(missing)) is None  # no watcher yet: nothing kept
+    cache.attach(_covering(tmp_path))
+    assert cache.get(("a",), resolve(missing)) is None
+    assert cache.get(("a",), resolve(missing)) is None
+    assert len(calls) == 2
+
+    cache.get(("outside",), resolve(tmp_path.parent / "elsewhere.md"))
+    assert len(cache) == 1
+
+    cache.apply_changes([(2, str(tmp_path / "other.md"))])  # an edit in place keeps answers
+    assert cache.get(("a",), resolve(missing)) is None and len(calls) == 3
+
+    missing.parent.mkdir()
+    missing.write_text("# Deep\n", encoding="utf-8")
+    cache.apply_changes([(1, str(missing.parent))])
+    assert cache.get(("a",), resolve(missing)) == missing
+
+    cache.detach()
+    assert len(cache) == 0
+
+
+def test_resolve_document_reuses_hits_and_misses_until_files_come_and_go(tmp_path, monkeypatch):
+    (tmp_path / "guide.md").write_text("# Guide\n", encoding="utf-8")
+    probes = []
+    original = ContentTree._resolve_document
+    monkeypatch.setattr(ContentTree, "_resolve_document", lambda self, slug: probes.append(slug) or original(self, slug))
+    tree = ContentTree(root=tmp_path, allowed_suffixes=(".md", ".pdf"))
+    cache = resolution_cache()
+    cache.attach(_covering(tmp_path))
+    try:
+        assert tree.resolve_document("guide").path == (tmp_path / "guide.md").resolve()
+        assert tree.resolve_document("guide").kind == "markdown"
+        assert tree.resolve_document("wp-login") is None
+        assert tree.resolve_document("wp-login") is None
+        assert probes == ["guide", "wp-login"]
+
+        (tmp_path / "wp-login.pdf").write_bytes(b"%PDF-1.4\n")
+        cache.apply_changes([(1, str(tmp_path / "wp-login.pdf"))])
+        assert tree.resolve_document("wp-login").kind == "pdf"
+    finally:
+        cache.detach()
+
+
+def test_storage_churn_keeps_answers(tmp_path):
+    from vyasa.core import _watch_covers
+
+    (tmp_path / "guide.md").write_text("# Guide\n", encoding="utf-8")
+    cache = ResolutionCache()
+    cache.attach(_watch_covers([str(tmp_path)], recursive=True))
+    calls = []
+    path = tmp_path / "guide.md"
+    cache.get(("guide",), lambda: calls.append(path) or (path, [path]))
+
+    storage = tmp_path / ".vyasa-storage" / "search"
+    cache.apply_changes([(1, str(storage)), (1, str(storage / "index.sqlite3")), (3, str(storage / "index.sqlite3-journal"))])
+    cache.get(("guide",), lambda: calls.append(path) or (path, [path]))
+    assert len(calls) == 1
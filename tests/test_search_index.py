@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from vyasa.config import reload_config
+from vyasa.file_search import search_file_records
+from vyasa.search_index import SearchIndex, disk_search_scope
+
+
+def _site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    root.mkdir()
+    monkeypatch.setenv("VYASA_ROOT", str(root))
+    reload_config()
+    return root
+
+
+def test_search_index_ranks_titles_above_body_and_matches_prefixes(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    try:
+        (root / "alpha.md").write_text("# Alpha\n\nMentions photosynthesis once.\n", encoding="utf-8")
+        (root / "beta.md").write_text("---\ntitle: Photosynthesis primer\n---\n\nLight reactions.\n", encoding="utf-8")
+        (root / "gamma.md").write_text("# Gamma\n\nNothing relevant.\n", encoding="utf-8")
+        index = SearchIndex(None)
+        assert index.sync(disk_search_scope([("", root)])) == 3
+
+        assert [path.name for path, _ in index.search("photosyn")] == ["beta.md", "alpha.md"]
+        assert index.search("light react")[0][0].name == "beta.md"
+        assert index.search("missingword") == []
+    finally:
+        reload_config()
+
+
+def test_search_index_reindexes_only_changed_files(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    try:
+        note = root / "note.md"
+        note.write_text("# Note\n\nfirst draft\n", encoding="utf-8")
+        (root / "other.md").write_text("# Other\n\nstable\n", encoding="utf-8")
+        index = SearchIndex(None)
+        scope = disk_search_scope([("", root)])
+        index.sync(scope)
+
+        note.write_text("# Note\n\nrewritten with zebras\n", encoding="utf-8")
+        assert index.sync(scope) == 1
+        assert [path.name for path, _ in index.search("zebra")] == ["note.md"]
+        assert index.search("draft") == []
+
+        note.unlink()
+        assert index.sync(scope) == 1
+        assert index.search("zebra") == []
+        assert len(index) == 1
+    finally:
+        reload_config()
+
+
+def test_search_file_records_includes_body_matches_after_name_matches(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    try:
+        (root / "kettle.md").write_text("# Kettle\n\nBoil water.\n", encoding="utf-8")
+        (root / "tea.md").write_text("# Tea\n\nUse the kettle first.\n", encoding="utf-8")
+        matches, _ = search_file_records("kettle", [("", root)], (".md",))
+        assert [Path(path).name for path in matches] == ["kettle.md", "tea.md"]
+        assert (root / ".vyasa-storage" / "search" / "index.sqlite3").exists()
+    finally:
+        reload_config()
+
+
+def test_search_file_records_splits_name_hits_by_tier_not_score(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    try:
+        deep = root / "projects-archive-for-the-long-running-team"
+        deep.mkdir()
+        (deep / "notes.md").write_text("# Notes\n\nNothing here.\n", encoding="utf-8")
+        (root / "plan.md").write_text("# Plan\n\nList the projects.\n", encoding="utf-8")
+        (root / "a b.md").write_text("# Letters\n\nNothing here.\n", encoding="utf-8")
+        (root / "abacus.md").write_text("# Counting\n\nNothing here.\n", encoding="utf-8")
+        (root / "tools.md").write_text("# Tools\n\nAn abacus helps.\n", encoding="utf-8")
+
+        matches, _ = search_file_records("projects", [("", root)], (".md",))
+        assert [Path(path).name for path in matches] == ["notes.md", "plan.md"]  # a long path hit still counts as named
+        matches, _ = search_file_records("ab", [("", root)], (".md",))
+        assert [Path(path).name for path in matches] == ["abacus.md", "tools.md", "a b.md"]  # scattered letters stay loose
+    finally:
+        reload_config()
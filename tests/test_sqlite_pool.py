@@ -0,0 +1,62 @@
+import sqlite3
+import threading
+
+from vyasa.sqlite_pool import SQLiteDatabase, sqlite_database
+
+
+def _schema(connection):
+    connection.execute("CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY, value TEXT, hits INTEGER DEFAULT 0)")
+
+
+def test_sqlite_database_reuses_one_wal_connection_per_thread(tmp_path):
+    db = sqlite_database(tmp_path / "items.db", _schema)
+    connection = db.connection()
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(db.connection()))
+    thread.start()
+    thread.join()
+
+    assert db.connection() is connection
+    assert seen[0] is not connection
+    assert sqlite_database(tmp_path / "items.db") is db
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    db.close()
+
+
+def test_sqlite_upsert_inserts_then_updates_in_place(tmp_path):
+    db = SQLiteDatabase(tmp_path / "items.db", _schema)
+
+    db.upsert("items", {"id": "a", "value": "first"}, conflict=("id",))
+    db.upsert("items", {"id": "a", "value": "second"}, conflict=("id",))
+
+    assert [tuple(row) for row in db.query("SELECT id, value FROM items")] == [("a", "second")]
+    db.close()
+
+
+def test_sqlite_group_commit_isolates_failing_writes(tmp_path):
+    db = SQLiteDatabase(tmp_path / "items.db", _schema)
+    release = threading.Event()
+    errors = []
+
+    def slow(connection):
+        release.wait(5)
+        connection.execute("INSERT INTO items (id, value) VALUES ('slow', 'x')")
+
+    def writer(item_id):
+        try:
+            db.write(lambda connection: connection.execute("INSERT INTO items (id, value) VALUES (?, 'x')", (item_id,)))
+        except sqlite3.IntegrityError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=db.write, args=(slow,))
+    leader.start()
+    followers = [threading.Thread(target=writer, args=(item_id,)) for item_id in ("b", "c", "c")]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert sorted(row["id"] for row in db.query("SELECT id FROM items")) == ["b", "c", "slow"]
+    assert len(errors) == 1
+    db.close()
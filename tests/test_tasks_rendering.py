@@ -1826,6 +1826,26 @@ intro: Intro
     assert "<li>Second point</li>" in desc_html
 
 
+def test_tasks_api_reuses_compiled_payload_and_query_until_pack_changes(tmp_path, monkeypatch):
+    from vyasa.extensions_builtin.tasks import api
+
+    monkeypatch.setattr(api, "_compiled", api._CompiledCache())
+    (tmp_path / "kg.schema").write_text("@graph id=ctx\npool=kg.nodes\ncontexts=*.context\n", encoding="utf-8")
+    (tmp_path / "kg.nodes").write_text("a1: First\nb1: Second\n", encoding="utf-8")
+    (tmp_path / "one.context").write_text("@context id=one seq=1\n@edges\n  a1 -> b1 relates\n", encoding="utf-8")
+    schema = tmp_path / "kg.schema"
+
+    first = api._cached_schema_payload(schema, context_id="one")
+    query = api._cached_query(schema)
+    assert api._cached_schema_payload(schema, context_id="one") is first
+    assert api._cached_query(schema) is query
+
+    (tmp_path / "two.context").write_text("@context id=two seq=2\n@edges\n  b1 -> a1 relates\n", encoding="utf-8")
+    assert api._cached_schema_payload(schema, context_id="one") is not first
+    assert api._cached_query(schema) is not query
+    assert api._cached_query(schema).previous_context_diff("two")["from"] == "one"
+
+
 def test_view_slide_description_markdown_is_rendered_in_projection_model(tmp_path):
     (tmp_path / "kg.schema").write_text(
         """@graph id=deck
@@ -0,0 +1,73 @@
+import os
+import time
+
+from vyasa import tree_index as tree_index_module
+from vyasa.config import reload_config
+from vyasa.content_tree import ContentTree
+from vyasa.tree_index import TreeIndex, tree_index
+
+
+def _site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    root.mkdir()
+    monkeypatch.setenv("VYASA_ROOT", str(root))
+    monkeypatch.setattr(tree_index_module, "_tree_indexes", {})
+    reload_config()
+    return root
+
+
+def _age(*paths, seconds=60):
+    stamp = time.time() - seconds
+    for path in paths:
+        os.utime(path, (stamp, stamp))
+
+
+def test_tree_listing_survives_restart_and_follows_folder_and_config_changes(tmp_path, monkeypatch):
+    root = _site(tmp_path, monkeypatch)
+    try:
+        (root / "guides").mkdir()
+        (root / "a.md").write_text("# Aye\n", encoding="utf-8")
+        (root / "b.md").write_text("# Bee\n", encoding="utf-8")
+        (root / ".vyasa").write_text("", encoding="utf-8")
+        tree_index()  # creates .vyasa-storage inside the root before it is aged
+        _age(root, root / ".vyasa")
+        scans = []
+        scan = ContentTree._scan_folder
+        monkeypatch.setattr(ContentTree, "_scan_folder", lambda self, folder: scans.append(folder) or scan(self, folder))
+
+        def names():
+            return [path.name for path in ContentTree(root=root).list_paths_for_path(root)]
+
+        assert names() == ["guides", "a.md", "b.md"]
+        monkeypatch.setattr(tree_index_module, "_tree_indexes", {})  # a fresh process
+        assert names() == ["guides", "a.md", "b.md"]
+        assert len(scans) == 1
+
+        (root / ".vyasa").write_text('order = ["b"]\n', encoding="utf-8")
+        _age(root / ".vyasa", seconds=30)
+        assert names() == ["b.md", "guides", "a.md"]
+
+        (root / "c.md").write_text("# Sea\n", encoding="utf-8")
+        _age(root, seconds=10)
+        assert names() == ["b.md", "guides", "a.md", "c.md"]
+        assert len(scans) == 3
+
+        (root / "d.md").write_text("# Dee\n", encoding="utf-8")
+        assert "d.md" in names() and "d.md" in names()
+        assert len(scans) == 5  # modified this instant: never stored, so always rescanned
+    finally:
+        reload_config()
+
+
+def test_tree_index_titles_persist_by_stat(tmp_path):
+    db = tmp_path / "tree.sqlite3"
+    note = tmp_path / "note.md"
+    old = time.time() - 60
+
+    TreeIndex(db).store_title(note, old, 10, ["API"], "Note Title")
+    TreeIndex(db).store_title(note, time.time(), 11, None, "Too Fresh")
+
+    index = TreeIndex(db)
+    assert index.title(note, old, 10, ["API"]) == "Note Title"
+    assert index.title(note, old, 12, ["API"]) is None
+    assert index.title(note, old, 10, None) is None
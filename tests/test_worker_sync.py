@@ -0,0 +1,70 @@
+import socket
+import threading
+import time
+
+from vyasa.worker_sync import WATCHER_LOCK, WorkerSync
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_follower_receives_leader_batches_and_takes_over_when_released(tmp_path):
+    leader = WorkerSync(tmp_path, name="leader")
+    follower = WorkerSync(tmp_path, name="follower")
+    assert leader.claim(WATCHER_LOCK)
+    assert not follower.claim(WATCHER_LOCK)
+    received = []
+    stop = threading.Event()
+    thread = threading.Thread(target=lambda: received.extend(follower.follow(stop)), daemon=True)
+    thread.start()
+    _wait_for(follower.socket_path.exists)
+
+    batch = [(2, str(tmp_path / "a.md"))] + [(1, str(tmp_path / f"note-{index:05}.md")) for index in range(3000)]
+    assert leader.publish(batch) == 1
+    _wait_for(lambda: sum(len(chunk) for chunk in received) == len(batch))
+    leader.release(WATCHER_LOCK)
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(received) > 1
+    assert [tuple(item) for chunk in received for item in chunk] == batch
+    assert follower.claim(WATCHER_LOCK)
+    assert not follower.socket_path.exists()
+    follower.release(WATCHER_LOCK)
+
+
+def test_publish_drops_sockets_of_exited_workers(tmp_path):
+    stale = tmp_path / "worker-0.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as orphan:
+        orphan.bind(str(stale))
+
+    assert WorkerSync(tmp_path, name="leader").publish([(2, "/x.md")]) == 0
+    assert not stale.exists()
+
+
+def test_follower_queues_batches_from_bind_and_stops_on_a_missed_one(tmp_path):
+    leader = WorkerSync(tmp_path, name="leader")
+    follower = WorkerSync(tmp_path, name="follower")
+    assert leader.claim(WATCHER_LOCK)
+    leader.publish([(1, "/before.md")])  # no peers yet; the follower's scan covers it
+    receiver = follower.listen()
+    assert leader.publish([(2, "/during-scan.md")]) == 1
+    stop = threading.Event()
+
+    batches = follower.follow(stop)
+    assert next(batches) == [[2, "/during-scan.md"]]
+    assert leader.publish([(2, "/dropped.md")]) == 1
+    receiver.recv(4096)  # lost in transit
+    assert list(batches) == []  # the recorded sequence is ahead: re-attach
+
+    assert leader.publish([(2, "/dropped-again.md")]) == 1
+    receiver.recv(4096)
+    assert leader.publish([(2, "/after-gap.md")]) == 1
+    assert list(follower.follow(stop)) == []  # gap in the sequence: re-attach
+    follower.close()
+    leader.release(WATCHER_LOCK)
+    assert not follower.socket_path.exists()
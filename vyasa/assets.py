@@ -1,8 +1,17 @@
+import hashlib
+import os
+import threading
+import time
 from pathlib import Path
 
 from fasthtml.common import Link, Script, to_xml
 from .runtime_context import traced
 
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache, max-age=0, must-revalidate"
+# How long a cached hash is trusted before its file is re-stat'ed.
+_RECHECK_SECONDS = 1.0
+
 
 def _static_file_for_url(path: str) -> Path | None:
     rel = path.lstrip("/")
@@ -32,19 +41,160 @@ def extension_asset_url(extension_id: str, asset_name: str) -> str:
     return asset_url(f"/static/extensions/{extension_id}/{asset_name.lstrip('/')}")
 
 
-def asset_url(path: str) -> str:
-    """Return static URL with mtime cache-busting token."""
-    file_path = _static_file_for_url(path)
-    if file_path is None:
-        return path
+def _current_runtime():
+    try:
+        from .extensions import get_extension_runtime
+
+        return get_extension_runtime()
+    except Exception:
+        return None
+
+
+def _file_stamp(file_path: Path) -> tuple[int, int] | None:
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _content_token(file_path: Path) -> str | None:
     try:
-        token = int(file_path.stat().st_mtime_ns)
+        with open(file_path, "rb") as handle:
+            return hashlib.sha256(handle.read()).hexdigest()[:16]
     except OSError:
+        return None
+
+
+class AssetManifest:
+    """Content hash of every core and extension static asset.
+
+    `asset_url` used to stat the file on each call, and the served assets were
+    all no-cache, so every page paid server stats and a browser revalidation
+    per asset. The manifest is built once (and again when the extension
+    runtime changes) by hashing `vyasa/static` and each extension's static
+    dir; `asset_url` is then a dict lookup, and a request carrying the current
+    hash is served immutable. The reload watcher feeds `apply_changes`, so
+    an edited asset gets a new hash (and URL) straight away. The watcher does
+    not cover the package and extension static dirs, so a hash is also
+    re-stat'ed (mtime and size) once it is `_RECHECK_SECONDS` old, and the
+    file re-hashed when its stat moved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runtime_id: int | None = None
+        self._tokens: dict[str, str | None] = {}
+        self._urls: dict[str, str] = {}
+        self._stamps: dict[str, tuple[tuple[int, int] | None, float]] = {}  # path -> (file stamp, checked at)
+
+    def token(self, path: str) -> str | None:
+        """Hash for a static URL path (no query string), or None when it maps to no file."""
+        self._ensure_current()
+        now = time.monotonic()
+        with self._lock:
+            cached = path in self._tokens
+            token = self._tokens.get(path)
+            stamp, checked_at = self._stamps.get(path, (None, 0.0))
+            if cached and now - checked_at < _RECHECK_SECONDS:
+                return token
+        file_path = _static_file_for_url(path)
+        current = _file_stamp(file_path) if file_path is not None else None
+        if not cached or current != stamp:
+            token = _content_token(file_path) if file_path is not None else None
+        with self._lock:
+            self._tokens[path] = token
+            self._stamps[path] = (current, now)
+            if file_path is not None:
+                self._urls[os.path.realpath(file_path)] = path
+        return token
+
+    def is_fingerprinted(self, file_path, token: str | None) -> bool:
+        """True when `token` is the current hash of the served `file_path`."""
+        if not token:
+            return False
+        self._ensure_current()
+        with self._lock:
+            path = self._urls.get(os.path.realpath(file_path))
+        return path is not None and self.token(path) == token
+
+    def apply_changes(self, changes) -> int:
+        """Re-hash the assets among watcher `changes`; returns how many changed."""
+        updated = 0
+        with self._lock:
+            paths = [self._urls.get(os.path.realpath(changed)) for _, changed in changes]
+        now = time.monotonic()
+        for path in filter(None, paths):
+            file_path = _static_file_for_url(path)
+            stamp = _file_stamp(file_path) if file_path is not None else None
+            token = _content_token(file_path) if file_path is not None else None
+            with self._lock:
+                self._stamps[path] = (stamp, now)
+                if self._tokens.get(path) != token:
+                    self._tokens[path] = token
+                    updated += 1
+        return updated
+
+    def build(self) -> int:
+        """Hash every known static asset; returns the number of assets."""
+        runtime = _current_runtime()
+        tokens: dict[str, str | None] = {}
+        urls: dict[str, str] = {}
+        stamps: dict[str, tuple[tuple[int, int] | None, float]] = {}
+        now = time.monotonic()
+        package_static = Path(__file__).resolve().parent / "static"
+        sources = [("/static", package_static)] + [
+            (f"/static/extensions/{extension_id}", static_dir) for extension_id, static_dir in iter_extension_static_dirs()
+        ]
+        for prefix, static_dir in sources:
+            for current, _dirs, files in os.walk(static_dir):
+                for name in files:
+                    file_path = Path(current) / name
+                    path = f"{prefix}/{file_path.relative_to(static_dir).as_posix()}"
+                    stamps[path] = (_file_stamp(file_path), now)
+                    tokens[path] = _content_token(file_path)
+                    urls[os.path.realpath(file_path)] = path
+        with self._lock:
+            self._tokens = tokens
+            self._urls = urls
+            self._stamps = stamps
+            self._runtime_id = id(runtime)
+        return len(tokens)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens = {}
+            self._urls = {}
+            self._stamps = {}
+            self._runtime_id = None
+
+    def _ensure_current(self) -> None:
+        if self._runtime_id != id(_current_runtime()):
+            self.build()
+
+
+_asset_manifest = AssetManifest()
+
+
+def asset_manifest() -> AssetManifest:
+    return _asset_manifest
+
+
+def asset_url(path: str) -> str:
+    """Return static URL with a content-hash cache-busting token."""
+    token = _asset_manifest.token(path.partition("?")[0])
+    if token is None:
         return path
     sep = "&" if "?" in path else "?"
     return f"{path}{sep}v={token}"
 
 
+def static_cache_control(file_path, query_params) -> str:
+    """Immutable for a request that names the asset's current hash, else revalidate."""
+    token = query_params.get("v") if query_params is not None else None
+    return IMMUTABLE_CACHE_CONTROL if _asset_manifest.is_fingerprinted(file_path, token) else REVALIDATE_CACHE_CONTROL
+
+
 def extension_asset_path(extension_id: str, asset_name: str) -> Path:
     try:
         from .extensions import get_extension_runtime
@@ -1,3 +1,83 @@
+import re
+import threading
+from collections import OrderedDict
+
+_DECISION_CACHE_SIZE = 16384
+_GRANT_CACHE_SIZE = 64
+# Backreferences are numbered per pattern, so they cannot share one alternation.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class RbacRules(tuple):
+    """Immutable (pattern, roles) rules with one combined regex per question.
+
+    `is_allowed` only needs two facts: does any rule match the path, and does a
+    rule granting one of the caller's roles match it. Each becomes a single
+    alternation, so a path is scanned once instead of once per rule, and
+    decisions are memoized per (path, roles). A new instance is built whenever
+    the RBAC config or store changes, which drops every cached decision.
+    """
+
+    def __new__(cls, rules=()):
+        return super().__new__(cls, ((pattern, frozenset(roles)) for pattern, roles in rules))
+
+    def __init__(self, rules=()):
+        self._lock = threading.Lock()
+        self._decisions: OrderedDict[tuple[str, frozenset], bool] = OrderedDict()
+        self._grants: OrderedDict[frozenset, re.Pattern | None] = OrderedDict()
+        self._any = self._combine(self)
+
+    @staticmethod
+    def _combine(rules) -> re.Pattern | None:
+        if not rules:
+            return None
+        if any(pattern.flags != re.UNICODE or _BACKREFERENCE.search(pattern.pattern) for pattern, _ in rules):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{pattern.pattern})" for pattern, _ in rules))
+        except re.error:
+            return None
+
+    def matches_any(self, path: str) -> bool:
+        if self._any is not None:
+            return self._any.search(path) is not None
+        return any(pattern.search(path) for pattern, _ in self)
+
+    def _granting(self, roles_key: frozenset) -> re.Pattern | None:
+        with self._lock:
+            if roles_key in self._grants:
+                self._grants.move_to_end(roles_key)
+                return self._grants[roles_key]
+        granting = [rule for rule in self if rule[1] & roles_key]
+        compiled = self._combine(granting) if granting else None
+        with self._lock:
+            self._grants[roles_key] = compiled
+            while len(self._grants) > _GRANT_CACHE_SIZE:
+                self._grants.popitem(last=False)
+        return compiled
+
+    def allows(self, path: str, roles) -> bool:
+        roles_key = frozenset(roles or ())
+        key = (path, roles_key)
+        with self._lock:
+            decision = self._decisions.get(key)
+            if decision is not None:
+                self._decisions.move_to_end(key)
+                return decision
+        if not self.matches_any(path):
+            decision = True
+        elif self._any is None:
+            decision = any(pattern.search(path) for pattern, allowed in self if allowed & roles_key)
+        else:
+            granting = self._granting(roles_key)
+            decision = granting is not None and granting.search(path) is not None
+        with self._lock:
+            self._decisions[key] = decision
+            while len(self._decisions) > _DECISION_CACHE_SIZE:
+                self._decisions.popitem(last=False)
+        return decision
+
+
 def normalize_auth(auth):
     if not auth:
         return None
@@ -7,6 +87,8 @@ def normalize_auth(auth):
 
 
 def path_requires_roles(path, rbac_rules):
+    if isinstance(rbac_rules, RbacRules):
+        return rbac_rules.matches_any(path)
     for pattern, _roles in rbac_rules:
         if pattern.search(path):
             return True
@@ -16,6 +98,8 @@ def path_requires_roles(path, rbac_rules):
 def is_allowed(path, roles, rbac_rules):
     if not rbac_rules:
         return True
+    if isinstance(rbac_rules, RbacRules):
+        return rbac_rules.allows(path, roles)
     roles_set = set(roles or [])
     matched_any = False
     allowed = False
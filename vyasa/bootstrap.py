@@ -20,8 +20,14 @@ class DevStaticFiles(StaticFiles):
     def file_response(self, full_path, stat_result, scope, status_code=200):
         start = time.perf_counter()
         response = super().file_response(full_path, stat_result, scope, status_code)
-        # Normal refresh should revalidate local dev assets instead of requiring hard refresh.
-        response.headers["Cache-Control"] = "no-cache, max-age=0, must-revalidate"
+        # Hash-versioned URLs never change; anything else revalidates so a normal refresh picks up edits.
+        from starlette.datastructures import QueryParams
+
+        from .assets import static_cache_control
+        from .extensions_builtin.markdown.render_cache import record_render_dependency
+
+        record_render_dependency(full_path)
+        response.headers["Cache-Control"] = static_cache_control(full_path, QueryParams(scope.get("query_string", b"")))
         try:
             path = scope.get("path", "")
             if path.endswith("viewport_core.js") or "/extensions/tasks/" in path:
@@ -4,6 +4,10 @@ This module provides functionality to convert a folder of markdown files
 into a standalone static website with HTML, CSS, and JavaScript files.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
 from pathlib import Path
 import shutil
 from types import SimpleNamespace
@@ -17,6 +21,7 @@ from .helpers import (
     get_adjacent_posts, get_post_title, is_document_path, is_inside_document_directory, parse_frontmatter, resolve_markdown_title, slug_to_title,
     text_to_anchor,
 )
+from .extensions_builtin.markdown.render_cache import dependency_signature, record_render, record_render_dependency
 from .extensions_builtin.markdown.renderer import from_md
 from .sidebar_helpers import build_toc_items, extract_toc
 from .config import get_config, reload_config
@@ -27,6 +32,8 @@ from .page_shell import PageShellModel, StaticShellRenderer
 from .tree_service import get_tree_entries
 
 _asset_url = asset_url
+_MANIFEST_NAME = ".vyasa-build.json"
+_MANIFEST_VERSION = 1
 
 def generate_static_html(title, body_content, blog_title, favicon_href, extra_head_html=""):
     """Generate complete static HTML page"""
@@ -519,18 +526,232 @@ def static_layout(content_html, blog_title, page_title, nav_tree, favicon_href,
     return StaticShellRenderer(generate_static_html).render(model)
 
 
-def build_static_site(input_dir=None, output_dir=None):
+def _find_document_files(root_folder, show_hidden, include_list, ignore_list):
+    doc_files = []
+    for suffix in enabled_document_suffixes():
+        for doc_file in root_folder.rglob(f"*{suffix}"):
+            try:
+                relative_path = doc_file.relative_to(root_folder)
+                if is_inside_document_directory(doc_file) or not is_document_path(doc_file):
+                    continue
+                if not show_hidden and any(part.startswith('.') for part in relative_path.parts):
+                    continue
+                path_parts = relative_path.parts[:-1]
+                if any(not _should_include_folder(part, include_list, ignore_list) for part in path_parts):
+                    continue
+                doc_files.append(doc_file)
+            except ValueError:
+                continue
+    return sorted(doc_files)
+
+
+def _output_path_for(doc_file, root_folder, output_dir):
+    relative_path = doc_file.relative_to(root_folder)
+    if doc_file.suffix == ".md" and doc_file.stem.lower() in ['index', 'readme'] and doc_file.parent == root_folder:
+        # Root index/readme becomes index.html
+        return output_dir / 'index.html'
+    # Other files go in posts/ directory
+    doc_slug = content_slug_for_path(doc_file) or relative_path.with_suffix("").as_posix()
+    return output_dir / 'posts' / f"{doc_slug}.html"
+
+
+def _build_state(root_folder, output_dir):
+    """Everything every page of one build shares. Built once in the parent and
+    once per worker process (nav trees hold FT nodes, which do not pickle)."""
+    config = get_config()
+    runtime = get_extension_runtime()
+    if runtime is None:
+        runtime = refresh_extension_runtime(config.get_extensions_config())
+    show_hidden = config.get_show_hidden()
+    return SimpleNamespace(
+        config=config,
+        runtime=runtime,
+        root_folder=root_folder,
+        output_dir=output_dir,
+        blog_title=config.get_blog_title(),
+        show_hidden=show_hidden,
+        abbreviations=_effective_abbreviations(root_folder),
+        nav_tree=build_post_tree_static(root_folder, root_folder, show_hidden=show_hidden),
+        favicon_href=resolve_favicon_href(root_folder),
+    )
+
+
+def _render_document_page(state, doc_file, adjacent):
+    """Full static HTML for one document, or None when no renderer handles it."""
+    root_folder, runtime, abbreviations = state.root_folder, state.runtime, state.abbreviations
+    relative_path = doc_file.relative_to(root_folder)
+    kind = document_kind_for_path(doc_file)
+    if kind == "markdown":
+        metadata, raw_content = parse_frontmatter(doc_file)
+        post_title, render_content = resolve_markdown_title(doc_file, abbreviations=abbreviations)
+        content_div = from_md(render_content, current_path=str(relative_path))
+        toc_headings = extract_toc(raw_content, _strip_inline_markdown, text_to_anchor, _unique_anchor)
+        toc_items = build_toc_items(toc_headings)
+        content_html = to_xml(content_div)
+    else:
+        renderer = runtime.static_document_renderers.get(kind) if runtime is not None and kind else None
+        if renderer is None:
+            return None
+        record_render_dependency(doc_file)
+        rendered = renderer(
+            SimpleNamespace(
+                doc_file=doc_file,
+                relative_path=relative_path,
+                root_folder=root_folder,
+                output_dir=state.output_dir,
+                abbreviations=abbreviations,
+                slug_to_title=slug_to_title,
+            )
+        )
+        post_title = rendered.title
+        raw_content = rendered.raw_content
+        toc_items = rendered.toc_items
+        content_html = rendered.content_html
+    prev_item, next_item = adjacent
+    read_source = expand_markdown_includes_for_reading(
+        render_content if kind == "markdown" else raw_content,
+        current_path=str(relative_path.with_suffix("")) if kind == "markdown" else None,
+        root_folder=root_folder,
+    ) if kind == "markdown" else raw_content
+
+    read_time = estimate_read_time_minutes(read_source)
+    last_modified = format_last_modified_label(doc_file)
+    meta_text = f"{read_time}-min read"
+    if last_modified:
+        meta_text += f" • {last_modified}"
+    title_html = f'<div class="mb-8"><h1 class="text-4xl font-bold">{post_title}</h1><p class="vyasa-read-time text-sm text-slate-500 dark:text-slate-400 mt-2">{meta_text}</p></div>'
+    content_html = title_html + content_html
+
+    if prev_item or next_item:
+        prev_html = f'<a class="vyasa-prev-link" href="{prev_item["static_href"]}">← {prev_item["title"]}</a>' if prev_item else '<div></div>'
+        next_html = f'<a class="vyasa-next-link" href="{next_item["static_href"]}">{next_item["title"]} →</a>' if next_item else '<div></div>'
+        content_html += f'<div class="vyasa-prev-next">{prev_html}{next_html}</div>'
+
+    # Generate full page
+    extra_head_html = bundle_asset_html(
+        requested_page_bundles(
+            show_sidebar=True,
+            current_path=content_slug_for_path(doc_file) or str(relative_path.with_suffix("")),
+            annotations_enabled=state.config.get_annotations_enabled(),
+            mode="static",
+        )
+    )
+    return static_layout(
+        content_html=content_html,
+        blog_title=state.blog_title,
+        page_title=f"{post_title} - {state.blog_title}",
+        nav_tree=state.nav_tree,
+        favicon_href=state.favicon_href,
+        toc_items=toc_items,
+        current_path=content_slug_for_path(doc_file) or str(relative_path.with_suffix('')),
+        updated_label=last_modified,
+        extra_head_html=extra_head_html,
+    )
+
+
+def _build_document(state, doc_file, adjacent):
+    """Render and write one page, returning its manifest record (or None)."""
+    with record_render() as recorder:
+        record_render_dependency(doc_file)
+        full_html = _render_document_page(state, doc_file, adjacent)
+    if full_html is None:
+        return None
+    output_path = _output_path_for(doc_file, state.root_folder, state.output_dir)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(full_html, encoding='utf-8')
+    return {
+        "output": output_path.relative_to(state.output_dir).as_posix(),
+        "deps": [[str(path), _jsonable(signature)] for path, signature in recorder.files.values()],
+        # Probes (e.g. the wikilink index) cannot be replayed from disk; such
+        # pages are rebuilt whenever any document in the site changes.
+        "corpus": bool(recorder.probes),
+    }
+
+
+_WORKER_STATE = None
+
+
+def _init_build_worker(root_folder, output_dir):
+    global _WORKER_STATE
+    if get_config().get_root_folder().resolve() != root_folder.resolve():
+        os.environ['VYASA_ROOT'] = str(root_folder)
+        reload_config()
+        refresh_extension_runtime(get_config().get_extensions_config())
+    _WORKER_STATE = _build_state(root_folder, output_dir)
+
+
+def _build_document_in_worker(doc_file, adjacent):
+    return _build_document(_WORKER_STATE, doc_file, adjacent)
+
+
+def _jsonable(value):
+    return json.loads(json.dumps(value))
+
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _site_key(state):
+    """Changes when anything every page embeds changes: the nav tree, config,
+    extension set, blog identity, or the Vyasa version itself."""
+    from . import __version__
+
+    runtime = state.runtime
+    return _digest(
+        __version__,
+        state.blog_title,
+        state.favicon_href,
+        state.show_hidden,
+        to_xml(Ul(*state.nav_tree)),
+        repr(state.config._config),
+        sorted((key, value) for key, value in os.environ.items() if key.startswith("VYASA_")),
+        list(runtime.plan.enabled_ids) if runtime is not None else [],
+    )
+
+
+def _page_key(doc_file, adjacent):
+    return _digest(
+        _jsonable(dependency_signature(doc_file)),
+        adjacent,
+        format_last_modified_label(doc_file),
+    )
+
+
+def _page_is_current(record, page_key, corpus_key, output_dir):
+    if not record or record.get("key") != page_key or not (output_dir / record.get("output", "")).is_file():
+        return False
+    if record.get("corpus") and record.get("corpus_key") != corpus_key:
+        return False
+    return all(_jsonable(dependency_signature(Path(path))) == signature for path, signature in record.get("deps", []))
+
+
+def _read_manifest(output_dir):
+    try:
+        manifest = json.loads((output_dir / _MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) and manifest.get("version") == _MANIFEST_VERSION else None
+
+
+def build_static_site(input_dir=None, output_dir=None, *, jobs=None, clean=False):
     """
     Build a complete static site from markdown files
-    
+
+    Rebuilds are incremental: `.vyasa-build.json` in the output directory
+    records each page's key and the files its render read, so only pages whose
+    source, includes, neighbours or the shared nav/config changed are rendered
+    again. Pages render across `jobs` processes (default: CPU count).
+
     Args:
         input_dir: Path to markdown files (defaults to VYASA_ROOT or current dir)
         output_dir: Path to output directory (defaults to ./dist)
+        jobs: Worker processes for rendering; 1 renders in-process
+        clean: Ignore any previous manifest and rebuild from an empty directory
     """
     
     # Initialize config
     if input_dir:
-        import os
         os.environ['VYASA_ROOT'] = str(Path(input_dir).resolve())
         reload_config()
     
@@ -539,7 +760,6 @@ def build_static_site(input_dir=None, output_dir=None):
     root_folder = config.get_root_folder()
     blog_title = config.get_blog_title()
     show_hidden = config.get_show_hidden()
-    abbreviations = _effective_abbreviations(root_folder)
     
     # Set default output directory
     if output_dir is None:
@@ -552,125 +772,57 @@ def build_static_site(input_dir=None, output_dir=None):
     print(f"  Output: {output_dir}")
     print(f"  Blog title: {blog_title}")
     
-    # Create output directory
-    if output_dir.exists():
-        shutil.rmtree(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Build navigation tree with static .html links
-    nav_tree = build_post_tree_static(root_folder, root_folder, show_hidden=show_hidden)
+    state = _build_state(root_folder, output_dir)
+    runtime = state.runtime
+    nav_tree, favicon_href = state.nav_tree, state.favicon_href
     root_icon = root_folder / "static" / "icon.png"
-    favicon_href = resolve_favicon_href(root_folder)
+    site_key = _site_key(state)
+    manifest = None if clean else _read_manifest(output_dir)
+    if manifest is None or manifest.get("site") != site_key:
+        # No usable manifest, or something every page embeds changed: start over.
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        manifest = None
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous_pages = (manifest or {}).get("pages", {})
     
     # Find all renderable document files (only in the specified root folder, not parent directories)
     ignore_list = _effective_ignore_list(root_folder)
     include_list = _effective_include_list(root_folder)
-    doc_files = []
-    runtime = get_extension_runtime()
-    if runtime is None:
-        runtime = refresh_extension_runtime(config.get_extensions_config())
-    for suffix in enabled_document_suffixes():
-        for doc_file in root_folder.rglob(f"*{suffix}"):
-            try:
-                relative_path = doc_file.relative_to(root_folder)
-                if is_inside_document_directory(doc_file) or not is_document_path(doc_file):
-                    continue
-                if not show_hidden and any(part.startswith('.') for part in relative_path.parts):
-                    continue
-                path_parts = relative_path.parts[:-1]
-                if any(not _should_include_folder(part, include_list, ignore_list) for part in path_parts):
-                    continue
-                doc_files.append(doc_file)
-            except ValueError:
-                continue
-    
-    doc_files = sorted(doc_files)
+    doc_files = _find_document_files(root_folder, show_hidden, include_list, ignore_list)
     print(f"\nFound {len(doc_files)} document files")
-    
-    # Process each document file
+
+    corpus_key = _digest([[str(path), _jsonable(dependency_signature(path))] for path in doc_files])
+    pages, pending = {}, []
     for doc_file in doc_files:
-        relative_path = doc_file.relative_to(root_folder)
-        print(f"  Processing: {relative_path}")
-
-        kind = document_kind_for_path(doc_file)
-        if kind == "markdown":
-            metadata, raw_content = parse_frontmatter(doc_file)
-            post_title, render_content = resolve_markdown_title(doc_file, abbreviations=abbreviations)
-            content_div = from_md(render_content, current_path=str(relative_path))
-            toc_headings = extract_toc(raw_content, _strip_inline_markdown, text_to_anchor, _unique_anchor)
-            toc_items = build_toc_items(toc_headings)
-            content_html = to_xml(content_div)
+        relative = doc_file.relative_to(root_folder).as_posix()
+        adjacent = get_adjacent_posts(root_folder, doc_file.relative_to(root_folder), abbreviations=state.abbreviations) if doc_file.suffix == ".md" else (None, None)
+        page_key = _page_key(doc_file, adjacent)
+        record = previous_pages.get(relative)
+        if _page_is_current(record, page_key, corpus_key, output_dir):
+            pages[relative] = record
         else:
-            renderer = runtime.static_document_renderers.get(kind) if runtime is not None and kind else None
-            if renderer is None:
-                continue
-            rendered = renderer(
-                SimpleNamespace(
-                    doc_file=doc_file,
-                    relative_path=relative_path,
-                    root_folder=root_folder,
-                    output_dir=output_dir,
-                    abbreviations=abbreviations,
-                    slug_to_title=slug_to_title,
-                )
-            )
-            post_title = rendered.title
-            raw_content = rendered.raw_content
-            toc_items = rendered.toc_items
-            content_html = rendered.content_html
-        prev_item, next_item = get_adjacent_posts(root_folder, relative_path, abbreviations=abbreviations)
-        read_source = expand_markdown_includes_for_reading(
-            render_content if kind == "markdown" else raw_content,
-            current_path=str(relative_path.with_suffix("")) if kind == "markdown" else None,
-            root_folder=root_folder,
-        ) if kind == "markdown" else raw_content
-
-        read_time = estimate_read_time_minutes(read_source)
-        last_modified = format_last_modified_label(doc_file)
-        meta_text = f"{read_time}-min read"
-        if last_modified:
-            meta_text += f" • {last_modified}"
-        title_html = f'<div class="mb-8"><h1 class="text-4xl font-bold">{post_title}</h1><p class="vyasa-read-time text-sm text-slate-500 dark:text-slate-400 mt-2">{meta_text}</p></div>'
-        content_html = title_html + content_html
-
-        if prev_item or next_item:
-            prev_html = f'<a class="vyasa-prev-link" href="{prev_item["static_href"]}">← {prev_item["title"]}</a>' if prev_item else '<div></div>'
-            next_html = f'<a class="vyasa-next-link" href="{next_item["static_href"]}">{next_item["title"]} →</a>' if next_item else '<div></div>'
-            content_html += f'<div class="vyasa-prev-next">{prev_html}{next_html}</div>'
-
-        # Generate full page
-        extra_head_html = bundle_asset_html(
-            requested_page_bundles(
-                show_sidebar=True,
-                current_path=content_slug_for_path(doc_file) or str(relative_path.with_suffix("")),
-                annotations_enabled=config.get_annotations_enabled(),
-                mode="static",
-            )
-        )
-        full_html = static_layout(
-            content_html=content_html,
-            blog_title=blog_title,
-            page_title=f"{post_title} - {blog_title}",
-            nav_tree=nav_tree,
-            favicon_href=favicon_href,
-            toc_items=toc_items,
-            current_path=content_slug_for_path(doc_file) or str(relative_path.with_suffix('')),
-            updated_label=format_last_modified_label(doc_file),
-            extra_head_html=extra_head_html,
-        )
-        
-        # Determine output path
-        if doc_file.suffix == ".md" and doc_file.stem.lower() in ['index', 'readme'] and doc_file.parent == root_folder:
-            # Root index/readme becomes index.html
-            output_path = output_dir / 'index.html'
-        else:
-            # Other files go in posts/ directory
-            doc_slug = content_slug_for_path(doc_file) or relative_path.with_suffix("").as_posix()
-            output_path = output_dir / 'posts' / f"{doc_slug}.html"
-        
-        # Create directory and write file
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(full_html, encoding='utf-8')
+            pending.append((relative, doc_file, adjacent, page_key))
+
+    # Pages whose source disappeared since the last build.
+    pending_names = {item[0] for item in pending}
+    for relative, record in previous_pages.items():
+        if relative not in pages and relative not in pending_names:
+            (output_dir / record.get("output", "")).unlink(missing_ok=True)
+
+    print(f"  Up to date: {len(pages)}; rendering: {len(pending)}")
+    for item in pending:
+        print(f"  Processing: {item[0]}")
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_build_worker, initargs=(root_folder, output_dir)) as pool:
+            futures = [(item, pool.submit(_build_document_in_worker, item[1], item[2])) for item in pending]
+            results = [(item, future.result()) for item, future in futures]
+    else:
+        results = [(item, _build_document(state, item[1], item[2])) for item in pending]
+    for (relative, _doc_file, _adjacent, page_key), record in results:
+        if record is not None:
+            pages[relative] = {**record, "key": page_key, "corpus_key": corpus_key}
 
     for provider in runtime.static_build_providers if runtime is not None else ():
         provider(
@@ -730,6 +882,11 @@ def build_static_site(input_dir=None, output_dir=None):
         )
         
         index_path.write_text(full_html, encoding='utf-8')
+
+    (output_dir / _MANIFEST_NAME).write_text(
+        json.dumps({"version": _MANIFEST_VERSION, "site": site_key, "pages": pages}, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
     
     print(f"\n✅ Static site built successfully!")
     print(f"📁 Output directory: {output_dir}")
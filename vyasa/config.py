@@ -352,6 +352,10 @@ class VyasaConfig:
             return port_for_working_directory(Path.cwd())
         return int(port)
     
+    def get_workers(self) -> int:
+        """Get the number of server worker processes (default 1)."""
+        return max(1, int(self.get('workers', 'VYASA_WORKERS', 1)))
+
     def get_auth(self):
         """Get authentication credentials from config, env, or default (None)."""
         user = self.get('username', 'VYASA_USER', None)
@@ -448,6 +452,11 @@ class VyasaConfig:
             return value.lower() in ('true', '1', 'yes', 'on')
         return bool(value)
 
+    def get_sidebar_virtual_threshold(self) -> int:
+        """Get the folder size above which the sidebar lists a branch as a virtualized
+        list fed by `/api/sidebar/tree` instead of server-rendered rows (0 disables)."""
+        return max(0, int(self.get('sidebar_virtual_threshold', 'VYASA_SIDEBAR_VIRTUAL_THRESHOLD', 200)))
+
     def get_show_hidden(self) -> bool:
         """Get whether hidden files and folders should appear in listings."""
         value = self.get('show_hidden', 'VYASA_SHOW_HIDDEN', False)
@@ -488,6 +497,18 @@ class VyasaConfig:
             return value.lower() in ('true', '1', 'yes', 'on')
         return bool(value)
 
+    def get_content_watch_enabled(self) -> bool:
+        """Get whether a background file watcher keeps the content index current.
+
+        On by default. Turn it off where watches are scarce or unreliable
+        (network filesystems, tight inotify limits); sidebar fingerprints then
+        rescan the content tree instead.
+        """
+        value = self.get('content_watch', 'VYASA_CONTENT_WATCH', True)
+        if isinstance(value, str):
+            return value.lower() in ('true', '1', 'yes', 'on')
+        return bool(value)
+
     def get_source_reload_enabled(self) -> bool:
         """Get whether Vyasa source changes should restart the server."""
         value = self.get('reload_source', 'VYASA_RELOAD_SOURCE', False)
@@ -507,6 +528,7 @@ class VyasaConfig:
         defaults = [
             ".git", ".venv", "venv", "node_modules", "dist", "build",
             ".pytest_cache", ".mypy_cache", ".ruff_cache", "__pycache__", ".cache",
+            ".vyasa-storage",
         ]
         value = self.get('reload_exclude', 'VYASA_RELOAD_EXCLUDE', [])
         extras = [str(v).strip() for v in self._coerce_list(value) if str(v).strip()]
@@ -12,11 +12,19 @@ from __future__ import annotations
 
 import contextvars
 import fnmatch
+import os
 import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Generic, Literal, Protocol, TypeVar, overload, runtime_checkable
+
+if TYPE_CHECKING:
+    from dulwich.objects import ObjectID
+    from dulwich.repo import Repo
 
 EntryKind = Literal["file", "dir"]
 
@@ -136,6 +144,70 @@ class FilesystemBackend:
 
 
 _GIT_DIR_MODE = 0o040000
+# How often GitBackend re-stats HEAD/packed-refs/refs/ to notice moved refs.
+_REFS_RECHECK_SECONDS = 1.0
+
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+_D = TypeVar("_D")
+
+
+class _Missing:
+    """Cache-miss marker, distinct from a cached None."""
+
+
+_MISSING = _Missing()
+
+
+class _LRU(Generic[_K, _V]):
+    """Small thread-safe LRU. `max_weight` bounds the summed `weigh(value)`
+    (e.g. blob bytes) on top of the entry count."""
+
+    def __init__(self, maxsize: int, max_weight: int | None = None, weigh: Callable[[_V], int] | None = None):
+        self._items: OrderedDict[_K, _V] = OrderedDict()
+        self._maxsize = maxsize
+        self._max_weight = max_weight
+        self._weigh = weigh or (lambda value: 0)
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    @overload
+    def get(self, key: _K) -> _V | None: ...
+
+    @overload
+    def get(self, key: _K, default: _D) -> _V | _D: ...
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: _K, value: _V) -> None:
+        weight = self._weigh(value)
+        if self._max_weight is not None and weight > self._max_weight:
+            return
+        with self._lock:
+            if key in self._items:
+                self._weight -= self._weigh(self._items.pop(key))
+            self._items[key] = value
+            self._weight += weight
+            while self._items and (
+                len(self._items) > self._maxsize
+                or (self._max_weight is not None and self._weight > self._max_weight)
+            ):
+                _, evicted = self._items.popitem(last=False)
+                self._weight -= self._weigh(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
 
 
 class GitBackend:
@@ -148,6 +220,59 @@ class GitBackend:
 
         self._repo = Repo(str(git_dir))
         self.root_id = root_id
+        # Object-keyed caches never go stale: an oid names immutable content.
+        self._commits: _LRU[str, tuple[ObjectID, float]] = _LRU(1024)  # commit sha -> (root tree sha, commit time)
+        self._entries: _LRU[tuple[bytes, str], tuple[int, ObjectID] | None] = _LRU(16384)  # (tree sha, rel) -> (mode, sha) | None
+        self._listings: _LRU[bytes, list[TreeItem]] = _LRU(4096)  # tree sha -> sorted TreeItems
+        self._blobs: _LRU[bytes, bytes] = _LRU(4096, max_weight=32 * 1024 * 1024, weigh=len)  # blob sha -> bytes
+        # Ref-keyed caches are dropped whenever the refs on disk move.
+        self._refs: _LRU[str, str | None] = _LRU(256)  # ref name -> peeled commit sha | None
+        self._remote_shorts: dict[str, list[str]] | None = None
+        self._refs_stamp: tuple | None = None
+        self._refs_checked_at = 0.0
+        self._refs_lock = threading.Lock()
+
+    def _check_refs(self) -> None:
+        """Drop ref caches if HEAD, packed-refs or any loose ref changed.
+        Re-stats at most every `_REFS_RECHECK_SECONDS`; fetches (in-process or
+        from a `vyasa-fetch` sidecar) only ever move refs through these files."""
+        now = time.monotonic()
+        if now - self._refs_checked_at < _REFS_RECHECK_SECONDS:
+            return
+        with self._refs_lock:
+            if now - self._refs_checked_at < _REFS_RECHECK_SECONDS:
+                return
+            stamp = self._current_refs_stamp()
+            if stamp != self._refs_stamp:
+                self._refs.clear()
+                self._remote_shorts = None
+                self._refs_stamp = stamp
+            self._refs_checked_at = now
+
+    def forget_refs(self) -> None:
+        """Drop ref caches now (after a fetch this process just ran)."""
+        with self._refs_lock:
+            self._refs.clear()
+            self._remote_shorts = None
+            self._refs_stamp = None
+            self._refs_checked_at = 0.0
+
+    def _current_refs_stamp(self) -> tuple:
+        control = Path(self._repo.controldir())
+        common = Path(self._repo.commondir())
+        stamp = []
+        for path in (control / "HEAD", common / "packed-refs"):
+            try:
+                stamp.append((path.name, path.stat().st_mtime_ns))
+            except OSError:
+                stamp.append((path.name, None))
+        for current, _dirs, files in os.walk(common / "refs"):
+            for name in (".", *files):
+                try:
+                    stamp.append((current, name, os.stat(os.path.join(current, name)).st_mtime_ns))
+                except OSError:
+                    continue
+        return tuple(stamp)
 
     def default_ref(self) -> str:
         try:
@@ -157,6 +282,15 @@ class GitBackend:
             return ""
 
     def resolve_ref(self, ref: str) -> str | None:
+        self._check_refs()
+        cached = self._refs.get(ref, _MISSING)
+        if not isinstance(cached, _Missing):
+            return cached
+        sha = self._resolve_ref_uncached(ref)
+        self._refs.set(ref, sha)
+        return sha
+
+    def _resolve_ref_uncached(self, ref: str) -> str | None:
         name = ref or "HEAD"
         refs = self._repo.refs
         if name.startswith("local/"):
@@ -182,6 +316,10 @@ class GitBackend:
         return None
 
     def _remote_refs_by_short(self) -> dict[str, list[str]]:
+        self._check_refs()
+        cached = self._remote_shorts
+        if cached is not None:
+            return cached
         refs: dict[str, list[str]] = {}
         for full in self._repo.refs.keys(base=b"refs/remotes/"):
             name = full.decode()
@@ -189,12 +327,15 @@ class GitBackend:
             if not remote or not short or short == "HEAD":
                 continue
             refs.setdefault(short, []).append(name)
+        self._remote_shorts = refs
         return refs
 
     def _peel(self, sha: bytes) -> bytes:
         """Follow annotated tags down to the commit they point at."""
+        from dulwich.objects import Tag
+
         obj = self._repo.get_object(sha)
-        while obj.type_name == b"tag":
+        while isinstance(obj, Tag):
             obj = self._repo.get_object(obj.object[1])
         return obj.id
 
@@ -216,42 +357,86 @@ class GitBackend:
             out.append(RefInfo(full.decode(), "tag", False))
         return out
 
-    def _tree_at(self, ref: str):
+    def _tree_id_at(self, ref: str) -> ObjectID | None:
         sha = self.resolve_ref(ref)
         if sha is None:
             return None
-        return self._repo.get_object(self._repo.get_object(sha.encode()).tree)
+        return self._commit(sha)[0]
 
-    def _lookup(self, rel: str, ref: str):
-        """Return (mode, sha) for rel under ref, or None."""
-        from dulwich.object_store import tree_lookup_path
+    def _commit(self, sha: str) -> tuple[ObjectID, float]:
+        from dulwich.objects import Commit
+
+        cached = self._commits.get(sha)
+        if cached is None:
+            commit = self._repo.get_object(sha.encode())
+            if not isinstance(commit, Commit):
+                raise KeyError(sha)
+            cached = (commit.tree, float(commit.commit_time))
+            self._commits.set(sha, cached)
+        return cached
 
-        tree = self._tree_at(ref)
-        if tree is None:
+    def _lookup(self, rel: str, ref: str) -> tuple[int, ObjectID] | None:
+        """Return (mode, sha) for rel under ref, or None."""
+        tree_id = self._tree_id_at(ref)
+        if tree_id is None:
             return None
         if not rel:
-            return (_GIT_DIR_MODE, tree.id)
-        try:
-            return tree_lookup_path(self._repo.get_object, tree.id, rel.encode())
-        except KeyError:
-            return None
+            return (_GIT_DIR_MODE, tree_id)
+        return self._entry(tree_id, rel)
+
+    def _entry(self, tree_id: ObjectID, rel: str) -> tuple[int, ObjectID] | None:
+        """(mode, sha) of `rel` inside tree `tree_id`. Resolved through the
+        parent folder's entry, so siblings share every lookup above them."""
+        from dulwich.objects import Tree
+
+        key = (tree_id, rel)
+        cached = self._entries.get(key, _MISSING)
+        if not isinstance(cached, _Missing):
+            return cached
+        parent, _, name = rel.rpartition("/")
+        parent_entry = self._entry(tree_id, parent) if parent else (_GIT_DIR_MODE, tree_id)
+        found = None
+        if parent_entry is not None and parent_entry[0] == _GIT_DIR_MODE:
+            tree = self._repo.get_object(parent_entry[1])
+            try:
+                found = tree[name.encode()] if isinstance(tree, Tree) else None
+            except KeyError:
+                found = None
+        self._entries.set(key, found)
+        return found
 
     def list_dir(self, rel: str, ref: str = "") -> list[TreeItem]:
         found = self._lookup(rel, ref)
         if found is None or found[0] != _GIT_DIR_MODE:
             return []
-        tree = self._repo.get_object(found[1])
-        items = [
-            TreeItem(name.decode(), "dir" if mode == _GIT_DIR_MODE else "file")
-            for name, mode, _ in tree.items()
-        ]
-        return sorted(items, key=lambda t: t.name)
+        items = self._listings.get(found[1])
+        if items is None:
+            from dulwich.objects import Tree
+
+            tree = self._repo.get_object(found[1])
+            if not isinstance(tree, Tree):
+                return []
+            items = sorted(
+                (TreeItem(name.decode(), "dir" if mode == _GIT_DIR_MODE else "file") for name, mode, _ in tree.items()),
+                key=lambda t: t.name,
+            )
+            self._listings.set(found[1], items)
+        return list(items)
 
     def read_bytes(self, rel: str, ref: str = "") -> bytes | None:
         found = self._lookup(rel, ref)
         if found is None or found[0] == _GIT_DIR_MODE:
             return None
-        return self._repo.get_object(found[1]).data
+        data = self._blobs.get(found[1])
+        if data is None:
+            from dulwich.objects import Blob
+
+            blob = self._repo.get_object(found[1])
+            if not isinstance(blob, Blob):
+                return None
+            data = blob.data
+            self._blobs.set(found[1], data)
+        return data
 
     def stat_kind(self, rel: str, ref: str = "") -> EntryKind | None:
         found = self._lookup(rel, ref)
@@ -264,7 +449,7 @@ class GitBackend:
         if sha is None:
             return 0.0
         try:
-            return float(self._repo.get_object(sha.encode()).commit_time)
+            return self._commit(sha)[1]
         except (KeyError, AttributeError):
             return 0.0
 
@@ -435,55 +620,122 @@ class RootClass:
     current_branch: str | None = None  # checked-out branch of a clone; None if detached
 
 
+# path -> (stamp, RootClass) and path -> open Repo, for classify_root.
+_ROOT_CLASSES: dict[Path, tuple[tuple, RootClass]] = {}
+_ROOT_REPOS: dict[Path, Repo] = {}
+_ROOT_LOCK = threading.Lock()
+
+
+def _file_stamp(path: Path) -> tuple | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    # git rewrites HEAD and refs through a lockfile rename, so a new inode
+    # tells two writes apart even within one coarse mtime tick.
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _root_stamp(rc: RootClass) -> tuple:
+    """What a root's classification depends on: the root folder itself (a `.git`
+    appearing or vanishing) and, for repos, HEAD and the branch refs."""
+    paths = [rc.path]
+    if rc.git_dir is not None:
+        paths += [rc.git_dir, rc.git_dir / "HEAD", rc.git_dir / "packed-refs", rc.git_dir / "refs" / "heads"]
+    return tuple(_file_stamp(path) for path in paths)
+
+
 def classify_root(path: Path) -> RootClass:
     """Classify a content root using dulwich, never shelling out to git.
 
+    Memoized per root until the root folder, HEAD or the branch refs change
+    (a few stats per call), on one long-lived `Repo` handle per repository:
+    page views ask for the checked-out branch, and opening a repo reads its
+    config and refs from disk, which is slow on network filesystems.
+
     If dulwich is unavailable, git features degrade off: every root is
     treated as a plain folder rather than breaking content serving."""
     path = Path(path).resolve()
+    memo = _ROOT_CLASSES.get(path)
+    if memo is not None and _root_stamp(memo[1]) == memo[0]:
+        return memo[1]
+    rc = _classify_root(path)
+    with _ROOT_LOCK:
+        _ROOT_CLASSES[path] = (_root_stamp(rc), rc)
+    return rc
+
+
+def _root_repo(path: Path) -> Repo:
+    """The cached `Repo` for `path`, reopened when its control dir is gone;
+    raises NotGitRepository for plain folders."""
+    from dulwich.repo import Repo
+
+    with _ROOT_LOCK:
+        repo = _ROOT_REPOS.get(path)
+        if repo is not None and os.path.isdir(repo.controldir()):
+            return repo
+        stale = _ROOT_REPOS.pop(path, None)
+    if stale is not None:
+        stale.close()
+    repo = Repo(str(path))
+    with _ROOT_LOCK:
+        current = _ROOT_REPOS.setdefault(path, repo)
+    if current is not repo:
+        repo.close()
+    return current
+
+
+def _classify_root(path: Path) -> RootClass:
     try:
         from dulwich.errors import NotGitRepository
-        from dulwich.repo import Repo
     except ImportError:
         return RootClass("plain", path)
 
     try:
-        repo = Repo(str(path))
+        repo = _root_repo(path)
     except NotGitRepository:
         return RootClass("plain", path)
+    if repo.bare:
+        return RootClass("bare", path, git_dir=path)
+    branch = None
     try:
-        if repo.bare:
-            return RootClass("bare", path, git_dir=path)
-        branch = None
-        try:
-            head = repo.refs.follow(b"HEAD")[0][-1]
-            if head.startswith(b"refs/heads/"):
-                branch = head.decode().removeprefix("refs/heads/")
-        except (KeyError, IndexError):
-            branch = None  # detached HEAD
-        return RootClass("clone", path, git_dir=Path(repo.controldir()), current_branch=branch)
-    finally:
-        repo.close()
+        head = repo.refs.follow(b"HEAD")[0][-1]
+        if head.startswith(b"refs/heads/"):
+            branch = head.decode().removeprefix("refs/heads/")
+    except (KeyError, IndexError):
+        branch = None  # detached HEAD
+    return RootClass("clone", path, git_dir=Path(repo.controldir()), current_branch=branch)
 
 
-def uncommitted_paths(rc: RootClass) -> frozenset[str]:
+def uncommitted_paths(rc: RootClass, max_age: float = 0.0) -> frozenset[str]:
     """Posix-relative paths in a working clone that differ from HEAD
     (staged, unstaged, or untracked). Empty for bare/plain roots and for a
-    detached HEAD. Drives the per-file uncommitted indicator in disk mode."""
+    detached HEAD. Drives the per-file uncommitted indicator in disk mode.
+
+    Kept current incrementally while the content watcher runs (see
+    `vyasa.worktree_status`); without one, a full status scan at most every
+    `max_age` seconds."""
     if rc.kind != "clone" or rc.current_branch is None:
         return frozenset()
+    from .worktree_status import worktree_statuses
+
+    return worktree_statuses().paths(rc, max_age=max_age)
+
+
+def _status_paths(rc: RootClass) -> set[str]:
+    """Full `git status` of a working clone: every path staged, unstaged or untracked."""
     from dulwich import porcelain
 
     try:
         status = porcelain.status(str(rc.path), untracked_files="all")
     except Exception:
-        return frozenset()
+        return set()
     dirty: set[str] = set()
     for paths in status.staged.values():
         dirty.update(p.decode() if isinstance(p, bytes) else p for p in paths)
     for p in (*status.unstaged, *status.untracked):
         dirty.add(p.decode() if isinstance(p, bytes) else p)
-    return frozenset(dirty)
+    return dirty
 
 
 _GIT_BACKEND_CACHE: dict[tuple[str, str], "GitBackend"] = {}
@@ -507,6 +759,14 @@ def git_backend_for(git_dir, root_id: str = "") -> "GitBackend":
     return backend
 
 
+def forget_git_refs() -> None:
+    """Make every cached GitBackend re-resolve refs on its next read."""
+    with _GIT_BACKEND_LOCK:
+        backends = list(_GIT_BACKEND_CACHE.values())
+    for backend in backends:
+        backend.forget_refs()
+
+
 def backend_for(rc: RootClass, ref: str = "", root_id: str = "") -> tuple[ContentBackend, bool]:
     """Pick the backend for a (root, ref) pair. Returns (backend, disk_mode);
     disk_mode is True only when a working tree is served and uncommitted
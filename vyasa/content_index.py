@@ -0,0 +1,264 @@
+"""Process-wide index of the visible content tree, fed by the file watcher.
+
+`ContentTree.fingerprint()` used to walk every mount with `os.walk` and stat
+every file on each sidebar request. The index keeps one snapshot per scan
+scope (mounts + visibility knobs) holding each visible file's mtime, size and
+lazily resolved title, and a generation counter that moves only when a snapshot
+actually changes. While the `_ReloadHub` watcher covers a scope's roots, change
+batches are applied incrementally and the fingerprint is an O(1) read; without
+a watcher (not installed, over the inotify limit, roots outside the watch set)
+every read falls back to one full rescan, which is still a single walk.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .helpers import should_exclude_dir
+
+# watchfiles.Change.deleted; kept numeric so this module never imports watchfiles.
+_CHANGE_DELETED = 3
+_MAX_SCOPES = 8
+
+
+@dataclass(frozen=True)
+class IndexScope:
+    """What one `ContentTree` considers visible; snapshots are keyed by it."""
+
+    mounts: tuple[tuple[str, Path], ...]
+    show_hidden: bool
+    excluded_dirs: frozenset[str]
+    suffixes: tuple[str, ...]
+
+    def root_for(self, path: Path) -> Path | None:
+        for _, root in self.mounts:
+            if path == root or root in path.parents:
+                return root
+        return None
+
+    def is_visible_dir(self, root: Path, path: Path) -> bool:
+        for name in path.relative_to(root).parts:
+            if should_exclude_dir(name, self.excluded_dirs) or (not self.show_hidden and name.startswith(".")):
+                return False
+        return True
+
+    def tracks_file(self, name: str) -> bool:
+        return name == ".vyasa" or name.endswith(self.suffixes)
+
+
+@dataclass
+class IndexEntry:
+    path: Path
+    mtime: float
+    size: int
+    title: str | None = None
+    title_key: tuple | None = None
+
+    def same_stat(self, other: "IndexEntry") -> bool:
+        return self.mtime == other.mtime and self.size == other.size
+
+
+@dataclass
+class _Snapshot:
+    files: dict[str, IndexEntry] = field(default_factory=dict)
+    dirs: set[str] = field(default_factory=set)
+    generation: int = 0
+    stale: bool = True
+
+
+class ContentIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: OrderedDict[IndexScope, _Snapshot] = OrderedDict()
+        self._generation = 0
+        self._watched_roots: tuple[Path, ...] = ()
+
+    # -- watcher hooks -------------------------------------------------------
+
+    def attach(self, roots) -> None:
+        """A watcher (re)started over `roots`. Every snapshot rescans once on its
+        next read, since changes between two watch sets were never observed."""
+        with self._lock:
+            self._watched_roots = tuple(Path(root).resolve() for root in roots)
+            for snapshot in self._snapshots.values():
+                snapshot.stale = True
+
+    def detach(self) -> None:
+        with self._lock:
+            self._watched_roots = ()
+            for snapshot in self._snapshots.values():
+                snapshot.stale = True
+
+    @property
+    def watching(self) -> bool:
+        return bool(self._watched_roots)
+
+    def apply_changes(self, changes) -> bool:
+        """Fold one watchfiles batch of `(change, path)` pairs into every live
+        snapshot. Returns True when any snapshot moved to a new generation."""
+        paths = [(int(change), Path(raw)) for change, raw in changes]
+        moved = False
+        with self._lock:
+            for scope, snapshot in self._snapshots.items():
+                if snapshot.stale:
+                    continue
+                if any(self._apply_change(scope, snapshot, change, path) for change, path in paths):
+                    self._generation += 1
+                    snapshot.generation = self._generation
+                    moved = True
+        return moved
+
+    def covers(self, scope: IndexScope) -> bool:
+        """True while `scope`'s snapshot is kept current by watcher batches, so
+        reading it costs no filesystem access."""
+        with self._lock:
+            snapshot = self._snapshots.get(scope)
+            return snapshot is not None and self._is_live(scope, snapshot)
+
+    # -- reads ---------------------------------------------------------------
+
+    def generation(self, scope: IndexScope) -> int:
+        """Counter that changes iff something visible in `scope` changed."""
+        with self._lock:
+            return self._snapshot(scope).generation
+
+    def entries(self, scope: IndexScope) -> list[IndexEntry]:
+        with self._lock:
+            return list(self._snapshot(scope).files.values())
+
+    def directories(self, scope: IndexScope) -> list[str]:
+        with self._lock:
+            return list(self._snapshot(scope).dirs)
+
+    def title_for(self, scope: IndexScope, path: Path, abbreviations=None) -> str:
+        """Document title for `path`, resolved once per (mtime, size, abbreviations)
+        and kept across restarts by the tree index."""
+        key = tuple(abbreviations) if isinstance(abbreviations, (list, tuple)) else abbreviations
+        with self._lock:
+            snapshot = self._snapshots.get(scope)
+            entry = snapshot.files.get(str(path)) if snapshot is not None and self._is_live(scope, snapshot) else None
+            if entry is not None and entry.title is not None and entry.title_key == key:
+                return entry.title
+        title = _stored_title(path, entry, abbreviations)
+        if entry is not None:
+            with self._lock:
+                entry.title, entry.title_key = title, key
+        return title
+
+    # -- internals -----------------------------------------------------------
+
+    def _is_live(self, scope: IndexScope, snapshot: _Snapshot) -> bool:
+        if snapshot.stale or not self._watched_roots:
+            return False
+        return all(any(root == watched or watched in root.parents for watched in self._watched_roots) for _, root in scope.mounts)
+
+    def _snapshot(self, scope: IndexScope) -> _Snapshot:
+        snapshot = self._snapshots.get(scope)
+        if snapshot is not None and self._is_live(scope, snapshot):
+            self._snapshots.move_to_end(scope)
+            return snapshot
+        fresh = self._scan(scope)
+        if snapshot is not None and snapshot.files.keys() == fresh.files.keys() and snapshot.dirs == fresh.dirs and all(
+            entry.same_stat(fresh.files[key]) for key, entry in snapshot.files.items()
+        ):
+            snapshot.stale = False
+            self._snapshots.move_to_end(scope)
+            return snapshot
+        if snapshot is not None:
+            for key, entry in fresh.files.items():
+                old = snapshot.files.get(key)
+                if old is not None and old.same_stat(entry):
+                    entry.title, entry.title_key = old.title, old.title_key
+        self._generation += 1
+        fresh.generation = self._generation
+        fresh.stale = False
+        self._snapshots[scope] = fresh
+        self._snapshots.move_to_end(scope)
+        while len(self._snapshots) > _MAX_SCOPES:
+            self._snapshots.popitem(last=False)
+        return fresh
+
+    def _scan(self, scope: IndexScope) -> _Snapshot:
+        snapshot = _Snapshot()
+        for _, root in scope.mounts:
+            self._scan_into(scope, snapshot, root)
+        return snapshot
+
+    def _scan_into(self, scope: IndexScope, snapshot: _Snapshot, top: Path) -> None:
+        for current, dirs, files in os.walk(top):
+            dirs[:] = [
+                name for name in dirs
+                if not should_exclude_dir(name, scope.excluded_dirs) and (scope.show_hidden or not name.startswith("."))
+            ]
+            snapshot.dirs.add(current)
+            for name in files:
+                if scope.tracks_file(name):
+                    self._stat_into(snapshot, Path(current) / name)
+
+    @staticmethod
+    def _stat_into(snapshot: _Snapshot, path: Path) -> bool:
+        try:
+            stat = path.stat()
+        except OSError:
+            return snapshot.files.pop(str(path), None) is not None
+        entry = IndexEntry(path, stat.st_mtime, stat.st_size)
+        old = snapshot.files.get(str(path))
+        if old is not None and old.same_stat(entry):
+            return False
+        snapshot.files[str(path)] = entry
+        return True
+
+    def _apply_change(self, scope: IndexScope, snapshot: _Snapshot, change: int, path: Path) -> bool:
+        root = scope.root_for(path)
+        if root is None or (path != root and not scope.is_visible_dir(root, path.parent)):
+            return False
+        key = str(path)
+        if change == _CHANGE_DELETED or not path.exists():
+            prefix = key + os.sep
+            gone = [name for name in snapshot.files if name == key or name.startswith(prefix)]
+            gone_dirs = [name for name in snapshot.dirs if name == key or name.startswith(prefix)]
+            for name in gone:
+                del snapshot.files[name]
+            snapshot.dirs.difference_update(gone_dirs)
+            return bool(gone or gone_dirs)
+        if path.is_dir():
+            if key in snapshot.dirs or not scope.is_visible_dir(root, path):
+                return False
+            # A moved-in folder arrives as one event; index its whole subtree.
+            self._scan_into(scope, snapshot, path)
+            return True
+        return scope.tracks_file(path.name) and self._stat_into(snapshot, path)
+
+
+def _stored_title(path: Path, entry: IndexEntry | None, abbreviations) -> str:
+    from .helpers import document_title_for_path
+    from .tree_index import tree_index
+
+    if entry is not None:
+        mtime, size = entry.mtime, entry.size
+    else:
+        try:
+            stat = path.stat()
+        except OSError:
+            return document_title_for_path(path, abbreviations=abbreviations)
+        mtime, size = stat.st_mtime, stat.st_size
+    store = tree_index()
+    title = store.title(path, mtime, size, abbreviations)
+    if title is None:
+        title = document_title_for_path(path, abbreviations=abbreviations)
+        store.store_title(path, mtime, size, abbreviations, title)
+    return title
+
+
+_content_index: ContentIndex | None = None
+
+
+def content_index() -> ContentIndex:
+    global _content_index
+    if _content_index is None:
+        _content_index = ContentIndex()
+    return _content_index
@@ -23,7 +23,7 @@ from .extensions import get_extension_runtime, refresh_extension_runtime
 from .helpers import content_location, content_path_for_slug, content_root_and_relative, content_slug_for_path, content_url_for_slug, expand_markdown_includes_for_reading, get_adjacent_posts, strip_more_marker
 from .runtime_context import traced
 from .extensions_builtin.markdown.renderer import _render_markdown_fragment
-from .extensions_builtin.slides.deck import ZenSlideDeck, build_slide_reveal_units, count_slide_progress_segments, resolve_slide_reveal_config, slide_slug
+from .extensions_builtin.slides.deck import build_slide_reveal_units, resolve_slide_reveal_config, slide_slug, zen_slide_deck
 
 FALLBACK_HOME_SLUG = "__home__"
 
@@ -394,7 +394,7 @@ def render_slide_deck(path, htmx, request, *, get_root_folder, not_found, get_ro
         render_content = _fallback_home_markdown(get_root_folder().name.upper())
         reveal_config = resolve_slide_reveal_config({})
         slide_width = None
-        deck = ZenSlideDeck(render_content)
+        deck = zen_slide_deck(render_content)
         overview = deck.outline(doc_path)
         total = len(deck.slides) + 2
         slide_num = max(1, min(slide_num, total))
@@ -423,7 +423,7 @@ def render_slide_deck(path, htmx, request, *, get_root_folder, not_found, get_ro
             slide_absolute_path = str(file_path.resolve())
         reveal_config = resolve_slide_reveal_config(metadata)
         slide_width = _resolve_slide_width(metadata)
-        deck = ZenSlideDeck(render_content or "")
+        deck = zen_slide_deck(render_content or "")
         overview = deck.outline(doc_path)
         total = len(deck.slides) + 2
         slide_num = max(1, min(slide_num, total))
@@ -516,13 +516,6 @@ def render_slide_deck(path, htmx, request, *, get_root_folder, not_found, get_ro
                     return _render_markdown_fragment(body, current_path=current_path, slide_mode=slide_mode, asset_collector=asset_collector)
             return _render_markdown_fragment(body, current_path=current_path, slide_mode=slide_mode, asset_collector=asset_collector)
 
-        segment_counts = [
-            count_slide_progress_segments(
-                deck.body(index), render_fragment=render_slide_fragment,
-                current_path=doc_path, config=reveal_config,
-            )
-            for index in range(1, len(deck.slides) + 1)
-        ]
         reveal_units = build_slide_reveal_units(
             slide_markdown,
             render_fragment=render_slide_fragment,
@@ -530,8 +523,9 @@ def render_slide_deck(path, htmx, request, *, get_root_folder, not_found, get_ro
             config=reveal_config,
         ) if reveal_config.enabled else []
         if reveal_units:
-            segment_offset = sum(segment_counts[:slide_num - 2])
-            segment_total = sum(segment_counts)
+            progress = deck.progress(render_fragment=render_slide_fragment, current_path=doc_path, config=reveal_config)
+            segment_offset = progress.offsets[slide_num - 2]
+            segment_total = progress.total
             deck_progress = segment_offset / segment_total * 100 if segment_total else 100
             slide_body = Div(
                 *bundle_asset_nodes_for_collector(asset_collector, runtime=runtime),
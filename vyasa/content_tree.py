@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Literal, Protocol, cast
@@ -9,19 +8,18 @@ from .helpers import (
     _effective_abbreviations,
     _effective_ignore_list,
     _effective_include_list,
+    _resolution_key,
     _should_include_folder,
     content_slug_for_path,
     content_url_for_slug,
     document_kind_for_suffix,
     document_kind_for_path,
-    document_title_for_path,
     enabled_document_suffixes,
     find_folder_note_file,
     get_content_mounts,
     get_ref_content_mounts,
     get_post_title,
     get_vyasa_config,
-    iter_visible_files,
     order_vyasa_entries,
     should_exclude_dir,
     slug_to_title,
@@ -87,6 +85,8 @@ class ContentTree:
         self.visibility = visibility or AllowAllVisibility()
         self.mounts = mounts
         self.ignore_primary_root = ignore_primary_root
+        self._scope = None
+        self._listing_key = None
 
     @classmethod
     def from_runtime(
@@ -114,6 +114,17 @@ class ContentTree:
             return []
         return [entry for entry in self._entries_for_folder(folder, roles=roles) if entry.visible]
 
+    def list_paths_for_path(self, folder: Path) -> list[Path]:
+        """Ordered child paths of `folder`, without building entries (titles,
+        folder notes, visibility) for callers that only need the paths."""
+        folder = Path(folder).resolve()
+        if not folder.exists() or not folder.is_dir():
+            return []
+        try:
+            return self._ordered_paths(folder)
+        except (OSError, PermissionError):
+            return []
+
     def list_entries_for_path(self, folder: Path, roles: list[str] | None = None) -> list[ContentEntry]:
         folder = Path(folder).resolve()
         if not folder.exists() or not folder.is_dir():
@@ -121,28 +132,42 @@ class ContentTree:
         return [entry for entry in self._entries_for_folder(folder, roles=roles) if entry.visible]
 
     def resolve_document(self, slug: str | Path) -> ResolvedDocument | None:
+        """The document a slug names, memoized (misses too) while the content
+        watcher covers it; see `vyasa.resolution_cache`."""
+        from .resolution_cache import resolution_cache
+
         clean_slug = str(slug).strip("/")
+        key = (*_resolution_key("document", clean_slug, ""), self.root, tuple(self._mounts()), tuple(self.allowed_suffixes))
+        return resolution_cache().get(key, lambda: self._resolve_document(clean_slug))
+
+    def _resolve_document(self, clean_slug: str) -> tuple[ResolvedDocument | None, list[Path]]:
+        probes: list[Path] = []
         for suffix in self.allowed_suffixes:
             path = (
                 self._path_for_slug(clean_slug)
                 if Path(clean_slug).suffix.lower() == suffix
                 else self._path_for_slug(clean_slug, suffix)
             )
-            if path and path.exists() and self._is_document_path(path):
+            if path is None:
+                continue
+            probes += [path, path / "kg.schema"] if suffix == ".kg" else [path]
+            if path.exists() and self._is_document_path(path):
                 kind = document_kind_for_path(path)
                 if not kind:
                     continue
                 doc_slug = self._slug_for_path(path)
-                return ResolvedDocument(doc_slug or clean_slug, path, cast(ContentKind, kind), content_url_for_slug(doc_slug or clean_slug, prefix="/posts"))
+                return ResolvedDocument(doc_slug or clean_slug, path, cast(ContentKind, kind), content_url_for_slug(doc_slug or clean_slug, prefix="/posts")), probes
         folder_path = self._path_for_slug(clean_slug)
+        if folder_path:
+            probes += [folder_path, folder_path / "index.md"]
         if folder_path and folder_path.exists() and folder_path.is_dir():
             note = self.find_folder_note(clean_slug)
             if note:
                 note_slug = self._slug_for_path(note)
                 if note_slug:
-                    return ResolvedDocument(note_slug, note, cast(ContentKind, document_kind_for_path(note) or "markdown"), content_url_for_slug(note_slug), folder_note=note)
-            return ResolvedDocument(clean_slug, folder_path, "folder", content_url_for_slug(clean_slug))
-        return None
+                    return ResolvedDocument(note_slug, note, cast(ContentKind, document_kind_for_path(note) or "markdown"), content_url_for_slug(note_slug), folder_note=note), probes
+            return ResolvedDocument(clean_slug, folder_path, "folder", content_url_for_slug(clean_slug)), probes
+        return None, probes
 
     def find_folder_note(self, folder_slug: str | Path = "") -> Path | None:
         folder = self._folder_for_slug(folder_slug)
@@ -165,29 +190,41 @@ class ContentTree:
         next_entry = entries[idx + 1] if idx < len(entries) - 1 else None
         return prev_entry, next_entry
 
-    def fingerprint(self) -> tuple[float, float, int]:
-        mtimes: list[float] = []
-        dir_mtimes: list[float] = []
-        entry_count = 0
-        for _, root in self._mounts():
-            root = Path(root)
-            for current, dirs, _files in os.walk(root):
-                current_path = Path(current)
-                dirs[:] = [
-                    name for name in dirs
-                    if not should_exclude_dir(name, self.excluded_dirs)
-                    and (self.show_hidden or not name.startswith("."))
-                ]
-                try:
-                    dir_mtimes.append(current_path.stat().st_mtime)
-                    entry_count += len(dirs)
-                except OSError:
-                    continue
-            for suffix in (*self.allowed_suffixes, ".vyasa"):
-                files = list(iter_visible_files(root, (suffix,), True))
-                entry_count += len(files)
-                mtimes.extend(p.stat().st_mtime for p in files)
-        return (max(mtimes, default=0), max(dir_mtimes, default=0), entry_count)
+    def fingerprint(self) -> int:
+        """Cache key for everything visible in this tree: the content index
+        generation, an O(1) read while the file watcher covers the mounts."""
+        from .content_index import content_index
+
+        return content_index().generation(self._index_scope())
+
+    def title_for(self, path: Path) -> str:
+        """Display title for a document, resolved once per (mtime, size) by the content index."""
+        from .content_index import content_index
+
+        abbreviations = _effective_abbreviations(self.root, path.parent)
+        return content_index().title_for(self._index_scope(), path, abbreviations=abbreviations)
+
+    def indexed_paths(self) -> list[Path]:
+        """Every indexed file (documents and `.vyasa`) and `.kg` pack under the mounts,
+        without walking the tree while the watcher keeps the index current."""
+        from .content_index import content_index
+
+        scope = self._index_scope()
+        files = [entry.path for entry in content_index().entries(scope)]
+        packs = [Path(folder) for folder in content_index().directories(scope) if folder.lower().endswith(".kg")]
+        return files + [pack for pack in packs if (pack / "kg.schema").is_file()]
+
+    def _index_scope(self):
+        from .content_index import IndexScope
+
+        if self._scope is None:
+            self._scope = IndexScope(
+                mounts=tuple((alias, Path(root).resolve()) for alias, root in self._mounts()),
+                show_hidden=self.show_hidden,
+                excluded_dirs=frozenset(self.excluded_dirs),
+                suffixes=tuple(self.allowed_suffixes),
+            )
+        return self._scope
 
     def _folder_for_slug(self, slug: str | Path) -> Path | None:
         clean_slug = str(slug).strip("/")
@@ -207,8 +244,26 @@ class ContentTree:
         return [self._entry_for_path(path, roles=roles) for path in paths]
 
     def _ordered_paths(self, folder: Path) -> list[Path]:
+        from .tree_index import folder_stamp, tree_index
+
+        index = tree_index()
+        stamp = folder_stamp(folder, self.root)
+        cached = index.listing(self._listing_scope(), folder, stamp)
+        if cached is not None:
+            return cached
+        entries, packs = self._scan_folder(folder)
+        config = get_vyasa_config(folder)
+        ordered = order_vyasa_entries(entries, config)
+        if not str(config.get("sort")).startswith(("mtime", "created")):
+            index.store_listing(self._listing_scope(), folder, stamp, ordered, packs)
+        return ordered
+
+    def _scan_folder(self, folder: Path) -> tuple[list[Path], list[Path]]:
+        """Unordered visible children of `folder`, and every `.kg` child directory
+        (valid pack or not) whose contents decide how it is listed."""
         ignore_primary = folder.resolve() == self.root and self.ignore_primary_root
         entries: list[Path] = []
+        packs: list[Path] = []
         index_file = self._root_index_file(folder) if folder.resolve() == self.root and not ignore_primary else None
         folder_note = find_folder_note_file(folder)
         ignore_list = _effective_ignore_list(self.root, folder)
@@ -220,6 +275,8 @@ class ContentTree:
                 continue
             if item.is_dir() and (should_exclude_dir(item.name, self.excluded_dirs) or (not self.show_hidden and item.name.startswith("."))):
                 continue
+            if item.suffix.lower() == ".kg" and item.is_dir():
+                packs.append(item)
             if self._is_document_path(item):
                 entries.append(item)
             elif item.is_dir():
@@ -231,7 +288,16 @@ class ContentTree:
                 entries.append(item)
         if folder.resolve() == self.root:
             self._append_mount_entries(entries)
-        return order_vyasa_entries(entries, get_vyasa_config(folder))
+        return entries, packs
+
+    def _listing_scope(self) -> str:
+        from .tree_index import listing_scope
+
+        if self._listing_key is None:
+            self._listing_key = listing_scope(
+                self.root, self._mounts(), self.show_hidden, self.excluded_dirs, self.allowed_suffixes, self.ignore_primary_root
+            )
+        return self._listing_key
 
     def _entry_for_path(self, path: Path, roles: list[str] | None = None) -> ContentEntry:
         if path.is_dir() and not self._is_document_path(path):
@@ -257,7 +323,7 @@ class ContentTree:
         return path.is_file()
 
     def _title_for_file(self, path: Path, kind: ContentKind) -> str:
-        return document_title_for_path(path, abbreviations=_effective_abbreviations(self.root, path.parent))
+        return self.title_for(path)
 
     def _append_mount_entries(self, entries: list[Path]) -> None:
         reserved = {item.name for item in entries} | {item.stem for item in entries if item.is_file()}
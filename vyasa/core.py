@@ -13,7 +13,7 @@ from pathlib import Path
 from fasthtml.common import *
 from fasthtml.jupyter import *
 from monsterui.all import *
-from .config import get_config
+from .config import config_generation, get_config
 from .helpers import (
     slug_to_title,
     _strip_inline_markdown,
@@ -24,6 +24,7 @@ from .helpers import (
     _effective_abbreviations,
     get_vyasa_config,
     find_folder_note_file,
+    content_file_for_slug,
     content_path_for_slug,
     content_slug_for_path,
     content_url_for_slug,
@@ -45,7 +46,7 @@ from .layout_page import render_page_frame
 from .page_frame import PageFrame, PageFrameDeps
 from .nav_views import TREE_ACTION_BUTTON_CLASSES, TREE_ACTION_ROW_BASE_CLASSES, navbar_view
 from loguru import logger
-from .assets import asset_url, bundle_asset_nodes, requested_page_bundles, route_bundle_names
+from .assets import asset_manifest, asset_url, bundle_asset_nodes, requested_page_bundles, route_bundle_names
 from .admin_views import rbac_admin_content
 from .auth.context import get_auth_from_request, get_roles_from_auth, get_roles_from_request
 from .auth.admin_helpers import apply_impersonation_action, parse_rbac_form
@@ -59,16 +60,22 @@ from .auth.flow_helpers import (
 from .auth.runtime import make_user_auth_before
 from .auth.views import impersonate_content, login_content
 from .auth.http import handle_admin_impersonate, handle_admin_rbac, handle_login
-from .auth.policy import is_allowed, resolve_roles
+from .auth.policy import RbacRules, is_allowed, resolve_roles
 from .bootstrap import build_app, build_beforeware, mount_package_static
 from .content_routes import (
     find_index_file as find_index_file_helper,
     render_index,
     render_post_detail,
 )
+from .content_index import content_index
 from .content_tree import ContentTree
 from .extensions import get_extension_runtime, refresh_extension_runtime, set_runtime_context
 from .auth.oauth_bootstrap import build_google_oauth
+from .http_cache import ResponseCacheMiddleware
+from .live import path_watch_hub
+from .resolution_cache import resolution_cache
+from .worker_sync import WATCHER_LOCK, worker_sync
+from .worktree_status import worktree_statuses
 from .page_views import not_found_content
 from .rbac_config import normalize_rbac_cfg, render_rbac_toml, write_rbac_to_vyasa
 from .rbac_store import load_rbac_cfg, write_rbac_cfg
@@ -86,11 +93,15 @@ from .sidebar_helpers import (
     get_custom_css_links as get_sidebar_custom_css_links,
     sidebar_section,
 )
+from .extensions_builtin.markdown.render_cache import record_render_dependency
 from .extensions_builtin.markdown.renderer import from_md
+from .tree_index import folder_stamp
 from .tree_service import get_tree_entries
 from .tree_rendering import (
+    build_post_tree_level_render,
     build_post_tree_render,
     folder_has_visible_descendant as tree_folder_has_visible_descendant,
+    visible_folder_paths,
 )
 from .favicon import favicon_href, favicon_svg
 from .file_search import search_file_records
@@ -212,6 +223,21 @@ def _sort_blog_home_entries(entries, root):
 
     return sort_entries(entries, root, get_sort=get_config().get_home_sort, created_ts=get_file_created_ts)
 
+def _blog_home_entries(roots, roles):
+    from .extensions_builtin.blog_home import home_entries
+
+    return home_entries(
+        roots,
+        roles,
+        is_allowed_fn=is_allowed,
+        rbac_rules=_rbac_rules,
+        iter_files=iter_visible_files,
+        slug_for_path=content_slug_for_path,
+        show_hidden=get_config().get_show_hidden(),
+        get_sort=get_config().get_home_sort,
+        created_ts=get_file_created_ts,
+    )
+
 def _blog_home_is_ignored(path, root):
     from .extensions_builtin.blog_home import is_ignored
 
@@ -324,7 +350,7 @@ _google_oauth_cfg = _config.get_google_oauth()
 _auth_required = _config.get_auth_required()
 
 
-_rbac_store_cache = {"db": None, "tbl": None}
+_rbac_store_cache = {"db": None}
 def _normalize_rbac_cfg(cfg):
     return normalize_rbac_cfg(cfg, _config._coerce_list)
 
@@ -358,7 +384,7 @@ def _set_rbac_cfg(cfg):
     if _rbac_cfg.get("enabled") and not _auth_enabled:
         logger.warning("RBAC configured without any auth provider; RBAC disabled.")
         _rbac_cfg["enabled"] = False
-    _rbac_rules = []
+    rules = []
     if _rbac_cfg.get("enabled"):
         for rule in _rbac_cfg.get("rules", []):
             pattern = rule.get("pattern")
@@ -373,7 +399,8 @@ def _set_rbac_cfg(cfg):
             roles_list = _config._coerce_list(roles)
             if not roles_list:
                 continue
-            _rbac_rules.append((compiled, set(roles_list)))
+            rules.append((compiled, set(roles_list)))
+    _rbac_rules = RbacRules(rules)
 
 
 def _render_rbac_toml(cfg):
@@ -414,6 +441,7 @@ def _favicon_icon_path():
 async def favicon_icon():
     path = _favicon_icon_path()
     if path and path.exists():
+        record_render_dependency(path)
         return FileResponse(path)
     return Response(status_code=404)
 
@@ -424,14 +452,15 @@ async def favicon_svg_icon():
 
 
 @app.route("/static/extensions/{extension_id}/{asset_path:path}")
-async def extension_static_asset(extension_id: str, asset_path: str):
-    from .assets import extension_asset_path
+async def extension_static_asset(extension_id: str, asset_path: str, request=None):
+    from .assets import extension_asset_path, static_cache_control
 
     start = time.perf_counter()
     path = extension_asset_path(extension_id, asset_path)
     if path.exists() and path.is_file():
+        record_render_dependency(path)
         response = FileResponse(path)
-        response.headers["Cache-Control"] = "no-cache, max-age=0, must-revalidate"
+        response.headers["Cache-Control"] = static_cache_control(path, request.query_params if request else None)
         logger.info(
             "extension static asset extension={} path={} bytes={} elapsed_ms={:.2f}",
             extension_id,
@@ -600,6 +629,26 @@ def _watch_targets():
     return [str(root) for root in _live_reload_roots()], True
 
 
+def _watch_covers(paths, recursive):
+    """Predicate for the directories a `_watch_targets()` watch reports changes in,
+    so `watch_path` subscribers there ride on this watcher instead of their own.
+    Excluded folders are never covered, on recursive platforms either."""
+    watched = frozenset(os.path.abspath(path) for path in paths)
+    if not recursive:
+        return watched.__contains__
+    excludes = set(get_config().get_reload_excludes())
+
+    def covers(directory):
+        for root in watched:
+            if directory == root:
+                return True
+            if directory.startswith(root + os.sep):
+                return not any(part in excludes for part in directory[len(root) + 1:].split(os.sep))
+        return False
+
+    return covers
+
+
 def _reload_event_str(changes):
     """Build the SSE event payload for a change set, or None if nothing relevant."""
     if not any(_is_live_reload_path(Path(path)) for _, path in changes):
@@ -627,6 +676,10 @@ def _changes_add_watchable_dir(changes):
     return False
 
 
+# How soon an idle watch() yields once registered, so the hubs attach promptly.
+_WATCH_REGISTERED_MS = 500
+
+
 class _ReloadHub:
     """One shared file watcher fanning changes out to every SSE subscriber.
 
@@ -644,6 +697,7 @@ class _ReloadHub:
 
     def __init__(self):
         self._subscribers = set()
+        self._holds = 0
         self._thread = None
         self._stop = None
         self._loop = None
@@ -651,16 +705,32 @@ class _ReloadHub:
     def subscribe(self):
         queue = asyncio.Queue()
         self._subscribers.add(queue)
+        self._loop = asyncio.get_running_loop()
+        self._ensure_running()
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+        self._maybe_stop()
+
+    def retain(self):
+        """Keep the watcher running with no SSE subscribers, so the content
+        index stays incrementally updated (see `vyasa.content_index`)."""
+        self._holds += 1
+        self._ensure_running()
+
+    def release(self):
+        self._holds = max(0, self._holds - 1)
+        self._maybe_stop()
+
+    def _ensure_running(self):
         if self._thread is None or not self._thread.is_alive():
-            self._loop = asyncio.get_running_loop()
             self._stop = threading.Event()
             self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
             self._thread.start()
-        return queue
 
-    def unsubscribe(self, queue):
-        self._subscribers.discard(queue)
-        if not self._subscribers and self._stop is not None:
+    def _maybe_stop(self):
+        if not self._subscribers and not self._holds and self._stop is not None:
             self._stop.set()  # watch() exits within its poll interval; thread then ends
             self._thread = None
             self._stop = None
@@ -669,22 +739,77 @@ class _ReloadHub:
         for queue in self._subscribers:
             queue.put_nowait(message)
 
+    def _dispatch(self, changes):
+        """Apply one change batch, whether seen by this watcher or relayed from
+        the worker that holds the watch (see `vyasa.worker_sync`)."""
+        # Index first, so a page refreshed by the broadcast sees the new generation.
+        content_index().apply_changes(changes)
+        resolution_cache().apply_changes(changes)
+        worktree_statuses().apply_changes(changes)
+        asset_manifest().apply_changes(changes)
+        path_watch_hub().apply_changes(changes)
+        message = _reload_event_str(changes)
+        if message is not None and self._loop is not None and self._subscribers:
+            self._loop.call_soon_threadsafe(self._broadcast, message)
+
+    def _attach(self, paths, recursive):
+        content_index().attach(_live_reload_roots())
+        path_watch_hub().attach(_watch_covers(paths, recursive))
+        resolution_cache().attach(_watch_covers(paths, recursive))
+        worktree_statuses().attach()
+
+    def _detach(self):
+        content_index().detach()
+        path_watch_hub().detach()
+        resolution_cache().detach()
+        worktree_statuses().detach()
+
     def _run(self, stop):
         from watchfiles import watch
 
-        while not stop.is_set():
-            try:
-                paths, recursive = _watch_targets()
-                for changes in watch(*paths, debounce=400, recursive=recursive, stop_event=stop):
-                    message = _reload_event_str(changes)
-                    if message is not None and self._loop is not None:
-                        self._loop.call_soon_threadsafe(self._broadcast, message)
-                    if not recursive and _changes_add_watchable_dir(changes):
-                        break  # non-recursive: a new dir isn't watched yet, rebuild the set
-            except OSError as exc:
-                # e.g. still over the inotify limit; back off instead of crash-looping.
-                logger.error("live reload watcher failed: {}", exc)
-                stop.wait(30)
+        sync = worker_sync()
+        try:
+            while not stop.is_set():
+                try:
+                    # Nothing reports changes until this pass attaches, so reads rescan meanwhile.
+                    self._detach()
+                    if sync is not None:
+                        sync.listen()  # before attaching, so batches published during the rescan queue up
+                    paths, recursive = _watch_targets()
+                    if sync is not None and not sync.claim(WATCHER_LOCK):
+                        # Another worker watches; follow its batches until it exits or
+                        # one is missed, then loop round to re-attach (rescanning).
+                        self._attach(paths, recursive)
+                        for changes in sync.follow(stop):
+                            self._dispatch(changes)
+                        continue
+                    if sync is not None:
+                        sync.close()  # leading: nothing to receive
+                    attached = False
+                    # watch() registers its descriptors before its first yield (a batch,
+                    # or an empty set after `rust_timeout`); attaching earlier would let
+                    # a snapshot scanned during registration miss a change for good.
+                    for changes in watch(*paths, debounce=400, recursive=recursive, stop_event=stop, rust_timeout=_WATCH_REGISTERED_MS, yield_on_timeout=True):
+                        if not attached:
+                            self._attach(paths, recursive)
+                            attached = True
+                        if not changes:
+                            continue
+                        if sync is not None:
+                            sync.publish(changes)
+                        self._dispatch(changes)
+                        if not recursive and _changes_add_watchable_dir(changes):
+                            break  # non-recursive: a new dir isn't watched yet, rebuild the set
+                except OSError as exc:
+                    # e.g. still over the inotify limit; back off instead of crash-looping.
+                    self._detach()
+                    logger.error("live reload watcher failed: {}", exc)
+                    stop.wait(30)
+        finally:
+            self._detach()
+            if sync is not None:
+                sync.close()
+                sync.release(WATCHER_LOCK)  # let another worker's hub take over the watch
 
 
 _reload_hub = None
@@ -717,6 +842,20 @@ async def _live_reload_events():
         hub.unsubscribe(queue)
 
 
+def _start_content_watcher():
+    """Keep the shared watcher alive for the content index even when no browser
+    holds a live-reload stream. Without watchfiles (or with content_watch off)
+    the index falls back to a rescan per fingerprint read."""
+    if not get_config().get_content_watch_enabled():
+        return
+    try:
+        import watchfiles  # noqa: F401
+    except ImportError:
+        logger.info("content watcher unavailable (watchfiles not installed); content index will rescan")
+        return
+    _get_reload_hub().retain()
+
+
 @rt("/_vyasa/reload")
 async def live_reload():
     if not get_config().get_browser_reload_enabled():
@@ -724,8 +863,22 @@ async def live_reload():
     return StreamingResponse(_live_reload_events(), media_type="text/event-stream")
 
 
+def _response_cache_probe():
+    """App-wide state every cached page depends on (see `vyasa.http_cache`)."""
+    return (
+        config_generation(),
+        id(get_extension_runtime()),
+        _posts_sidebar_fingerprint(),
+        id(_rbac_cfg),
+        _current_uncommitted_slugs(),
+    )
+
+
 def _initialize_app(app_instance):
     _mount_package_static(app_instance)
+    # Innermost, so responses are keyed on the decoded session and the session
+    # cookie is still refreshed around 304s and cache hits.
+    app_instance.user_middleware.append(Middleware(ResponseCacheMiddleware, probe=_response_cache_probe))
 
 
 _app_initialized = False
@@ -904,26 +1057,28 @@ def _sidebar_section_nodes():
 
 
 @lru_cache(maxsize=2)
-def _uncommitted_slugs(time_bucket):
+def _uncommitted_slugs(paths):
+    """Slugs for a set of uncommitted paths, each with and without its suffix."""
+    slugs = set()
+    for rel in paths:
+        stripped = rel.rsplit(".", 1)[0] if "." in rel.rsplit("/", 1)[-1] else rel
+        slugs.update((rel, stripped))
+    return frozenset(slugs)
+
+
+def _current_uncommitted_slugs():
     """Slugs whose backing file differs from HEAD in the primary working
     clone. Scoped to the primary root only (git status across every mounted
     repo is too slow when several are large, and drafts live in the author's
-    own root). Cached per coarse time bucket so it is computed at most once
-    every few seconds, never per sidebar row."""
+    own root). Maintained incrementally from watcher batches while live
+    reload runs; otherwise rescanned at most every few seconds, never per
+    sidebar row."""
     from .content_backend import classify_root, uncommitted_paths
 
     rc = classify_root(get_root_folder())
     if rc.kind != "clone":
         return frozenset()
-    slugs = set()
-    for rel in uncommitted_paths(rc):
-        stripped = rel.rsplit(".", 1)[0] if "." in rel.rsplit("/", 1)[-1] else rel
-        slugs.update((rel, stripped))
-    return frozenset(slugs)
-
-
-def _current_uncommitted_slugs():
-    return _uncommitted_slugs(int(time.time() // 5))
+    return _uncommitted_slugs(uncommitted_paths(rc, max_age=5.0))
 
 
 def _uncommitted_row_decorator(node, *, slug=None, title="", context="tree"):
@@ -1068,12 +1223,16 @@ def _preload_posts_cache():
         t2 = time.perf_counter()
         _cached_posts_sidebar_html(_posts_sidebar_fingerprint(), (), show_hidden)
         t3 = time.perf_counter()
+        asset_count = asset_manifest().build()
+        t4 = time.perf_counter()
         logger.info(
-            "Startup preload timings stats={:.3f}s tree={:.3f}s sidebar={:.3f}s total={:.3f}s",
+            "Startup preload timings stats={:.3f}s tree={:.3f}s sidebar={:.3f}s assets={}/{:.3f}s total={:.3f}s",
             t1 - t0,
             t2 - t1,
             t3 - t2,
-            t3 - t0,
+            asset_count,
+            t4 - t3,
+            t4 - t0,
         )
         logger.info("Preloaded posts sidebar cache.")
     except Exception as exc:
@@ -1104,6 +1263,10 @@ def _start_git_fetcher():
         # a vyasa-fetch sidecar if you must keep --reload).
         logger.warning("in-process git fetcher disabled under --reload; run with --no-reload or a vyasa-fetch sidecar")
         return
+    sync = worker_sync()
+    if sync is not None and not sync.claim("git-fetcher"):
+        logger.info("in-process git fetcher runs in another worker")
+        return
     interval = get_config().get_git_fetch_interval()
     if interval <= 0:
         logger.info("in-process git fetcher disabled (git_fetch_interval<=0)")
@@ -1136,8 +1299,10 @@ def _start_git_fetcher():
 
 if hasattr(app, "add_event_handler"):
     app.add_event_handler("startup", _start_git_fetcher)
+    app.add_event_handler("startup", _start_content_watcher)
 elif hasattr(app, "on_event"):
     app.on_event("startup")(_start_git_fetcher)
+    app.on_event("startup")(_start_content_watcher)
 
 
 def is_active_toc_item(anchor):
@@ -1284,7 +1449,7 @@ def layout(
     )
 
 
-_nav_entries_cache: dict[tuple[str, bool, tuple[str, str] | None], tuple[float, list[Path]]] = {}
+_nav_entries_cache: dict[tuple[str, bool, tuple[str, str] | None], tuple[tuple[int, int, int], list[Path]]] = {}
 
 
 # The git ref a specific root is currently being viewed on, as (root_id, ref),
@@ -1299,16 +1464,16 @@ def _get_nav_entries(
     active = _active_ref_root.get()
     key = (str(folder.resolve()), show_hidden, active)
     try:
-        mtime = folder.stat().st_mtime
+        stamp = folder_stamp(folder, root)
     except OSError:
         return []
     cached = _nav_entries_cache.get(key)
-    if cached and cached[0] == mtime:
+    if cached and cached[0] == stamp:
         return cached[1]
     ordered = get_tree_entries(folder, root, show_hidden, excluded_dirs, enabled_document_suffixes())
     if folder.resolve() == root.resolve():
         ordered = _swap_ref_roots(ordered, active)
-    _nav_entries_cache[key] = (mtime, ordered)
+    _nav_entries_cache[key] = (stamp, ordered)
     return ordered
 
 
@@ -1370,6 +1535,35 @@ def build_post_tree(folder, roles=None, max_depth=None, active_parts=()):
     )
 
 
+@lru_cache(maxsize=8)
+def _cached_visible_folders(fingerprint, roles_key, rules_id):
+    return visible_folder_paths(
+        ContentTree.from_runtime().indexed_paths(), list(roles_key),
+        slug_for_path=content_slug_for_path, is_allowed_fn=is_allowed, rbac_rules=_rbac_rules,
+    )
+
+
+def post_tree_entry_count(folder):
+    """Entries listed in `folder` before visibility filtering: an upper bound on
+    its tree rows, read from the cached nav listing."""
+    return len(_nav_entries_for(folder, get_root_folder(), get_config().get_show_hidden(), set(get_config().get_reload_excludes())))
+
+
+def build_post_tree_level(folder, roles=None):
+    """JSON rows for one level of the posts tree (see `/api/sidebar/tree`)."""
+    tree = ContentTree.from_runtime()
+    visible = _cached_visible_folders(tree.fingerprint(), tuple(roles or ()), id(_rbac_rules))
+    return build_post_tree_level_render(
+        folder, roles=roles,
+        root=get_root_folder(), show_hidden=get_config().get_show_hidden(),
+        excluded_dirs=set(get_config().get_reload_excludes()), get_nav_entries=_nav_entries_for,
+        effective_abbreviations=_effective_abbreviations, should_exclude_dir_fn=should_exclude_dir,
+        slug_to_title_fn=slug_to_title, find_folder_note_file_fn=find_folder_note_file,
+        is_allowed_fn=is_allowed, rbac_rules=_rbac_rules,
+        title_for_path=tree.title_for, visible_folders=visible,
+    )
+
+
 def _posts_tree_fingerprint():
     try:
         return ContentTree.from_runtime().fingerprint()
@@ -1511,6 +1705,7 @@ set_runtime_services({
     "gather_search_page": gather_search_page,
     "gather_search_content": gather_search_content,
     "content_path_for_slug": lambda *args, **kwargs: content_path_for_slug(*args, **kwargs),
+    "content_file_for_slug": lambda *args, **kwargs: content_file_for_slug(*args, **kwargs),
     "content_slug_for_path": lambda *args, **kwargs: content_slug_for_path(*args, **kwargs),
     "content_url_for_slug": lambda *args, **kwargs: content_url_for_slug(*args, **kwargs),
     "iter_visible_files": lambda *args, **kwargs: iter_visible_files(*args, **kwargs),
@@ -1518,6 +1713,8 @@ set_runtime_services({
     "posts_sidebar_fingerprint": lambda: _posts_sidebar_fingerprint(),
     "cached_build_post_tree": _cached_build_post_tree,
     "build_post_tree": lambda *args, **kwargs: build_post_tree(*args, **kwargs),
+    "build_post_tree_level": build_post_tree_level,
+    "post_tree_entry_count": post_tree_entry_count,
     "sidebar_row_decorators": lambda: _sidebar_row_decorators(),
     "local_auth_enabled": _local_auth_enabled,
     "google_oauth_enabled": _google_oauth_enabled,
@@ -1604,7 +1801,7 @@ def home_feed(offset: int = 0, htmx=None, request: Request | None = None):
     roots = get_content_mounts()
     root = roots[0][1] if roots else get_root_folder()
     roles = get_roles_from_auth(request.scope.get("auth"), _rbac_rules, _rbac_cfg, _google_oauth_cfg, _config._coerce_list) if request else None
-    entries = _sort_blog_home_entries(iter_blog_home_files(roots, roles), root)
+    entries = _blog_home_entries(roots, roles)
     return render_blog_home_feed(entries, root, max(0, offset), wrap=False)
 
 
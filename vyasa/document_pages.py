@@ -52,6 +52,15 @@ ACTION_ICONS = {
 }
 
 
+def updated_label(file_path) -> str | None:
+    """The relative "Updated …" label for `file_path`. It is read from the clock,
+    so cached renders and responses that embed it re-check it as a probe."""
+    from .extensions_builtin.markdown.render_cache import record_render_probe
+
+    record_render_probe(f"updated-label:{file_path}", lambda: format_last_modified_label(file_path))
+    return format_last_modified_label(file_path)
+
+
 def action_icon(name: str):
     return NotStr(ACTION_ICONS[name])
 
@@ -81,7 +90,7 @@ class DocumentPage:
             auth=auth,
             full_width=self.full_width,
             no_scroll=self.no_scroll,
-            current_updated_label=format_last_modified_label(self.file_path) if self.file_path else None,
+            current_updated_label=updated_label(self.file_path) if self.file_path else None,
             extra_head_nodes=self.extra_head_nodes,
         )
 
@@ -121,7 +130,7 @@ def resolve_document_actions(context: DocumentActionContext) -> tuple[tuple[Any,
 
 def meta_line(source_text: str, file_path=None, meta_extra=None):
     items = [Span(f"{estimate_read_time_minutes(source_text)}-min read")]
-    label = format_last_modified_label(file_path) if file_path else None
+    label = updated_label(file_path) if file_path else None
     if label:
         items.extend([Span("•", aria_hidden="true"), Span(label)])
     if meta_extra is not None:
@@ -27,7 +27,7 @@ class AnnotationsExtension(VyasaExtensionBase):
 
 
 def _register_annotations_routes(rt, runtime, *, storage):
-    cache = {"db": None, "tbl": None}
+    cache = {"db": None}
     db_path = storage.file("annotations.db", legacy_name=".vyasa-annotations.db")
 
     def _db_list(path: str):
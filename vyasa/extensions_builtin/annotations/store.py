@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
-from fastsql import Database
+from typing import Literal, overload
+
+from ...sqlite_pool import SQLiteDatabase, sqlite_database
 
 
 @dataclass
@@ -38,56 +40,69 @@ def _annotation_payload(row):
     )
 
 
-def get_annotations_table(db_path: Path, cache, create_if_missing: bool = True):
+_COLUMNS = tuple(field.name for field in fields(AnnotationRow))
+
+
+def _create_annotations_schema(connection) -> None:
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS annotations (id VARCHAR PRIMARY KEY, "
+        + ", ".join(f"{column} VARCHAR" for column in _COLUMNS if column != "id")
+        + ")"
+    )
+    cols = {row[1] for row in connection.execute("PRAGMA table_info(annotations)").fetchall()}
+    if "anchor" not in cols:
+        connection.execute("ALTER TABLE annotations ADD COLUMN anchor TEXT DEFAULT '{}'")
+    if "parent_id" not in cols:
+        connection.execute("ALTER TABLE annotations ADD COLUMN parent_id TEXT DEFAULT ''")
+    connection.execute("CREATE INDEX IF NOT EXISTS annotations_path ON annotations(path)")
+
+
+@overload
+def get_annotations_db(db_path: Path, cache, create_if_missing: Literal[True] = True) -> SQLiteDatabase: ...
+
+
+@overload
+def get_annotations_db(db_path: Path, cache, create_if_missing: bool) -> SQLiteDatabase | None: ...
+
+
+def get_annotations_db(db_path: Path, cache, create_if_missing: bool = True) -> SQLiteDatabase | None:
     if cache["db"] is None:
         if db_path.suffix != ".db":
             db_path = db_path / ".vyasa-annotations.db"
         if not create_if_missing and not db_path.exists():
-            return None, None
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        cache["db"] = Database(f"sqlite:///{db_path}")
-        cache["tbl"] = cache["db"].create(AnnotationRow, pk="id", name="annotations")
-        with cache["db"].engine.begin() as conn:
-            cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(annotations)").fetchall()}
-            if "anchor" not in cols:
-                conn.exec_driver_sql("ALTER TABLE annotations ADD COLUMN anchor TEXT DEFAULT '{}'")
-            if "parent_id" not in cols:
-                conn.exec_driver_sql("ALTER TABLE annotations ADD COLUMN parent_id TEXT DEFAULT ''")
-    return cache["db"], cache["tbl"]
+            return None
+        cache["db"] = sqlite_database(db_path, _create_annotations_schema)
+    return cache["db"]
+
+
+def _rows(db, where: str = "", params=()) -> list[AnnotationRow]:
+    sql = f"SELECT {', '.join(_COLUMNS)} FROM annotations{f' WHERE {where}' if where else ''}"
+    return [AnnotationRow(**dict(row)) for row in db.query(sql, params)]
 
 
 def list_annotations(db_path: Path, cache, path: str) -> list[AnnotationRow]:
-    _, tbl = get_annotations_table(db_path, cache, create_if_missing=False)
-    if tbl is None:
+    db = get_annotations_db(db_path, cache, create_if_missing=False)
+    if db is None:
         return []
     normalized_path = _normalize_annotation_path(path)
-    return sorted(tbl(where="path = :path", path=normalized_path), key=lambda row: (row.created_at, row.id))
+    return sorted(_rows(db, "path = ?", (normalized_path,)), key=lambda row: (row.created_at, row.id))
 
 
 def list_all_annotations(db_path: Path, cache) -> list[AnnotationRow]:
-    _, tbl = get_annotations_table(db_path, cache, create_if_missing=False)
-    if tbl is None:
+    db = get_annotations_db(db_path, cache, create_if_missing=False)
+    if db is None:
         return []
-    return sorted(tbl(), key=lambda row: (row.path, row.created_at, row.id))
+    return sorted(_rows(db), key=lambda row: (row.path, row.created_at, row.id))
 
 
 def upsert_annotation(db_path: Path, cache, row: AnnotationRow) -> None:
-    _, tbl = get_annotations_table(db_path, cache)
-    assert tbl is not None
-    existing = {item.id for item in tbl(where="id = :id", id=row.id)}
+    db = get_annotations_db(db_path, cache)
     payload = _annotation_payload(row)
-    if row.id in existing:
-        tbl.update(**payload)
-    else:
-        tbl.insert(AnnotationRow(**payload))
+    db.write(lambda connection: db.upsert("annotations", payload, conflict=("id",), connection=connection))
 
 
 def delete_annotation(db_path: Path, cache, annotation_id: str) -> bool:
-    _, tbl = get_annotations_table(db_path, cache, create_if_missing=False)
-    if tbl is None:
-        return False
-    existing = list(tbl(where="id = :id", id=annotation_id))
-    if not existing:
+    db = get_annotations_db(db_path, cache, create_if_missing=False)
+    if db is None:
         return False
-    tbl.delete(annotation_id)
-    return True
+    return db.write(lambda connection: connection.execute("DELETE FROM annotations WHERE id = ?", (annotation_id,)).rowcount > 0)
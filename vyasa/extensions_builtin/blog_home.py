@@ -1,6 +1,23 @@
-from fasthtml.common import A, Div, H1, P, Span
+"""Home page card feed.
 
-from ..extensions import AssetBundle, ExtensionMeta, VyasaExtensionBase
+The feed used to walk every mount, evaluate `.vyasa` ignore lists for every
+ancestor of every file, sort by creation time and render a batch of previews
+on each request. `HomeFeedIndex` keeps the sorted, ignore-filtered entry list
+per content-index scope and sort order, rebuilt only when the watcher-fed
+content index reports a change (edits to `.vyasa` files included), so a feed
+page is a role filter plus a slice. Cards are cached as HTML together with the
+files they read and re-rendered only when one of those changes.
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from fasthtml.common import A, Div, H1, NotStr, P, Span, to_xml
+
+from ..config import config_generation
+from ..content_index import IndexScope, content_index
+from ..extensions import AssetBundle, ExtensionMeta, VyasaExtensionBase, bind_asset_collector, current_asset_collector, get_extension_runtime
 from ..helpers import (
     content_slug_for_path,
     content_url_for_slug,
@@ -12,15 +29,33 @@ from ..helpers import (
     preview_markdown,
 )
 from ..runtime_services import get_runtime_services
+from .markdown.render_cache import _Recorder, record_render, record_render_dependency
 from .markdown.renderer import from_md
 
+_MAX_FEEDS = 8
+_MAX_CARDS = 512
+
+
+def _service_entries(services, roots, roles):
+    return home_entries(
+        roots,
+        roles,
+        is_allowed_fn=services.is_allowed,
+        rbac_rules=services.rbac_rules(),
+        iter_files=services.iter_visible_files,
+        slug_for_path=services.content_slug_for_path,
+        show_hidden=services.get_config().get_show_hidden(),
+        get_sort=services.get_config().get_home_sort,
+        created_ts=services.get_file_created_ts,
+    )
+
 
 def _home_provider(htmx, request):
     services = get_runtime_services()
     roots = services.get_content_mounts()
     root = roots[0][1] if roots else services.get_root_folder()
     roles = services.get_roles_from_auth(request.scope.get("auth"), services.rbac_rules(), services.rbac_cfg(), services.google_oauth_cfg(), services.coerce_list)
-    entries = sort_entries(iter_home_files(roots, roles, is_allowed_fn=services.is_allowed, rbac_rules=services.rbac_rules(), iter_files=services.iter_visible_files, slug_for_path=services.content_slug_for_path, show_hidden=services.get_config().get_show_hidden()), root, get_sort=services.get_config().get_home_sort, created_ts=services.get_file_created_ts)
+    entries = _service_entries(services, roots, roles)
     feed = services.render_blog_home_feed(entries, root, 0)
     shell = Div(H1(f"Welcome to {services.get_blog_title()}!", cls="vyasa-page-title text-4xl font-bold"), P("Latest posts", cls="mt-2 text-slate-500"), feed, cls="space-y-6")
     return services.layout(shell, htmx=htmx, title=f"Home - {services.get_blog_title()}", show_sidebar=True, current_path="__home__", auth=request.scope.get("auth"))
@@ -31,7 +66,7 @@ def _feed_provider(offset=0, htmx=None, request=None):
     roots = services.get_content_mounts()
     root = roots[0][1] if roots else services.get_root_folder()
     roles = services.get_roles_from_auth(request.scope.get("auth"), services.rbac_rules(), services.rbac_cfg(), services.google_oauth_cfg(), services.coerce_list) if request else None
-    entries = sort_entries(iter_home_files(roots, roles, is_allowed_fn=services.is_allowed, rbac_rules=services.rbac_rules(), iter_files=services.iter_visible_files, slug_for_path=services.content_slug_for_path, show_hidden=services.get_config().get_show_hidden()), root, get_sort=services.get_config().get_home_sort, created_ts=services.get_file_created_ts)
+    entries = _service_entries(services, roots, roles)
     return services.render_blog_home_feed(entries, root, max(0, offset), wrap=False)
 
 
@@ -60,18 +95,128 @@ def sort_entries(entries, root, *, get_sort, created_ts):
     return sorted(items, key=lambda item: created_ts(item[0]), reverse=True)
 
 
-def is_ignored(path, root):
+def is_ignored(path, root, memo=None):
+    """True if a `.vyasa` `ignore` list in `root` or any ancestor folder names
+    the file or one of its folders. Pass one `memo` dict across calls to read
+    each folder's config once."""
     relative = path.relative_to(root)
-    ignore_names = set()
-    ancestor = root
-    ignore_names.update(str(item).strip() for item in (get_vyasa_config(root).get("ignore") or []) if str(item).strip())
-    for part in relative.parts[:-1]:
-        ancestor = ancestor / part
-        ignore_names.update(str(item).strip() for item in (get_vyasa_config(ancestor).get("ignore") or []) if str(item).strip())
+    ignore_names = _ignore_names(root, relative.parts[:-1], {} if memo is None else memo)
     candidates = set(relative.parts) | set(relative.with_suffix("").parts) | {path.name, path.stem}
     return bool(ignore_names.intersection(candidates))
 
 
+def _ignore_names(root, parts, memo):
+    key = (str(root), parts)
+    names = memo.get(key)
+    if names is None:
+        inherited = _ignore_names(root, parts[:-1], memo) if parts else frozenset()
+        folder = root.joinpath(*parts)
+        own = {str(item).strip() for item in (get_vyasa_config(folder).get("ignore") or []) if str(item).strip()}
+        names = memo[key] = inherited | own
+    return names
+
+
+def home_entries(roots=None, roles=None, *, is_allowed_fn, rbac_rules, iter_files=iter_visible_files, slug_for_path=content_slug_for_path, show_hidden=False, get_sort, created_ts):
+    """Sorted `(path, slug)` feed entries visible to `roles`."""
+    roots = list(roots or get_content_mounts())
+    indexed = None
+    if iter_files is iter_visible_files and all(isinstance(root, Path) for _, root in roots):
+        indexed = home_feed_index().entries(roots, show_hidden=show_hidden, sort=get_sort(), slug_for_path=slug_for_path, created_ts=created_ts)
+    if indexed is None:
+        root = roots[0][1] if roots else None
+        return sort_entries(iter_home_files(roots, roles, is_allowed_fn=is_allowed_fn, rbac_rules=rbac_rules, iter_files=iter_files, slug_for_path=slug_for_path, show_hidden=show_hidden), root, get_sort=get_sort, created_ts=created_ts)
+    if roles is None:
+        return list(indexed)
+    return [(path, slug) for path, slug in indexed if is_allowed_fn(f"/posts/{slug}", roles, rbac_rules)]
+
+
+class HomeFeedIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._feeds: OrderedDict[tuple, tuple[int, tuple[tuple[Path, str], ...]]] = OrderedDict()
+        self._cards: OrderedDict[tuple, tuple[str, tuple[str, ...], _Recorder]] = OrderedDict()
+
+    def entries(self, roots, *, show_hidden, sort, slug_for_path, created_ts):
+        """All unfiltered feed entries in display order, rebuilt only when the
+        content index generation for these roots moves."""
+        from ..config import get_config
+
+        scope = IndexScope(
+            mounts=tuple((alias, root.resolve()) for alias, root in roots),
+            show_hidden=bool(show_hidden),
+            excluded_dirs=frozenset(get_config().get_reload_excludes()),
+            suffixes=(".md",),
+        )
+        key = (scope, sort, config_generation())
+        generation = content_index().generation(scope)
+        with self._lock:
+            cached = self._feeds.get(key)
+            if cached is not None and cached[0] == generation:
+                self._feeds.move_to_end(key)
+                return cached[1]
+        entries = self._build(scope, show_hidden, sort, slug_for_path, created_ts)
+        with self._lock:
+            self._feeds[key] = (generation, entries)
+            self._feeds.move_to_end(key)
+            while len(self._feeds) > _MAX_FEEDS:
+                self._feeds.popitem(last=False)
+        return entries
+
+    @staticmethod
+    def _build(scope, show_hidden, sort, slug_for_path, created_ts):
+        files = sorted(entry.path for entry in content_index().entries(scope) if entry.path.suffix == ".md")
+        memo = {}
+        found = []
+        for _, root in scope.mounts:
+            for path in files:
+                if scope.root_for(path) != root:
+                    continue
+                if (not show_hidden and path.name.startswith(".")) or is_ignored(path, root, memo):
+                    continue
+                if path.parent == root and path.stem.lower() in {"index", "readme"}:
+                    continue
+                slug = slug_for_path(path)
+                if slug:
+                    found.append((path, slug))
+        return tuple(sort_entries(found, None, get_sort=lambda: sort, created_ts=created_ts))
+
+    def card(self, path, slug, root, build):
+        """Card HTML for one entry; rebuilt when the document, anything it
+        includes, or the site config changes."""
+        runtime = get_extension_runtime()
+        key = (str(path), slug, str(root), id(runtime), config_generation())
+        with self._lock:
+            cached = self._cards.get(key)
+        if cached is None or not cached[2].is_current():
+            recording = runtime.new_asset_collector() if runtime else None
+            with record_render() as recorder, bind_asset_collector(recording):
+                record_render_dependency(path)
+                record_render_dependency(Path(root) / ".vyasa")
+                html = to_xml(build())
+            cached = (html, tuple(recording.requested) if recording else (), recorder)
+            if recorder.cacheable:
+                with self._lock:
+                    self._cards[key] = cached
+                    self._cards.move_to_end(key)
+                    while len(self._cards) > _MAX_CARDS:
+                        self._cards.popitem(last=False)
+        collector = current_asset_collector()
+        if collector is not None:
+            for bundle_name in cached[1]:
+                collector.request(bundle_name)
+        return NotStr(cached[0])
+
+
+_home_feed_index = None
+
+
+def home_feed_index() -> HomeFeedIndex:
+    global _home_feed_index
+    if _home_feed_index is None:
+        _home_feed_index = HomeFeedIndex()
+    return _home_feed_index
+
+
 def render_card(path, slug, root, *, resolve_title, abbreviations):
     title, render_content = resolve_title(path, abbreviations=abbreviations(root))
     read_source = expand_markdown_includes_for_reading(render_content, current_path=slug, root_folder=root)
@@ -91,7 +236,10 @@ def render_card(path, slug, root, *, resolve_title, abbreviations):
 
 def render_feed(entries, root, offset=0, batch_size=4, wrap=True):
     services = get_runtime_services()
-    cards = [render_card(path, slug, root, resolve_title=services.resolve_markdown_title, abbreviations=services.effective_abbreviations) for path, slug in entries[offset:offset + batch_size]]
+    cards = [
+        home_feed_index().card(path, slug, root, lambda: render_card(path, slug, root, resolve_title=services.resolve_markdown_title, abbreviations=services.effective_abbreviations))
+        for path, slug in entries[offset:offset + batch_size]
+    ]
     sentinel = Div(id="blog-feed-sentinel", cls="h-8", hx_get=f"/_home/feed?offset={offset + batch_size}", hx_trigger="revealed once", hx_target="this", hx_swap="outerHTML") if offset + batch_size < len(entries) else ""
     if wrap:
         return Div(*cards, sentinel, id="blog-feed", cls="space-y-4")
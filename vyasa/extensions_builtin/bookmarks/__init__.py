@@ -27,7 +27,7 @@ class BookmarksExtension(VyasaExtensionBase):
 def _register_bookmarks_routes(rt, runtime, *, storage):
     from datetime import datetime
 
-    cache = {"db": None, "tbl": None}
+    cache = {"db": None}
     db_path = storage.file("bookmarks.db", legacy_name=".vyasa-bookmarks.db")
 
     def _db_list(owner: str) -> list[BookmarkRow]:
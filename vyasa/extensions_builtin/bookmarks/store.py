@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from pathlib import Path
-from fastsql import Database
+from typing import Literal, overload
+
+from ...sqlite_pool import SQLiteDatabase, sqlite_database
 
 
 @dataclass
@@ -24,43 +26,54 @@ def _normalize_bookmark_path(path):
     return str(path or "").strip("/")
 
 
-def get_bookmarks_table(db_path: Path, cache, create_if_missing: bool = True):
+def _create_bookmarks_schema(connection) -> None:
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS bookmarks (owner VARCHAR, path VARCHAR, created_at VARCHAR, PRIMARY KEY (owner, path))"
+    )
+
+
+@overload
+def get_bookmarks_db(db_path: Path, cache, create_if_missing: Literal[True] = True) -> SQLiteDatabase: ...
+
+
+@overload
+def get_bookmarks_db(db_path: Path, cache, create_if_missing: bool) -> SQLiteDatabase | None: ...
+
+
+def get_bookmarks_db(db_path: Path, cache, create_if_missing: bool = True) -> SQLiteDatabase | None:
     if cache["db"] is None:
         if db_path.suffix != ".db":
             db_path = db_path / ".vyasa-bookmarks.db"
         if not create_if_missing and not db_path.exists():
-            return None, None
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        cache["db"] = Database(f"sqlite:///{db_path}")
-        cache["tbl"] = cache["db"].create(BookmarkRow, pk=("owner", "path"), name="bookmarks")
-    return cache["db"], cache["tbl"]
+            return None
+        cache["db"] = sqlite_database(db_path, _create_bookmarks_schema)
+    return cache["db"]
 
 
 def list_bookmarks(db_path: Path, cache, owner: str) -> list[BookmarkRow]:
-    _, tbl = get_bookmarks_table(db_path, cache, create_if_missing=False)
-    if tbl is None or not owner:
+    db = get_bookmarks_db(db_path, cache, create_if_missing=False)
+    if db is None or not owner:
         return []
+    rows = db.query("SELECT owner, path, created_at FROM bookmarks WHERE owner = ?", (owner,))
     return sorted(
-        tbl(where="owner = :owner", owner=owner),
+        (BookmarkRow(**dict(row)) for row in rows),
         key=lambda row: (row.created_at or "", row.path or ""),
     )
 
 
 def upsert_bookmark(db_path: Path, cache, owner: str, path: str, created_at: str) -> None:
-    _, tbl = get_bookmarks_table(db_path, cache)
-    assert tbl is not None
+    db = get_bookmarks_db(db_path, cache)
     payload = BookmarkRow(owner=owner, path=_normalize_bookmark_path(path), created_at=str(created_at))
-    existing = list(tbl(where="owner = :owner AND path = :path", owner=payload.owner, path=payload.path))
-    tbl.update(**payload.__dict__) if existing else tbl.insert(payload)
+    db.write(lambda connection: db.upsert("bookmarks", payload.__dict__, conflict=("owner", "path"), connection=connection))
 
 
 def delete_bookmark(db_path: Path, cache, owner: str, path: str) -> bool:
-    _, tbl = get_bookmarks_table(db_path, cache, create_if_missing=False)
-    if tbl is None or not owner:
+    db = get_bookmarks_db(db_path, cache, create_if_missing=False)
+    if db is None or not owner:
         return False
     normalized = _normalize_bookmark_path(path)
-    existing = list(tbl(where="owner = :owner AND path = :path", owner=owner, path=normalized))
-    if not existing:
-        return False
-    tbl.delete((owner, normalized))
-    return True
+    return db.write(
+        lambda connection: connection.execute(
+            "DELETE FROM bookmarks WHERE owner = ? AND path = ?", (owner, normalized)
+        ).rowcount > 0
+    )
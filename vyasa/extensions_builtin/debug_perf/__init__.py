@@ -4,6 +4,8 @@ from contextvars import ContextVar
 from dataclasses import dataclass
 
 from ...extensions import ExtensionMeta, VyasaExtensionBase
+from .metrics import SpanMetrics, span_metrics
+from .routes import register_debug_perf_routes
 
 
 @dataclass(frozen=True)
@@ -19,9 +21,12 @@ _EVENTS: ContextVar[list[TraceEvent] | None] = ContextVar("vyasa_debug_perf_even
 class DebugPerfExtension(VyasaExtensionBase):
     def register(self, app) -> None:
         app.trace.handler(_record_span)
+        app.routes.add("/debug/perf", register_debug_perf_routes)
+        app.routes.add("/api/debug/perf", register_debug_perf_routes)
 
 
 def _record_span(*, name: str, duration_ms: float, attrs: dict) -> None:
+    span_metrics().record(name, duration_ms)
     events = _EVENTS.get()
     if events is not None:
         events.append(TraceEvent(name, duration_ms, attrs))
@@ -38,8 +43,15 @@ def finish_trace(token: object) -> list[TraceEvent]:
 
 
 EXTENSION = DebugPerfExtension(
-    ExtensionMeta("debug_perf", "route", ("cap:trace:debug_perf",), scope_disable=True)
+    ExtensionMeta(
+        "debug_perf",
+        "route",
+        ("cap:trace:debug_perf", "cap:route:debug_perf"),
+        route_prefixes=("/debug/perf", "/api/debug/perf"),
+        scope_disable=True,
+        description="Records trace spans and serves rolling p50/p95/p99 latency per span.",
+    )
 )
 META = EXTENSION.meta
 
-__all__ = ["EXTENSION", "META", "TraceEvent", "start_trace", "finish_trace"]
+__all__ = ["EXTENSION", "META", "SpanMetrics", "TraceEvent", "finish_trace", "span_metrics", "start_trace"]
@@ -0,0 +1,77 @@
+"""Rolling per-span latency histograms for `trace_span` / `traced` events.
+
+Trace events used to live only for one request's `start_trace` window and were
+then dropped, so a production regression had to be reproduced by hand. Every
+span the extension sees is also folded in here: the last `window_seconds` of
+samples per span name (capped per span so memory stays bounded), summarized on
+demand as count, total and nearest-rank p50/p95/p99.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+
+_WINDOW_SECONDS = 300.0
+_MAX_SAMPLES = 4096
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class SpanMetrics:
+    def __init__(self, window_seconds: float = _WINDOW_SECONDS, max_samples: int = _MAX_SAMPLES):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples: dict[str, deque[tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.max_samples)
+            samples.append((now, duration_ms))
+
+    def snapshot(self, now: float | None = None) -> list[dict]:
+        """One row per span seen in the window, slowest p95 first."""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.window_seconds
+        rows = []
+        with self._lock:
+            for name in list(self._samples):
+                samples = self._samples[name]
+                while samples and samples[0][0] < cutoff:
+                    samples.popleft()
+                if not samples:
+                    del self._samples[name]
+                    continue
+                rows.append((name, sorted(duration for _, duration in samples)))
+        summary = [
+            {
+                "name": name,
+                "count": len(ordered),
+                "total_ms": round(sum(ordered), 3),
+                "p50_ms": round(_percentile(ordered, 0.50), 3),
+                "p95_ms": round(_percentile(ordered, 0.95), 3),
+                "p99_ms": round(_percentile(ordered, 0.99), 3),
+                "max_ms": round(ordered[-1], 3),
+            }
+            for name, ordered in rows
+        ]
+        return sorted(summary, key=lambda row: (-row["p95_ms"], row["name"]))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+_span_metrics = SpanMetrics()
+
+
+def span_metrics() -> SpanMetrics:
+    return _span_metrics
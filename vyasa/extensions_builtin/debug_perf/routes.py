@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from fasthtml.common import Body, Caption, Head, Html, Meta, Table, Tbody, Td, Th, Thead, Title, Tr, to_xml
+from starlette.responses import HTMLResponse, JSONResponse, Response
+
+from ...api_catalog import publish_api
+from .metrics import span_metrics
+
+_COLUMNS = ("name", "count", "total_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+def _forbidden(request, runtime) -> bool:
+    """With RBAC active, only `full` users see timings (they name internal code paths)."""
+    if runtime is None or request is None or not runtime.current_rbac_rules():
+        return False
+    return "full" not in (runtime.roles_for_request(request) or ())
+
+
+def render_metrics_table(rows: list[dict], window_seconds: float) -> str:
+    table = Table(
+        Caption(f"Trace spans over the last {window_seconds:g}s, slowest p95 first"),
+        Thead(Tr(*(Th(column) for column in _COLUMNS))),
+        Tbody(*(Tr(*(Td(str(row[column])) for column in _COLUMNS)) for row in rows)),
+        cls="vyasa-debug-perf",
+    )
+    return to_xml(Html(Head(Meta(charset="utf-8"), Title("Vyasa trace metrics")), Body(table)))
+
+
+def register_debug_perf_routes(rt, runtime) -> None:
+    @publish_api(
+        rt,
+        namespace="debug_perf",
+        operation_id="debug_perf.metrics.read",
+        path="/api/debug/perf",
+    )
+    def debug_perf_metrics(request=None):
+        """Per-span latency percentiles (p50/p95/p99), count and total over the rolling window."""
+        if _forbidden(request, runtime):
+            return Response("Forbidden", status_code=403)
+        metrics = span_metrics()
+        return JSONResponse(
+            {"window_seconds": metrics.window_seconds, "spans": metrics.snapshot()},
+            headers={"Cache-Control": "no-store"},
+        )
+
+    @rt("/debug/perf")
+    def debug_perf_page(request=None):
+        if _forbidden(request, runtime):
+            return Response("Forbidden", status_code=403)
+        metrics = span_metrics()
+        return HTMLResponse(
+            render_metrics_table(metrics.snapshot(), metrics.window_seconds),
+            headers={"Cache-Control": "no-store"},
+        )
@@ -9,6 +9,8 @@ import sqlite3
 from threading import Lock
 from typing import Iterator
 
+from ...sqlite_pool import sqlite_database
+
 
 @dataclass(frozen=True)
 class FeedbackEvent:
@@ -23,64 +25,25 @@ class FeedbackEvent:
 class FeedbackStore:
     def __init__(self, path: Path):
         self.path = path if path.suffix == ".db" else path / ".vyasa-feedback.db"
-        self._initialized = False
-        self._init_lock = Lock()
+        self._db = sqlite_database(self.path, _create_schema)
 
     @contextmanager
     def _connect(self) -> Iterator[sqlite3.Connection]:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        connection = sqlite3.connect(self.path, timeout=5)
-        try:
-            connection.row_factory = sqlite3.Row
-            if not self._initialized:
-                with self._init_lock:
-                    if not self._initialized:
-                        connection.execute("PRAGMA journal_mode=WAL")
-                        connection.execute(
-                            """CREATE TABLE IF NOT EXISTS feedback_events (
-                                cursor INTEGER PRIMARY KEY AUTOINCREMENT,
-                                id TEXT NOT NULL UNIQUE,
-                                document TEXT NOT NULL,
-                                kind TEXT NOT NULL,
-                                payload TEXT NOT NULL,
-                                created_at TEXT NOT NULL
-                            )"""
-                        )
-                        connection.execute(
-                            """CREATE TABLE IF NOT EXISTS feedback_state (
-                                document TEXT PRIMARY KEY,
-                                ack_cursor INTEGER NOT NULL DEFAULT 0,
-                                delivered_cursor INTEGER NOT NULL DEFAULT 0
-                            )"""
-                        )
-                        columns = {
-                            row[1] for row in connection.execute("PRAGMA table_info(feedback_state)").fetchall()
-                        }
-                        if "delivered_cursor" not in columns:
-                            connection.execute(
-                                "ALTER TABLE feedback_state ADD COLUMN delivered_cursor INTEGER NOT NULL DEFAULT 0"
-                            )
-                        connection.execute(
-                            "CREATE INDEX IF NOT EXISTS feedback_events_document_cursor ON feedback_events(document, cursor)"
-                        )
-                        connection.commit()
-                        self._initialized = True
-            try:
-                yield connection
-                connection.commit()
-            except Exception:
-                connection.rollback()
-                raise
-        finally:
-            connection.close()
+        with self._db.transaction() as connection:
+            yield connection
+
+    def close(self) -> None:
+        self._db.close()
 
     def append(self, *, event_id: str, document: str, kind: str, payload: dict) -> FeedbackEvent:
         created_at = datetime.now(timezone.utc).isoformat()
-        with self._connect() as connection:
-            cursor = connection.execute(
+        values = (event_id, document, kind, json.dumps(payload, separators=(",", ":")), created_at)
+        cursor = self._db.write(
+            lambda connection: connection.execute(
                 "INSERT INTO feedback_events(id, document, kind, payload, created_at) VALUES (?, ?, ?, ?, ?)",
-                (event_id, document, kind, json.dumps(payload, separators=(",", ":")), created_at),
+                values,
             ).lastrowid
+        )
         return FeedbackEvent(int(cursor or 0), event_id, document, kind, payload, created_at)
 
     def after(self, document: str, cursor: int, *, kinds: tuple[str, ...] = ()) -> list[FeedbackEvent]:
@@ -89,76 +52,92 @@ class FeedbackStore:
         if kinds:
             where += f" AND kind IN ({','.join('?' for _ in kinds)})"
             params.extend(kinds)
-        with self._connect() as connection:
-            rows = connection.execute(
-                f"SELECT cursor, id, document, kind, payload, created_at FROM feedback_events WHERE {where} ORDER BY cursor",
-                params,
-            ).fetchall()
+        rows = self._db.query(
+            f"SELECT cursor, id, document, kind, payload, created_at FROM feedback_events WHERE {where} ORDER BY cursor",
+            params,
+        )
         return [_event(row) for row in rows]
 
     def recent(self, document: str, *, limit: int = 100) -> list[FeedbackEvent]:
-        with self._connect() as connection:
-            rows = connection.execute(
-                """SELECT cursor, id, document, kind, payload, created_at
-                   FROM feedback_events WHERE document = ? ORDER BY cursor DESC LIMIT ?""",
-                (document, max(1, min(limit, 500))),
-            ).fetchall()
+        rows = self._db.query(
+            """SELECT cursor, id, document, kind, payload, created_at
+               FROM feedback_events WHERE document = ? ORDER BY cursor DESC LIMIT ?""",
+            (document, max(1, min(limit, 500))),
+        )
         return [_event(row) for row in reversed(rows)]
 
     def acknowledge(self, document: str, cursor: int) -> int:
-        cursor = max(0, cursor)
-        with self._connect() as connection:
+        def _acknowledge(connection: sqlite3.Connection) -> int:
             latest = connection.execute(
                 "SELECT COALESCE(MAX(cursor), 0) AS cursor FROM feedback_events WHERE document = ? AND kind = 'feedback'",
                 (document,),
             ).fetchone()
-            cursor = min(cursor, int(latest["cursor"] if latest else 0))
             connection.execute(
                 """INSERT INTO feedback_state(document, ack_cursor) VALUES (?, ?)
                    ON CONFLICT(document) DO UPDATE SET ack_cursor = MAX(ack_cursor, excluded.ack_cursor)""",
-                (document, cursor),
+                (document, min(max(0, cursor), int(latest["cursor"] if latest else 0))),
             )
             row = connection.execute(
                 "SELECT ack_cursor FROM feedback_state WHERE document = ?", (document,)
             ).fetchone()
-        return int(row["ack_cursor"] if row else 0)
+            return int(row["ack_cursor"] if row else 0)
+
+        return self._db.write(_acknowledge)
 
     def acknowledged_cursor(self, document: str) -> int:
-        with self._connect() as connection:
-            row = connection.execute(
-                "SELECT ack_cursor FROM feedback_state WHERE document = ?", (document,)
-            ).fetchone()
+        row = self._db.query_one("SELECT ack_cursor FROM feedback_state WHERE document = ?", (document,))
         return int(row["ack_cursor"] if row else 0)
 
     def mark_delivered(self, document: str, cursor: int) -> int:
-        cursor = max(0, cursor)
-        with self._connect() as connection:
+        def _mark_delivered(connection: sqlite3.Connection) -> int:
             connection.execute(
                 """INSERT INTO feedback_state(document, ack_cursor, delivered_cursor) VALUES (?, 0, ?)
                    ON CONFLICT(document) DO UPDATE SET delivered_cursor = MAX(delivered_cursor, excluded.delivered_cursor)""",
-                (document, cursor),
+                (document, max(0, cursor)),
             )
             row = connection.execute(
                 "SELECT delivered_cursor FROM feedback_state WHERE document = ?", (document,)
             ).fetchone()
-        return int(row["delivered_cursor"] if row else 0)
+            return int(row["delivered_cursor"] if row else 0)
+
+        return self._db.write(_mark_delivered)
 
     def delivered_cursor(self, document: str) -> int:
-        with self._connect() as connection:
-            row = connection.execute(
-                "SELECT delivered_cursor FROM feedback_state WHERE document = ?", (document,)
-            ).fetchone()
+        row = self._db.query_one("SELECT delivered_cursor FROM feedback_state WHERE document = ?", (document,))
         return int(row["delivered_cursor"] if row else 0)
 
     def latest_feedback_cursor(self, document: str) -> int:
-        with self._connect() as connection:
-            row = connection.execute(
-                "SELECT COALESCE(MAX(cursor), 0) AS cursor FROM feedback_events WHERE document = ? AND kind = 'feedback'",
-                (document,),
-            ).fetchone()
+        row = self._db.query_one(
+            "SELECT COALESCE(MAX(cursor), 0) AS cursor FROM feedback_events WHERE document = ? AND kind = 'feedback'",
+            (document,),
+        )
         return int(row["cursor"] if row else 0)
 
 
+def _create_schema(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """CREATE TABLE IF NOT EXISTS feedback_events (
+            cursor INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            document TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )"""
+    )
+    connection.execute(
+        """CREATE TABLE IF NOT EXISTS feedback_state (
+            document TEXT PRIMARY KEY,
+            ack_cursor INTEGER NOT NULL DEFAULT 0,
+            delivered_cursor INTEGER NOT NULL DEFAULT 0
+        )"""
+    )
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(feedback_state)").fetchall()}
+    if "delivered_cursor" not in columns:
+        connection.execute("ALTER TABLE feedback_state ADD COLUMN delivered_cursor INTEGER NOT NULL DEFAULT 0")
+    connection.execute("CREATE INDEX IF NOT EXISTS feedback_events_document_cursor ON feedback_events(document, cursor)")
+
+
 class PresenceRegistry:
     def __init__(self):
         self._active: dict[str, int] = {}
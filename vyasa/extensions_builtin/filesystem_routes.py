@@ -3,6 +3,7 @@ import shutil
 
 from ..extensions import ExtensionMeta, VyasaExtensionBase
 from ..runtime_services import get_runtime_services
+from .markdown.render_cache import record_render_dependency
 
 
 class FilesystemRoutesExtension(VyasaExtensionBase):
@@ -45,8 +46,9 @@ def _register_filesystem_routes(rt, runtime) -> None:
         if ref is not None:
             return ref
         services = get_runtime_services()
-        file_path = services.content_path_for_slug(path, ".md")
-        if file_path and file_path.exists():
+        file_path = services.content_file_for_slug(path, ".md")
+        if file_path:
+            record_render_dependency(file_path)  # the response cache revalidates on edits
             return FileResponse(file_path, media_type="text/markdown; charset=utf-8")
         return Response(status_code=404)
 
@@ -56,8 +58,9 @@ def _register_filesystem_routes(rt, runtime) -> None:
         if ref is not None:
             return ref
         services = get_runtime_services()
-        file_path = services.content_path_for_slug(path, f".{ext}")
-        if file_path and file_path.exists():
+        file_path = services.content_file_for_slug(path, f".{ext}")
+        if file_path:
+            record_render_dependency(file_path)  # the response cache revalidates on edits
             return FileResponse(file_path)
         return Response(status_code=404)
 
@@ -67,8 +70,9 @@ def _register_filesystem_routes(rt, runtime) -> None:
         if ref is not None:
             return ref
         services = get_runtime_services()
-        file_path = services.content_path_for_slug(path, ".jsx")
-        if file_path and file_path.exists():
+        file_path = services.content_file_for_slug(path, ".jsx")
+        if file_path:
+            record_render_dependency(file_path)  # the response cache revalidates on edits
             return FileResponse(file_path, media_type="text/javascript; charset=utf-8")
         return Response(status_code=404)
 
@@ -79,8 +83,9 @@ def _register_filesystem_routes(rt, runtime) -> None:
         if ref is not None:
             return ref
         services = get_runtime_services()
-        file_path = services.content_path_for_slug(path, ".json")
-        if file_path and file_path.exists():
+        file_path = services.content_file_for_slug(path, ".json")
+        if file_path:
+            record_render_dependency(file_path)  # the response cache revalidates on edits
             return FileResponse(
                 file_path,
                 headers={"Content-Disposition": f'attachment; filename="{file_path.name}"'},
@@ -94,10 +99,10 @@ def _register_filesystem_routes(rt, runtime) -> None:
         if ref is not None:
             return ref
         services = get_runtime_services()
-        file_path = services.content_path_for_slug(path)
-        if not file_path:
+        if not services.content_path_for_slug(path):
             return Response(status_code=403)
-        if file_path.exists() and file_path.is_file():
+        file_path = services.content_file_for_slug(path)
+        if file_path:
             return FileResponse(
                 file_path,
                 headers={"Content-Disposition": f'attachment; filename="{file_path.name}"'},
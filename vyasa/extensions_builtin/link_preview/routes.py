@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import html
 import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
 from urllib.parse import parse_qs, unquote, urlsplit
 
 from starlette.responses import Response
 
+from ...config import config_generation
 from ...helpers import (
     _extract_markdown_section_text,
     _strip_leading_frontmatter_block,
@@ -13,10 +20,12 @@ from ...helpers import (
     content_slug_for_path,
     find_folder_note_file,
 )
+from ..markdown.render_cache import _Recorder, dependency_signature, record_render, record_render_dependency
 from ..markdown.renderer import from_md, infer_code_language, render_code_shell
 
 
 _HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*$", re.MULTILINE)
+_PREVIEW_CACHE_SIZE = 512
 
 
 def _slug_from_post_route(path: str) -> str:
@@ -94,13 +103,21 @@ def _resolve_preview_file(slug: str):
 
 
 def render_link_preview_html(*, href: str, current_path: str | None = None) -> str | None:
-    slug, fragment = _normalize_preview_slug(href, current_path)
-    symbol = str(parse_qs(urlsplit(href or "").query).get("symbol", [""])[0]).strip()
+    file_path = _preview_target(href, current_path)
+    return _render_preview_file(file_path, href=href, current_path=current_path) if file_path else None
+
+
+def _preview_target(href: str, current_path: str | None):
+    slug, _fragment = _normalize_preview_slug(href, current_path)
     if not slug:
         return None
     file_path = _resolve_preview_file(slug)
-    if not file_path or not file_path.exists():
-        return None
+    return file_path if file_path and file_path.exists() else None
+
+
+def _render_preview_file(file_path, *, href: str, current_path: str | None) -> str | None:
+    slug, fragment = _normalize_preview_slug(href, current_path)
+    symbol = str(parse_qs(urlsplit(href or "").query).get("symbol", [""])[0]).strip()
     source = file_path.read_text(encoding="utf-8", errors="replace")
     target_line = _markdown_target_line(source, href) if file_path.suffix.lower() == ".md" else None
     if file_path.suffix.lower() == ".md":
@@ -137,11 +154,116 @@ def render_link_preview_html(*, href: str, current_path: str | None = None) -> s
     )
 
 
+@dataclass(frozen=True)
+class CachedPreview:
+    html: str
+    etag: str
+    last_modified: str
+    recorder: _Recorder
+
+    def headers(self) -> dict[str, str]:
+        return {"ETag": self.etag, "Last-Modified": self.last_modified, "Cache-Control": "private, no-cache"}
+
+    def not_modified(self, request) -> bool:
+        """True when the browser's copy (If-None-Match, else If-Modified-Since) is still this one."""
+        headers = getattr(request, "headers", None) or {}
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+        if_modified_since = headers.get("if-modified-since")
+        if not if_modified_since:
+            return False
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(self.last_modified)
+        except (TypeError, ValueError):
+            return False
+
+
+class LinkPreviewCache:
+    """Bounded LRU of rendered link previews.
+
+    Hovering links fires a preview request each time, and each one re-reads
+    and re-renders the target. Entries are keyed on the resolved target and its
+    change token (mtime and size, or the commit oid for git refs) plus the
+    request's roles and `config_generation`; the render runs under
+    `record_render`, so an edit to anything the preview embeds drops it too.
+    """
+
+    def __init__(self, maxsize: int = _PREVIEW_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, CachedPreview] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, *, href: str, current_path: str | None = None, roles=()) -> CachedPreview | None:
+        file_path = _preview_target(href, current_path)
+        if not file_path:
+            return None
+        signature = dependency_signature(file_path)
+        key = (str(file_path), signature, href, current_path, frozenset(roles or ()), config_generation())
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.recorder.is_current():
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return entry
+        with record_render() as recorder:
+            record_render_dependency(file_path)
+            rendered = _render_preview_file(file_path, href=href, current_path=current_path)
+        if not rendered:
+            return None
+        entry = CachedPreview(
+            rendered,
+            f'"{hashlib.sha256(rendered.encode("utf-8", "surrogatepass")).hexdigest()[:32]}"',
+            formatdate(_modified_time(file_path), usegmt=True),
+            recorder,
+        )
+        if recorder.cacheable:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _modified_time(file_path) -> float:
+    try:
+        return file_path.stat().st_mtime
+    except (AttributeError, OSError):
+        return time.time()
+
+
+_preview_cache = LinkPreviewCache()
+
+
+def link_preview_cache() -> LinkPreviewCache:
+    return _preview_cache
+
+
+def _request_roles(request) -> tuple[str, ...]:
+    try:
+        auth = request.scope.get("auth") if request is not None else None
+    except AttributeError:
+        auth = None
+    return tuple((auth or {}).get("roles") or ())
+
+
 def register_link_preview_routes(rt, runtime) -> None:
     @rt("/preview/link")
     def preview_link(href: str = "", current_path: str = "", request=None):
         resolved_current_path = current_path or _current_path_from_request(request)
-        html = render_link_preview_html(href=href, current_path=resolved_current_path or None)
-        if not html:
+        preview = _preview_cache.get(href=href, current_path=resolved_current_path or None, roles=_request_roles(request))
+        if preview is None:
             return Response("Not Found", status_code=404)
-        return Response(html, media_type="text/html")
+        if preview.not_modified(request):
+            return Response(status_code=304, headers=preview.headers())
+        return Response(preview.html, media_type="text/html", headers=preview.headers())
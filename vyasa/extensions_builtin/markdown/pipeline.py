@@ -3,6 +3,8 @@ import re
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from .render_cache import record_render_dependency
+
 _CALLOUT_ALIASES = {
     "note": "note", "abstract": "abstract", "summary": "abstract", "tldr": "abstract", "info": "info",
     "todo": "todo", "tip": "tip", "hint": "tip", "important": "tip",
@@ -141,6 +143,7 @@ def preprocess_code_includes(content, current_path=None, root_folder=None):
         path_only, _, section = path_text.partition("#")
         file_path = (base_dir / path_only).resolve() if base_dir else Path(path_only).resolve()
         include_id = _placeholder_id(match.group(0))
+        record_render_dependency(file_path)
         include_store[include_id] = {
             "spec": spec,
             "path_text": path_text,
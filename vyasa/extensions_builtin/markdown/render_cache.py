@@ -0,0 +1,239 @@
+"""Bounded, content-addressed cache of rendered markdown.
+
+`from_md` reruns regex preprocessing, mistletoe and every postprocessor on each
+page view even when nothing changed. Entries here are keyed on a hash of the
+source text plus everything else the output depends on (current path, render
+flags, the active extension set, `config_generation`), and remember the files
+and other inputs the render pulled in. A hit is served only after those
+dependencies re-validate, so editing an included file, a KG pack, or a palette
+invalidates every document that embeds it without any explicit fan-out.
+
+Readers that pull in external inputs during a render call
+`record_render_dependency(path)` (files, folders, or git-ref VirtualPaths) or
+`record_render_probe(name, probe)` for state that is not a file. Renders that
+cannot be described that way call `mark_render_uncacheable()`.
+
+`observe_render()` collects the same dependencies for a whole response (see
+`vyasa.http_cache`) without changing how the renders inside it cache: each
+cache that re-validates an entry while an observer is active replays that
+entry's dependencies into it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+_MAX_ENTRIES = 1024
+_MAX_BYTES = 64 * 1024 * 1024
+
+
+def dependencies_current(files, probes) -> bool:
+    """True while every recorded (path, signature) and (probe, value) still holds.
+
+    A current entry is about to be reused, so its dependencies are replayed into
+    any active `observe_render()`."""
+    current = all(dependency_signature(path) == signature for path, signature in files) and all(
+        _probe(probe) == value for probe, value in probes
+    )
+    if current:
+        for observer in _OBSERVERS.get():
+            for path, signature in files:
+                observer.files.setdefault(_dependency_key(path), (path, signature))
+            for probe, value in probes:
+                observer.probes.setdefault(repr(probe), (probe, value))
+    return current
+
+
+@dataclass
+class _Recorder:
+    files: dict[str, tuple[object, object]] = field(default_factory=dict)
+    probes: dict[str, tuple[Callable[[], object], object]] = field(default_factory=dict)
+    cacheable: bool = True
+
+    def is_current(self) -> bool:
+        return self.cacheable and dependencies_current(self.files.values(), self.probes.values())
+
+
+@dataclass(frozen=True)
+class RenderedMarkdown:
+    html: str
+    bundles: tuple[str, ...] = ()
+    files: tuple[tuple[object, object], ...] = ()
+    probes: tuple[tuple[Callable[[], object], object], ...] = ()
+
+    def is_current(self) -> bool:
+        return dependencies_current(self.files, self.probes)
+
+
+_RECORDER: ContextVar[_Recorder | None] = ContextVar("vyasa_render_dependencies", default=None)
+_OBSERVERS: ContextVar[tuple[_Recorder, ...]] = ContextVar("vyasa_render_observers", default=())
+
+
+def dependency_signature(path) -> object:
+    """Change token for a dependency: commit oid for a git-ref VirtualPath,
+    (mtime_ns, size) for a file, a folded stat over a folder's files, None if absent."""
+    oid = getattr(path, "content_oid", None)
+    if oid is not None:
+        return ("oid", oid)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if not os.path.isdir(path):
+        return (stat.st_mtime_ns, stat.st_size)
+    count = newest = total = 0
+    for current, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                child = os.stat(os.path.join(current, name))
+            except OSError:
+                continue
+            count += 1
+            newest = max(newest, child.st_mtime_ns)
+            total += child.st_size
+    return ("dir", count, newest, total)
+
+
+def _probe(probe: Callable[[], object]) -> object:
+    try:
+        return probe()
+    except Exception:
+        return object()  # never equal: a failing probe forces a re-render
+
+
+def rendering_recorded() -> bool:
+    """True inside a render whose output is being cached (so nested renders
+    contribute to the outer entry instead of caching on their own)."""
+    return _RECORDER.get() is not None
+
+
+def _active_recorders() -> tuple[_Recorder, ...]:
+    recorder = _RECORDER.get()
+    observers = _OBSERVERS.get()
+    return observers if recorder is None else (recorder, *observers)
+
+
+def _dependency_key(path) -> str:
+    key = getattr(path, "slug", None) if getattr(path, "content_oid", None) is not None else None
+    return key or str(path)
+
+
+def record_render_dependency(path) -> None:
+    recorders = _active_recorders()
+    if not recorders or path is None:
+        return
+    key = _dependency_key(path)
+    dependency = None
+    for recorder in recorders:
+        if key not in recorder.files:
+            dependency = dependency or (path, dependency_signature(path))
+            recorder.files[key] = dependency
+
+
+def record_render_probe(name: str, probe: Callable[[], object]) -> None:
+    recorded = None
+    for recorder in _active_recorders():
+        if name not in recorder.probes:
+            recorded = recorded or (probe, _probe(probe))
+            recorder.probes[name] = recorded
+
+
+def mark_render_uncacheable() -> None:
+    for recorder in _active_recorders():
+        recorder.cacheable = False
+
+
+@contextmanager
+def record_render():
+    recorder = _Recorder()
+    token = _RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _RECORDER.reset(token)
+
+
+@contextmanager
+def observe_render():
+    """Collect the dependencies of everything rendered in this context, cache hits
+    included, into the yielded recorder."""
+    observer = _Recorder()
+    token = _OBSERVERS.set((*_OBSERVERS.get(), observer))
+    try:
+        yield observer
+    finally:
+        _OBSERVERS.reset(token)
+
+
+def render_cache_key(content: str, *parts: object) -> str:
+    digest = hashlib.sha256(content.encode("utf-8", "surrogatepass"))
+    digest.update(repr(parts).encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = _MAX_ENTRIES, max_bytes: int = _MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, RenderedMarkdown] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> RenderedMarkdown | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_current():
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._drop(key)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, recorder: _Recorder, html: str, bundles=()) -> None:
+        if not recorder.cacheable or len(html) > self.max_bytes:
+            return
+        entry = RenderedMarkdown(
+            html,
+            tuple(bundles),
+            tuple(recorder.files.values()),
+            tuple(recorder.probes.values()),
+        )
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += len(html)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.html)
+
+
+_render_cache = RenderCache()
+
+
+def render_cache() -> RenderCache:
+    return _render_cache
+
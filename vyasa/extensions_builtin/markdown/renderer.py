@@ -16,8 +16,8 @@ from monsterui.all import UkIcon, apply_classes
 
 from ...assets import asset_url, bundle_asset_nodes_for_collector
 from ...extensions import request_asset_bundle
-from ...config import get_config
-from ...extensions import bind_asset_collector, current_asset_collector, get_extension_runtime, refresh_extension_runtime
+from ...config import config_generation, get_config
+from ...extensions import AssetCollector, bind_asset_collector, current_asset_collector, get_extension_runtime, refresh_extension_runtime
 from ...helpers import (
     _plain_text_from_html,
     _strip_leading_frontmatter_block,
@@ -41,6 +41,7 @@ from .pipeline import (
     preprocess_super_sub,
     RenderPipeline,
 )
+from .render_cache import record_render, record_render_dependency, render_cache, render_cache_key, rendering_recorded
 from .tokens import (
     DownloadEmbed,
     FootnoteRef,
@@ -677,6 +678,7 @@ class ContentRenderer(FrankenRenderer):
             if self.current_path:
                 md_slug = self.current_path if str(self.current_path).endswith(".md") else f"{self.current_path}.md"
                 md_path = _current_content_path(md_slug)
+                record_render_dependency(md_path)
                 if md_path and md_path.exists():
                     present_href = present_href_for_anchor(md_path.read_text(encoding="utf-8"), self.current_path, anchor)
                     present_here = f'<a href="{present_href}" class="vyasa-heading-action vyasa-heading-launch no-underline text-slate-400 hover:text-slate-700 dark:hover:text-slate-200" aria-label="Present from here" hx-boost="false">{to_xml(UkIcon("play-circle"))}</a>'
@@ -835,6 +837,59 @@ def from_md(content: str, img_dir: str | None = None, current_path: str | None =
         runtime = refresh_extension_runtime(get_config().get_extensions_config())
     inherited_asset_collector = current_asset_collector()
     asset_collector = asset_collector or inherited_asset_collector or (runtime.new_asset_collector() if runtime else None)
+    render = partial(_render_markdown_html, content, img_dir, current_path, slide_mode, runtime=runtime, apply_class_mods=apply_class_mods)
+    if rendering_recorded():
+        # Nested render (callout body, markdown include, tab): its inputs belong
+        # to the outer entry, which is cached as a whole.
+        rendered_html = render(asset_collector)
+    else:
+        rendered_html = _cached_render(render, content, img_dir, current_path, slide_mode, runtime, asset_collector, apply_class_mods)
+    bundle_nodes = [
+        Link(rel="stylesheet", href=_asset_url(path))
+        for path in ("/static/sidenote.css", "/static/markdown.css")
+    ] if emit_bundle_nodes else []
+    if emit_bundle_nodes and asset_collector:
+        bundle_nodes.extend(bundle_asset_nodes_for_collector(asset_collector, runtime=runtime))
+    return Div(*bundle_nodes, NotStr(rendered_html), cls="w-full")
+
+
+def _cached_render(render, content, img_dir, current_path, slide_mode, runtime, asset_collector, apply_class_mods):
+    from ...content_backend import active_ref_doc_path
+
+    ref_doc = active_ref_doc_path()
+    key = render_cache_key(
+        content,
+        current_path,
+        img_dir,
+        slide_mode,
+        apply_class_mods,
+        getattr(ref_doc, "slug", None),
+        str(get_root_folder()),
+        tuple((alias, str(root)) for alias, root in get_content_mounts()),
+        tuple(runtime.plan.enabled_ids) if runtime else (),
+        id(runtime),
+        config_generation(),
+    )
+    cache = render_cache()
+    cached = cache.get(key)
+    if cached is None:
+        # Render against a private collector so the bundles this document needs
+        # are known even when the caller's collector already requested them.
+        recording = AssetCollector(asset_collector.bundles) if asset_collector else None
+        with record_render() as recorder:
+            record_render_dependency(ref_doc)
+            html_out = render(recording)
+        cache.put(key, recorder, html_out, recording.requested if recording else ())
+        bundles = recording.requested if recording else ()
+    else:
+        html_out, bundles = cached.html, cached.bundles
+    if asset_collector:
+        for bundle_name in bundles:
+            asset_collector.request(bundle_name)
+    return html_out
+
+
+def _render_markdown_html(content, img_dir, current_path, slide_mode, asset_collector, *, runtime, apply_class_mods):
     context = RenderContext(
         current_path=current_path,
         img_dir=img_dir,
@@ -959,11 +1014,4 @@ def from_md(content: str, img_dir: str | None = None, current_path: str | None =
         html_out = _render_todo_html(html_out)
         html_out = _render_double_rules(html_out)
         html_out = _wrap_tables(html_out, get_config().get_table_col_max_width() or "")
-    bundle_nodes = [
-        Link(rel="stylesheet", href=_asset_url(path))
-        for path in ("/static/sidenote.css", "/static/markdown.css")
-    ] if emit_bundle_nodes else []
-    if emit_bundle_nodes and asset_collector:
-        bundle_nodes.extend(bundle_asset_nodes_for_collector(asset_collector, runtime=runtime))
-    rendered_html = apply_classes(html_out, class_map_mods=mods) if apply_class_mods else html_out
-    return Div(*bundle_nodes, NotStr(rendered_html), cls="w-full")
+    return apply_classes(html_out, class_map_mods=mods) if apply_class_mods else html_out
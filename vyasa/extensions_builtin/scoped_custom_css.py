@@ -7,6 +7,7 @@ from fasthtml.common import Style
 from ..extensions import ExtensionMeta, VyasaExtensionBase
 from ..helpers import content_root_and_relative
 from ..sidebar_helpers import _scope_css
+from .markdown.render_cache import record_render_dependency
 
 
 class ScopedCustomCssExtension(VyasaExtensionBase):
@@ -27,6 +28,7 @@ def _scoped_css_nodes(context):
     css_nodes = []
     for filename in ("global.css", "custom.css", "style.css"):
         css_file = root / filename
+        record_render_dependency(css_file)
         if css_file.exists():
             css_nodes.append(Style(css_file.read_text(encoding="utf-8")))
             if filename != "global.css":
@@ -37,11 +39,13 @@ def _scoped_css_nodes(context):
     ancestors = [] if str(post_dir) == "." else [Path(*post_dir.parts[:idx]) for idx in range(1, len(post_dir.parts) + 1)]
     for ancestor in ancestors:
         global_css = root / ancestor / "global.css"
+        record_render_dependency(global_css)
         if global_css.exists():
             css_nodes.append(Style(global_css.read_text(encoding="utf-8")))
     for ancestor in ancestors:
         for filename in ("custom.css", "style.css"):
             css_file = root / ancestor / filename
+            record_render_dependency(css_file)
             if css_file.exists():
                 css_nodes.append(Style(_scope_css(css_file.read_text(encoding="utf-8"), f"#main-content.{section_class}")))
                 break
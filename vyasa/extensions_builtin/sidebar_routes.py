@@ -1,9 +1,12 @@
+import json
 from pathlib import Path
 from urllib.parse import quote
 
-from fasthtml.common import A, Aside, Details, Li, NotStr, Response, Span, Summary, Ul, to_xml
+from fasthtml.common import A, Aside, Details, Div, Li, NotStr, Response, Script, Span, Summary, Ul, to_xml
 from monsterui.all import UkIcon
+from starlette.responses import JSONResponse
 
+from ..api_catalog import publish_api
 from ..extensions import ExtensionMeta, VyasaExtensionBase
 from ..content_tree import ContentTree
 from ..tree_rendering import _folder_summary, _decorate_row
@@ -18,6 +21,7 @@ class SidebarRoutesExtension(VyasaExtensionBase):
         app.routes.add("/_sidebar/posts", _register_sidebar_routes)
         app.routes.add("/_sidebar/posts/branch", _register_sidebar_routes)
         app.routes.add("/_sidebar/posts/git-root", _register_sidebar_routes)
+        app.routes.add("/api/sidebar/tree", _register_sidebar_routes)
 
 
 def _register_sidebar_routes(rt, runtime) -> None:
@@ -47,11 +51,29 @@ def _register_sidebar_routes(rt, runtime) -> None:
             return Response(status_code=404)
         if "@" in str(path).split("/", 1)[0]:
             items = _build_branch_sidebar_items(path, folder, services.sidebar_row_decorators())
+        elif (virtual := _virtual_branch(path, folder, roles, services)) is not None:
+            return to_xml(virtual)
         else:
             items = services.build_post_tree(folder, roles=roles, max_depth=0)
         services.logger.debug("Sidebar branch path={} resolved={} items={}", path, folder, len(items))
         return "".join(to_xml(item) for item in items)
 
+    @publish_api(
+        rt,
+        namespace="sidebar",
+        operation_id="sidebar.tree.level",
+        path="/api/sidebar/tree",
+        query=("path",),
+    )
+    def posts_tree_level(path: str = "", request=None):
+        """One folder level of the posts tree (empty `path` for the root), with RBAC and hidden-file visibility already resolved."""
+        services = get_runtime_services()
+        roles = services.get_roles_from_request(request, services.rbac_rules(), services.rbac_cfg(), services.google_oauth_cfg(), services.coerce_list)
+        folder = services.content_path_for_slug(path) if path else services.get_root_folder()
+        if not isinstance(folder, Path) or not folder.is_dir():
+            return Response(status_code=404)
+        return JSONResponse({"path": path, "entries": services.build_post_tree_level(folder, roles=roles)})
+
     @rt("/_sidebar/posts/git-root")
     def posts_sidebar_git_root(path: str = "", request=None):
         services = get_runtime_services()
@@ -63,6 +85,27 @@ def _register_sidebar_routes(rt, runtime) -> None:
         return to_xml(item) if item else Response(status_code=404)
 
 
+def _virtual_branch(path: str, folder, roles, services):
+    """A folder too large to send as rows: its level as JSON for the client's
+    virtualized list (`static/sidebar_tree.js`), which fetches deeper levels itself."""
+    threshold = services.get_config().get_sidebar_virtual_threshold()
+    if not threshold or services.post_tree_entry_count(folder) <= threshold:
+        return None  # small enough for rows, without building the level first
+    rows = services.build_post_tree_level(folder, roles=roles)
+    if len(rows) <= threshold:
+        return None
+    payload = json.dumps({"path": path, "entries": rows}).replace("</", "<\\/")
+    return Li(
+        Div(
+            Script(payload, type="application/json"),
+            cls="vyasa-virtual-tree",
+            data_virtual_tree="true",
+            data_tree_src="/api/sidebar/tree",
+        ),
+        cls="my-1",
+    )
+
+
 def _build_branch_sidebar_items(path: str, folder, row_decorators=()):
     branch_prefix = str(path).strip("/").split("/", 1)[0]
     snapshot_root = folder if str(path).strip("/") == branch_prefix else None
@@ -129,7 +172,7 @@ EXTENSION = SidebarRoutesExtension(
         "sidebar_routes",
         "route",
         ("cap:route:sidebar_routes",),
-        route_prefixes=("/_sidebar/posts", "/_sidebar/posts/branch", "/_sidebar/posts/git-root"),
+        route_prefixes=("/_sidebar/posts", "/_sidebar/posts/branch", "/_sidebar/posts/git-root", "/api/sidebar/tree"),
         scope_disable=True,
     )
 )
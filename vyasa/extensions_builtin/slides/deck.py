@@ -1,6 +1,11 @@
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from itertools import accumulate
 from ...helpers import _strip_leading_frontmatter_block, content_url_for_slug, resolve_heading_anchor
+from ..markdown.render_cache import record_render
 from ..tooltip_syntax import extract_tooltips, format_tooltip_definitions
 
 
@@ -295,12 +300,51 @@ def count_slide_progress_segments(markdown_text, *, render_fragment, current_pat
     return len(step_units[first_content:])
 
 
+@dataclass(frozen=True)
+class SlideProgress:
+    """Reveal segments per slide, with running offsets so one slide's position
+    in the deck is a lookup rather than a sum over every earlier slide."""
+
+    counts: tuple[int, ...]
+    offsets: tuple[int, ...]
+    total: int
+
+    @classmethod
+    def from_counts(cls, counts):
+        offsets = tuple(accumulate(counts, initial=0))
+        return cls(tuple(counts), offsets[:-1], offsets[-1])
+
+
 class ZenSlideDeck:
     def __init__(self, markdown_text):
         content, tooltips = extract_tooltips(markdown_text)
         self.tooltip_definitions = format_tooltip_definitions(tooltips)
         self.slides = list(iter_zen_slides(content)) or [["# Empty deck"]]
         self.anchors = self._build_anchors()
+        self._progress = {}
+        self._lock = threading.Lock()
+
+    def progress(self, *, render_fragment, current_path, config):
+        """Segment counts for every slide, computed once per (path, reveal config).
+
+        Counting `top-level-blocks` renders each slide, so that result also
+        remembers the files those renders read and recounts when one changes."""
+        key = (current_path, config)
+        with self._lock:
+            cached = self._progress.get(key)
+        if cached is not None and cached[1].is_current():
+            return cached[0]
+        with record_render() as recorder:
+            progress = SlideProgress.from_counts([
+                count_slide_progress_segments(
+                    self.body(index), render_fragment=render_fragment,
+                    current_path=current_path, config=config,
+                )
+                for index in range(1, len(self.slides) + 1)
+            ])
+        with self._lock:
+            self._progress[key] = (progress, recorder)
+        return progress
 
     def clamp(self, index):
         return max(1, min(index, len(self.slides)))
@@ -372,6 +416,29 @@ class ZenSlideDeck:
         return anchors
 
 
+_DECKS = OrderedDict()
+_DECKS_LOCK = threading.Lock()
+_MAX_DECKS = 32
+
+
+def zen_slide_deck(markdown_text):
+    """Shared deck for this exact source, keyed by its content hash, so every
+    slide request of one presentation reuses the split and progress counts."""
+    key = hashlib.sha256(markdown_text.encode("utf-8", "surrogatepass")).hexdigest()
+    with _DECKS_LOCK:
+        deck = _DECKS.get(key)
+        if deck is not None:
+            _DECKS.move_to_end(key)
+            return deck
+    deck = ZenSlideDeck(markdown_text)
+    with _DECKS_LOCK:
+        deck = _DECKS.setdefault(key, deck)
+        _DECKS.move_to_end(key)
+        while len(_DECKS) > _MAX_DECKS:
+            _DECKS.popitem(last=False)
+    return deck
+
+
 def iter_zen_slides(markdown_text):
     blocks = _split_blocks(_strip_leading_frontmatter_block(markdown_text))
     prelude = []
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import hashlib
 import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
-from typing import Iterable, cast
+from typing import Any, Iterable, cast
 
 from starlette.responses import Response
 
+from ...config import config_generation
+from ..markdown.render_cache import record_render
 from .layout import build_collapsed_graph
 from .items_pack import _tmp_view_sidecar_dir
 from .model import parse_tasks_text
@@ -14,6 +19,7 @@ from .query import KnowledgeGraphQuery
 from .render import _attach_rendered_node_attrs, _attach_rendered_slide_attrs
 
 ALNUM = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_COMPILED_CACHE_SIZE = 64
 
 
 def _base62_digest(text: str, length: int = 8) -> str:
@@ -71,6 +77,62 @@ def _compile_schema_payload(schema_path: Path, current_path: str = "", context_i
     return model, build_collapsed_graph(model)
 
 
+class _CompiledCache:
+    """Bounded LRU of compiled schema payloads and query engines.
+
+    Board interactions fire several API calls per second against the same
+    schema. Each value is built under `record_render`, so it remembers every
+    pack file, palette and embedded document it read, and is reused while
+    those still match; an edit to any of them rebuilds just that entry.
+    """
+
+    def __init__(self, maxsize: int = _COMPILED_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[Any, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, build: Callable[[], Any]) -> Any:
+        current = (*key, config_generation())
+        with self._lock:
+            entry = self._entries.get(current)
+        if entry is not None and entry[1].is_current():
+            with self._lock:
+                if current in self._entries:
+                    self._entries.move_to_end(current)
+            return entry[0]
+        with record_render() as recorder:
+            value = build()
+        if recorder.cacheable:
+            # Read after building: the first build may itself load the config.
+            key = (*key, config_generation())
+            with self._lock:
+                self._entries[key] = (value, recorder)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_compiled = _CompiledCache()
+
+
+def _cached_schema_payload(schema_path: Path, current_path: str = "", context_id: str = "") -> tuple[dict, dict]:
+    """`_compile_schema_payload`, shared until the document's sources change.
+    Callers only serialize the result, so one copy serves every request."""
+    return _compiled.get(
+        ("payload", str(schema_path), current_path, context_id),
+        lambda: _compile_schema_payload(schema_path, current_path, context_id),
+    )
+
+
+def _cached_query(schema_path: Path) -> KnowledgeGraphQuery:
+    return _compiled.get(("query", str(schema_path)), lambda: KnowledgeGraphQuery(schema_path))
+
+
 def _perf_log_path(host: str, path: str) -> Path:
     safe_host = "".join(ch if ch.isalnum() or ch in ".-" else "-" for ch in str(host or "unknown"))[:80]
     digest = hashlib.sha256(f"{host}\n{path}".encode("utf-8")).hexdigest()[:12]
@@ -86,7 +148,7 @@ def register_tasks_routes(rt, runtime) -> None:
             context_id = str(payload.get("context_id") or "").strip()
             if not context_id:
                 return Response("Missing context id", status_code=400)
-            diff = KnowledgeGraphQuery(schema_path).previous_context_diff(context_id)
+            diff = _cached_query(schema_path).previous_context_diff(context_id)
         except ValueError as exc:
             return Response(str(exc), status_code=400)
         except Exception as exc:
@@ -108,7 +170,7 @@ def register_tasks_routes(rt, runtime) -> None:
             view_dir.mkdir(parents=True, exist_ok=True)
             view_path = view_dir / f"{view_id}.view"
             view_path.write_text(view_text, encoding="utf-8")
-            model, graph = _compile_schema_payload(schema_path, str(payload.get("current_path") or ""))
+            model, graph = _cached_schema_payload(schema_path, str(payload.get("current_path") or ""))
         except ValueError as exc:
             return Response(str(exc), status_code=400)
         except Exception as exc:
@@ -128,7 +190,7 @@ def register_tasks_routes(rt, runtime) -> None:
             context_id = str(payload.get("context_id") or "").strip()
             if not context_id:
                 return Response("Missing context id", status_code=400)
-            model, graph = _compile_schema_payload(schema_path, str(payload.get("current_path") or ""), context_id)
+            model, graph = _cached_schema_payload(schema_path, str(payload.get("current_path") or ""), context_id)
         except ValueError as exc:
             return Response(str(exc), status_code=400)
         except Exception as exc:
@@ -8,6 +8,7 @@ import re
 import textwrap
 from typing import TYPE_CHECKING, Any, Union
 
+from .pack_cache import kg_pack_cache, list_sources, read_source_text, record_output
 from .query import resolve_context_id
 
 if TYPE_CHECKING:
@@ -121,7 +122,15 @@ class KgContext:
 
 
 def read_kg_pack(schema_path: PathLike, context_id: str = "") -> dict[str, Any]:
+    """The compiled graph for a pack, reused while none of its sources changed
+    (see `pack_cache`)."""
     schema_path = _as_pathlike(schema_path)
+    if not isinstance(schema_path, Path):
+        return _compile_kg_pack(schema_path, context_id)
+    return kg_pack_cache().load(schema_path, context_id, lambda: _compile_kg_pack(schema_path, context_id))
+
+
+def _compile_kg_pack(schema_path: PathLike, context_id: str = "") -> dict[str, Any]:
     schema = read_schema(schema_path)
     if schema.graph.get("contexts"):
         return _read_context_kg_pack(schema_path, schema, context_id)
@@ -265,7 +274,7 @@ def _read_context_kg_pack(schema_path: PathLike, schema: KgSchema, context_id: s
 
 
 def _discover_contexts(schema_path: PathLike, pattern: str) -> list[KgContext]:
-    contexts = [_read_context(path) for path in sorted(schema_path.parent.glob(pattern))]
+    contexts = [_read_context(path) for path in list_sources(schema_path.parent, pattern)]
     return sorted((item for item in contexts if item.id), key=lambda item: item.seq)
 
 
@@ -301,7 +310,7 @@ def _read_context(path: PathLike) -> KgContext:
     context = KgContext(id="", seq=0)
     section = ""
     current_slide: dict[str, Any] | None = None
-    raw_lines = path.read_text(encoding="utf-8").splitlines()
+    raw_lines = read_source_text(path).splitlines()
     index = 0
     while index < len(raw_lines):
         raw = raw_lines[index]
@@ -467,6 +476,7 @@ def _write_kg_cache(schema_path: PathLike, cache_name: str, graph: dict[str, Any
     }
     cache_path.parent.mkdir(parents=True, exist_ok=True)
     cache_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    record_output(cache_path)
 
 
 def read_schema(path: PathLike) -> KgSchema:
@@ -476,7 +486,7 @@ def read_schema(path: PathLike) -> KgSchema:
     current_source = ""
     current_source_attrs = False
     current_slide: dict[str, Any] | None = None
-    raw_lines = path.read_text(encoding="utf-8").splitlines()
+    raw_lines = read_source_text(path).splitlines()
     raw_index = 0
     while raw_index < len(raw_lines):
         raw = raw_lines[raw_index]
@@ -549,11 +559,9 @@ def read_schema(path: PathLike) -> KgSchema:
 
 def _read_tmp_view_sidecars(schema: KgSchema, schema_path: PathLike) -> None:
     view_dir = _tmp_view_sidecar_dir(schema_path)
-    if not view_dir.is_dir():
-        return
     existing = {view.id: index for index, view in enumerate(schema.views)}
-    for view_path in sorted(view_dir.glob("tmp.*.view")):
-        raw_lines = view_path.read_text(encoding="utf-8").splitlines()
+    for view_path in list_sources(view_dir, "tmp.*.view"):
+        raw_lines = read_source_text(view_path).splitlines()
         views, _consumed = _read_views(raw_lines)
         for view in views:
             if view.id in existing:
@@ -571,7 +579,7 @@ def read_nodes(path: PathLike) -> list[dict[str, str]]:
     nodes_by_id: dict[str, dict[str, Any]] = {}
     stack: list[dict[str, Any]] = []
     current: dict[str, Any] | None = None
-    raw_lines = _as_pathlike(path).read_text(encoding="utf-8").splitlines()
+    raw_lines = read_source_text(_as_pathlike(path)).splitlines()
     line_index = 0
     while line_index < len(raw_lines):
         raw = raw_lines[line_index]
@@ -633,7 +641,7 @@ def read_edges(path: PathLike, relations: dict[str, dict[str, str]] | None = Non
     edges: list[dict[str, Any]] = []
     by_id: dict[str, dict[str, Any]] = {}
     current: dict[str, Any] | None = None
-    raw_lines = _as_pathlike(path).read_text(encoding="utf-8").splitlines()
+    raw_lines = read_source_text(_as_pathlike(path)).splitlines()
     line_index = 0
     while line_index < len(raw_lines):
         raw = raw_lines[line_index]
@@ -779,7 +787,7 @@ def apply_attrs(path: PathLike, nodes: dict[str, dict], edges: dict[str, dict])
     current_key = ""
     target = nodes
     indexed = {"node": [], "edge": []}
-    for raw in _as_pathlike(path).read_text(encoding="utf-8").splitlines():
+    for raw in read_source_text(_as_pathlike(path)).splitlines():
         if not raw.strip() or raw.lstrip().startswith("#"):
             continue
         line = raw.rstrip()
@@ -819,7 +827,7 @@ def apply_attrs(path: PathLike, nodes: dict[str, dict], edges: dict[str, dict])
 
 def read_palette(path: PathLike) -> dict[str, Any]:
     try:
-        payload = json.loads(_as_pathlike(path).read_text(encoding="utf-8"))
+        payload = json.loads(read_source_text(_as_pathlike(path)))
     except Exception:
         return {}
     return payload if isinstance(payload, dict) else {}
@@ -1176,7 +1184,7 @@ def _record_lines(path: PathLike):
 
 
 def _record_raw_lines(path: PathLike):
-    for raw in _as_pathlike(path).read_text(encoding="utf-8").splitlines():
+    for raw in read_source_text(_as_pathlike(path)).splitlines():
         if not raw.strip() or raw.lstrip().startswith("#"):
             continue
         if raw.strip().startswith("@"):
@@ -1185,7 +1193,7 @@ def _record_raw_lines(path: PathLike):
 
 
 def _lines(path: PathLike):
-    for raw in _as_pathlike(path).read_text(encoding="utf-8").splitlines():
+    for raw in read_source_text(_as_pathlike(path)).splitlines():
         line = raw.strip()
         if line and not line.startswith("#"):
             yield line
@@ -7,6 +7,7 @@ import secrets
 from typing import Any, cast
 
 from ...markdown_fence import current_content_path, get_root_folder
+from ..markdown.render_cache import record_render_dependency
 from .items_pack import PathLike, read_kg_pack
 from .projections import attach_projection_models, normalize_projections
 from .layout import build_collapsed_graph
@@ -554,6 +555,7 @@ def _resolve_tasks_source_path(current_path: str | Path | None, source: str) ->
 
 def _load_palette_source(current_path: str | Path | None, source: str, palette_key: str = "") -> tuple[dict, dict, str]:
     resolved = _resolve_tasks_source_path(current_path, source)
+    record_render_dependency(resolved)
     if not resolved or not resolved.exists():
         return {}, {}, ""
     try:
@@ -569,6 +571,7 @@ def _load_palette_source(current_path: str | Path | None, source: str, palette_k
 
 def _load_combined_palette_source(current_path: str | Path | None, source: str) -> tuple[dict[str, dict], dict[str, dict], dict[str, dict], dict[str, dict[str, dict]], str, str, dict[str, dict]]:
     resolved = _resolve_tasks_source_path(current_path, source)
+    record_render_dependency(resolved)
     if not resolved or not resolved.exists():
         return {}, {}, {}, {}, "", "", {}
     try:
@@ -1027,6 +1030,7 @@ def _apply_kg_schema(graph: dict, current_path: str | Path | None) -> None:
     if not schema_source:
         return
     schema_path = _resolve_required_source(current_path, schema_source)
+    # read_kg_pack records each pack file and context glob it depends on.
     compiled = read_kg_pack(schema_path, str(graph.get("kg_context_id") or ""))
     for key in ("id", "title", "default_projection", "default_group_by", "default_color_by", "default_secondary_color_by", "default_open_depth", "edge_color_by", "edge_label_from", "view_projections", "slides", "hover_attrs", "node_attr_order", "edge_attr_order", "node_hidden_attrs", "edge_hidden_attrs", "color_palette_source", "kg_schema", "kg_cache", "kg_sources", "kg_context", "kg_contexts", "index_attributes", "edge_index_attributes", "filter_attributes", "card_states", "node_reference_labels", "acl"):
         if compiled.get(key) and not graph.get(key):
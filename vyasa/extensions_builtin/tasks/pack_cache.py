@@ -0,0 +1,286 @@
+"""Compiled, content-hashed cache of `.kg` packs.
+
+Parsing a pack re-reads and re-parses the schema, node pool, edge lists,
+attrs and every context file on each load, which dominates large graphs. A
+compiled pack is the graph, encoded as JSON, plus what it was built from: each
+source file's sha256 (with its stat as a fast path) and the listing of every
+folder glob that discovered sources. Entries live in memory and under
+`.vyasa-storage/kg-packs/`, so they survive restarts and are shared by build
+workers. A load re-checks the sources and decodes; only a changed file, a new
+or removed context, or a missing declared output triggers a re-parse.
+
+Stored packs are plain JSON, never pickles: the storage folder sits inside the
+content root, which may be a git clone anyone with push access can write into,
+so loading a stored pack must not be able to run code. Tuples and sets are
+tagged so a decoded graph equals the compiled one; a graph JSON cannot hold is
+simply not cached.
+
+Readers in `items_pack` route file reads through `read_source_text` and folder
+globs through `list_sources` so a compile records its inputs; both also report
+to an enclosing `record_render`, and a cache hit replays them there, so cached
+renders and task payloads see the exact pack sources either way. Only on-disk
+packs are cached; ref-served packs have no stable file stats to check.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from ..markdown.render_cache import record_render_dependency, record_render_probe
+
+_VERSION = 2
+_MAX_ENTRIES = 32
+
+
+@dataclass
+class _Sources:
+    files: dict[str, tuple[int, int, str]] = field(default_factory=dict)
+    globs: dict[tuple[str, str], tuple[str, ...]] = field(default_factory=dict)
+    outputs: set[str] = field(default_factory=set)
+
+
+_SOURCES: ContextVar[_Sources | None] = ContextVar("vyasa_kg_pack_sources", default=None)
+
+
+def read_source_text(path) -> str:
+    """`path.read_text()`, recording the file's stat and hash while compiling."""
+    record_render_dependency(path)
+    sources = _SOURCES.get()
+    if sources is None or not isinstance(path, Path):
+        return path.read_text(encoding="utf-8")
+    stat = path.stat()
+    data = path.read_bytes()
+    sources.files[str(path)] = (stat.st_mtime_ns, stat.st_size, hashlib.sha256(data).hexdigest())
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def list_sources(folder, pattern: str) -> list:
+    """Sorted `folder.glob(pattern)` (empty for a missing folder), recorded while compiling."""
+    found = sorted(folder.glob(pattern)) if folder.is_dir() else []
+    if isinstance(folder, Path):
+        _record_glob_probe(str(folder), pattern)
+    sources = _SOURCES.get()
+    if sources is not None and isinstance(folder, Path):
+        sources.globs[(str(folder), pattern)] = tuple(str(path) for path in found)
+    return found
+
+
+def _record_glob_probe(folder: str, pattern: str) -> None:
+    record_render_probe(f"kg-glob:{folder}:{pattern}", lambda: _glob_names(folder, pattern))
+
+
+def record_output(path) -> None:
+    """A file the compile writes (e.g. the JSON `cache`); its absence forces a recompile."""
+    sources = _SOURCES.get()
+    if sources is not None and isinstance(path, Path):
+        sources.outputs.add(str(path))
+
+
+@contextmanager
+def _recording():
+    sources = _Sources()
+    token = _SOURCES.set(sources)
+    try:
+        yield sources
+    finally:
+        _SOURCES.reset(token)
+
+
+def _file_current(path: str, recorded: tuple[int, int, str]) -> tuple[bool, tuple[int, int, str]]:
+    mtime_ns, size, digest = recorded
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False, recorded
+    if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+        return True, recorded
+    # Touched (checkout, copy): still current if the bytes are the same.
+    try:
+        with open(path, "rb") as handle:
+            same = hashlib.sha256(handle.read()).hexdigest() == digest
+    except OSError:
+        return False, recorded
+    return same, (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def _glob_names(folder: str, pattern: str) -> tuple[str, ...]:
+    path = Path(folder)
+    return tuple(str(item) for item in sorted(path.glob(pattern))) if path.is_dir() else ()
+
+
+def _tagged(value):
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("compiled KG graphs only cache with string keys")
+        return {key: _tagged(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_tagged(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__kg_tuple__": [_tagged(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"__kg_set__": [_tagged(item) for item in sorted(value, key=repr)]}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"compiled KG graphs cannot cache {type(value).__name__} values")
+
+
+def _untagged(value: dict):
+    if value.keys() == {"__kg_tuple__"}:
+        return tuple(value["__kg_tuple__"])
+    if value.keys() == {"__kg_set__"}:
+        return set(value["__kg_set__"])
+    return value
+
+
+def encode_graph(graph: dict[str, Any]) -> str:
+    """JSON for a compiled graph; raises TypeError for values JSON cannot hold."""
+    return json.dumps(_tagged(graph), separators=(",", ":"))
+
+
+def decode_graph(text: str) -> dict[str, Any]:
+    return json.loads(text, object_hook=_untagged)
+
+
+@dataclass
+class CompiledPack:
+    sources: _Sources
+    graph: str
+
+    def record_into_render(self) -> None:
+        """Replay the sources into an enclosing `record_render`, as a fresh
+        compile would have recorded them."""
+        for path in self.sources.files:
+            record_render_dependency(Path(path))
+        for folder, pattern in self.sources.globs:
+            _record_glob_probe(folder, pattern)
+
+    def is_current(self) -> bool:
+        for path, recorded in self.sources.files.items():
+            current, refreshed = _file_current(path, recorded)
+            if not current:
+                return False
+            self.sources.files[path] = refreshed
+        return all(_glob_names(folder, pattern) == names for (folder, pattern), names in self.sources.globs.items()) and all(
+            os.path.exists(path) for path in self.sources.outputs
+        )
+
+
+class KgPackCache:
+    def __init__(self, directory: Path | None, max_entries: int = _MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CompiledPack] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, schema_path: Path, context_id: str, compile: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """The compiled graph for (schema_path, context_id), compiling on a miss.
+        Every call returns a fresh copy, so callers may mutate it."""
+        key = hashlib.sha256(f"{_VERSION}\0{schema_path}\0{context_id}".encode("utf-8", "surrogatepass")).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read(key)
+        if entry is not None and entry.is_current():
+            self._remember(key, entry)
+            entry.record_into_render()
+            return decode_graph(entry.graph)
+        with _recording() as sources:
+            graph = compile()
+        try:
+            entry = CompiledPack(sources, encode_graph(graph))
+        except (TypeError, ValueError) as exc:
+            logger.debug("Not caching compiled KG pack {}: {}", schema_path, exc)
+            return graph
+        self._remember(key, entry)
+        self._write(key, entry)
+        return graph
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, entry: CompiledPack) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path | None:
+        return None if self.directory is None else self.directory / f"{key}.json"
+
+    def _read(self, key: str) -> CompiledPack | None:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.debug("Ignoring unreadable compiled KG pack {}: {}", path, exc)
+            return None
+        try:
+            if payload["version"] != _VERSION or not isinstance(payload["graph"], str):
+                return None
+            sources = _Sources(
+                files={str(name): (int(mtime), int(size), str(digest)) for name, (mtime, size, digest) in payload["files"].items()},
+                globs={(str(folder), str(pattern)): tuple(str(name) for name in names) for folder, pattern, names in payload["globs"]},
+                outputs={str(name) for name in payload["outputs"]},
+            )
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            logger.debug("Ignoring malformed compiled KG pack {}: {}", path, exc)
+            return None
+        return CompiledPack(sources, payload["graph"])
+
+    def _write(self, key: str, entry: CompiledPack) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        sources = entry.sources
+        payload = {
+            "version": _VERSION,
+            "files": {name: list(recorded) for name, recorded in sources.files.items()},
+            "globs": [[folder, pattern, list(names)] for (folder, pattern), names in sources.globs.items()],
+            "outputs": sorted(sources.outputs),
+            "graph": entry.graph,
+        }
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.debug("Could not store compiled KG pack {}: {}", path, exc)
+            tmp.unlink(missing_ok=True)
+
+
+_pack_caches: dict[str, KgPackCache] = {}
+_pack_caches_lock = threading.Lock()
+
+
+def kg_pack_cache() -> KgPackCache:
+    """The site's compiled-pack cache, stored beside other data in `.vyasa-storage`."""
+    from ...markdown_fence import get_root_folder
+
+    directory = get_root_folder().resolve() / ".vyasa-storage" / "kg-packs"
+    with _pack_caches_lock:
+        cache = _pack_caches.get(str(directory))
+        if cache is None:
+            cache = _pack_caches[str(directory)] = KgPackCache(directory)
+        return cache
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 from pathlib import Path
 import argparse
 import json
@@ -92,6 +93,95 @@ def _matches(row: dict[str, Any], field: str, operator: str, expected: str) -> b
     }[operator]
 
 
+def _edge_relation(edge: dict[str, Any]) -> str:
+    return str(edge.get("relation") or edge.get("label") or "")
+
+
+Adjacency = dict[str, list[tuple[str, dict[str, Any]]]]
+
+
+@dataclass
+class _GraphIndex:
+    """Sorted rows and per-relation adjacency for one loaded graph.
+
+    Graphs are immutable once loaded, so everything here is built at most once
+    per context and shared by every stage; rows handed to a query stream are
+    shallow copies, since stages update them in place.
+    """
+
+    nodes: list[dict[str, Any]]
+    edges: list[dict[str, Any]]
+    nodes_by_id: dict[str, dict[str, Any]]
+    edges_by_relation: dict[str, list[dict[str, Any]]]
+    _adjacency: dict[tuple[str, bool], Adjacency] = field(default_factory=dict)
+    _targets: dict[str, frozenset[str]] = field(default_factory=dict)
+    _facts: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, graph: dict[str, Any]) -> "_GraphIndex":
+        nodes = sorted(
+            ({key: value for key, value in node.items() if not key.startswith("__")} for node in [*graph.get("groups", []), *graph.get("tasks", [])]),
+            key=lambda row: str(row.get("id", "")),
+        )
+        edges = sorted(
+            (dict(edge) for edge in graph.get("dependency_edges", [])),
+            key=lambda edge: (
+                str(edge.get("source", "")),
+                str(edge.get("relation", edge.get("label", ""))),
+                str(edge.get("target", "")),
+                str(edge.get("id", "")),
+            ),
+        )
+        by_relation: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for edge in edges:
+            by_relation[_edge_relation(edge)].append(edge)
+        return cls(nodes, edges, {str(node.get("id")): node for node in nodes}, dict(by_relation))
+
+    def adjacency(self, relation: str, incoming: bool) -> Adjacency:
+        """`start -> [(end, step)]` over `relation` edges, each list sorted."""
+        key = (relation, incoming)
+        if key not in self._adjacency:
+            adjacency: Adjacency = defaultdict(list)
+            for edge in self.edges_by_relation.get(relation, []):
+                source, target = str(edge.get("source")), str(edge.get("target"))
+                start, end = (target, source) if incoming else (source, target)
+                adjacency[start].append((end, {"source": source, "relation": relation, "target": target}))
+            for values in adjacency.values():
+                values.sort(key=lambda item: (item[0], _stable(item[1])))
+            self._adjacency[key] = dict(adjacency)
+        return self._adjacency[key]
+
+    def targets(self, relation: str) -> frozenset[str]:
+        if relation not in self._targets:
+            self._targets[relation] = frozenset(str(edge.get("target")) for edge in self.edges_by_relation.get(relation, []))
+        return self._targets[relation]
+
+    def facts(self, context_id: str) -> list[dict[str, Any]]:
+        if context_id not in self._facts:
+            facts: list[dict[str, Any]] = []
+            for node in self.nodes:
+                entity = node.get("id")
+                for name in sorted(key for key in node if key != "id"):
+                    values = node[name] if isinstance(node[name], list) else [node[name]]
+                    for value in values:
+                        facts.append({"e": entity, "a": name, "v": value, "ref": False, "context": context_id})
+            for edge in self.edges:
+                relation = _edge_relation(edge)
+                fact = {key: value for key, value in edge.items() if not key.startswith("__")}
+                fact.update({
+                    "e": edge.get("source"),
+                    "a": relation,
+                    "v": edge.get("target"),
+                    "ref": True,
+                    "relation": relation,
+                    "edge_id": edge.get("id"),
+                    "context": context_id,
+                })
+                facts.append(fact)
+            self._facts[context_id] = facts
+        return self._facts[context_id]
+
+
 class KnowledgeGraphQuery:
     def __init__(self, schema_path: str | Path):
         from .items_pack import read_kg_pack, read_schema
@@ -100,6 +190,7 @@ class KnowledgeGraphQuery:
         self.schema = read_schema(self.schema_path)
         self.relations = set(self.schema.relations)
         self._graphs: dict[str, dict[str, Any]] = {}
+        self._indexes: dict[int, tuple[dict[str, Any], _GraphIndex]] = {}
         default_graph = read_kg_pack(self.schema_path)
         context = default_graph.get("kg_context") or {}
         self.default_context = str(context.get("id") or "base")
@@ -119,47 +210,20 @@ class KnowledgeGraphQuery:
                 raise QueryError(str(exc)) from exc
         return self._graphs[context_id]
 
-    @staticmethod
-    def _nodes(graph: dict[str, Any]) -> list[dict[str, Any]]:
-        rows = []
-        for node in [*graph.get("groups", []), *graph.get("tasks", [])]:
-            rows.append({key: value for key, value in node.items() if not key.startswith("__")})
-        return sorted(rows, key=lambda row: str(row.get("id", "")))
+    def _index(self, graph: dict[str, Any]) -> _GraphIndex:
+        cached = self._indexes.get(id(graph))
+        if cached is None or cached[0] is not graph:
+            cached = self._indexes[id(graph)] = (graph, _GraphIndex.build(graph))
+        return cached[1]
 
-    @staticmethod
-    def _edges(graph: dict[str, Any]) -> list[dict[str, Any]]:
-        return sorted(
-            (dict(edge) for edge in graph.get("dependency_edges", [])),
-            key=lambda edge: (
-                str(edge.get("source", "")),
-                str(edge.get("relation", edge.get("label", ""))),
-                str(edge.get("target", "")),
-                str(edge.get("id", "")),
-            ),
-        )
+    def _nodes(self, graph: dict[str, Any]) -> list[dict[str, Any]]:
+        return [dict(node) for node in self._index(graph).nodes]
+
+    def _edges(self, graph: dict[str, Any]) -> list[dict[str, Any]]:
+        return [dict(edge) for edge in self._index(graph).edges]
 
     def _facts(self, graph: dict[str, Any], context_id: str) -> list[dict[str, Any]]:
-        facts: list[dict[str, Any]] = []
-        for node in self._nodes(graph):
-            entity = node.get("id")
-            for field in sorted(key for key in node if key != "id"):
-                values = node[field] if isinstance(node[field], list) else [node[field]]
-                for value in values:
-                    facts.append({"e": entity, "a": field, "v": value, "ref": False, "context": context_id})
-        for edge in self._edges(graph):
-            relation = str(edge.get("relation") or edge.get("label") or "")
-            fact = {key: value for key, value in edge.items() if not key.startswith("__")}
-            fact.update({
-                "e": edge.get("source"),
-                "a": relation,
-                "v": edge.get("target"),
-                "ref": True,
-                "relation": relation,
-                "edge_id": edge.get("id"),
-                "context": context_id,
-            })
-            facts.append(fact)
-        return facts
+        return [dict(fact) for fact in self._index(graph).facts(context_id)]
 
     def _require_relation(self, relation: str) -> None:
         if relation not in self.relations:
@@ -174,17 +238,9 @@ class KnowledgeGraphQuery:
         transitive: bool,
     ) -> list[dict[str, Any]]:
         self._require_relation(relation)
-        nodes = {str(node["id"]): node for node in self._nodes(graph)}
-        adjacency: dict[str, list[tuple[str, dict[str, Any]]]] = defaultdict(list)
-        for edge in self._edges(graph):
-            edge_relation = str(edge.get("relation") or edge.get("label") or "")
-            if edge_relation != relation:
-                continue
-            source, target = str(edge.get("source")), str(edge.get("target"))
-            start, end = (target, source) if incoming else (source, target)
-            adjacency[start].append((end, {"source": source, "relation": relation, "target": target}))
-        for values in adjacency.values():
-            values.sort(key=lambda item: (item[0], _stable(item[1])))
+        index = self._index(graph)
+        nodes = index.nodes_by_id
+        adjacency = index.adjacency(relation, incoming)
 
         seed_paths: dict[str, list[dict[str, Any]]] = {}
         for row in rows:
@@ -197,10 +253,10 @@ class KnowledgeGraphQuery:
         seeds = sorted(seed_paths)
         seed_set = set(seeds)
         paths: dict[str, list[dict[str, Any]]] = {}
-        frontier = [(seed, seed_paths[seed]) for seed in seeds]
+        frontier = deque((seed, seed_paths[seed]) for seed in seeds)
         seen = set(seeds)
         while frontier:
-            current, path = frontier.pop(0)
+            current, path = frontier.popleft()
             for target, step in adjacency.get(current, []):
                 next_path = [*path, step]
                 if target not in seed_set and (target not in paths or _stable(next_path) < _stable(paths[target])):
@@ -211,13 +267,17 @@ class KnowledgeGraphQuery:
             if not transitive:
                 continue
         reached = sorted(paths)
-        return [{**nodes[node_id], "__path__": paths[node_id]} for node_id in reached if node_id in nodes]
+        return [
+            {**nodes[node_id], "__path__": [dict(step) for step in paths[node_id]]}
+            for node_id in reached
+            if node_id in nodes
+        ]
 
     def _snapshot(self, context_id: str) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
-        graph = self._graph(context_id)
-        nodes = {str(node["id"]): node for node in self._nodes(graph)}
+        index = self._index(self._graph(context_id))
+        nodes = {node_id: dict(node) for node_id, node in index.nodes_by_id.items()}
         edges = {}
-        for edge in self._edges(graph):
+        for edge in index.edges:
             edge_id = str(edge.get("id") or "")
             if edge_id in edges:
                 raise QueryError(f"Duplicate KG edge id: {edge_id}")
@@ -234,18 +294,18 @@ class KnowledgeGraphQuery:
             rows.append({"change": "removed", "kind": "node", "id": node_id, "value": before_nodes[node_id]})
         for node_id in sorted(before_nodes.keys() & after_nodes.keys()):
             before, after = before_nodes[node_id], after_nodes[node_id]
-            for field in sorted((before.keys() | after.keys()) - {"id"}):
-                if before.get(field) == after.get(field):
+            for key in sorted((before.keys() | after.keys()) - {"id"}):
+                if before.get(key) == after.get(key):
                     continue
-                change = "added" if field not in before else "removed" if field not in after else "changed"
+                change = "added" if key not in before else "removed" if key not in after else "changed"
                 rows.append(
                     {
                         "change": change,
                         "kind": "attribute",
                         "id": node_id,
-                        "field": field,
-                        "before": before.get(field),
-                        "after": after.get(field),
+                        "field": key,
+                        "before": before.get(key),
+                        "after": after.get(key),
                     }
                 )
         for edge_id in sorted(after_edges.keys() - before_edges.keys()):
@@ -271,7 +331,7 @@ class KnowledgeGraphQuery:
         if index <= 0:
             return {"from": "", "to": after_id, "node_ids": []}
         before_id = str(ordered[index - 1]["id"])
-        present_ids = {str(node["id"]) for node in self._nodes(self._graph(after_id))}
+        present_ids = set(self._index(self._graph(after_id)).nodes_by_id)
         changed_ids: set[str] = set()
         for row in self._diff(before_id, after_id):
             if row["kind"] in {"node", "attribute"}:
@@ -330,7 +390,7 @@ class KnowledgeGraphQuery:
                 stream = [row for row in stream if all(_matches(row, *condition) for condition in conditions)]
             elif verb == "join":
                 fields = shlex.split(rest)
-                nodes = {str(node["id"]): node for node in self._nodes(graph)}
+                nodes = self._index(graph).nodes_by_id
                 for row in stream:
                     node = nodes.get(str(row.get("e", "")), {})
                     row.update({field: node[field] for field in fields if field in node})
@@ -338,11 +398,7 @@ class KnowledgeGraphQuery:
                 stream = self._traverse(stream, graph, rest, verb.startswith("incoming"), verb.endswith("*"))
             elif verb in {"with", "without"}:
                 self._require_relation(rest)
-                targets = {
-                    str(edge.get("target"))
-                    for edge in self._edges(graph)
-                    if str(edge.get("relation") or edge.get("label") or "") == rest
-                }
+                targets = self._index(graph).targets(rest)
                 stream = [row for row in stream if (str(row.get("id")) in targets) == (verb == "with")]
             elif verb == "select":
                 fields = shlex.split(rest)
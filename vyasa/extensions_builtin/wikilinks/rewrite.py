@@ -1,27 +1,37 @@
 import os
 import re
+import threading
 import time
 from pathlib import Path
 
+from ...content_index import IndexScope, content_index
 from ...helpers import (
     content_path_for_slug,
     content_slug_for_path,
     content_url_for_slug,
     find_folder_note_file,
     get_content_mounts,
-    iter_visible_files,
     parse_frontmatter,
     resolve_heading_anchor,
     text_to_anchor,
 )
+from ..markdown.render_cache import record_render_dependency, record_render_probe
 
-_INDEX = {"fingerprint": None, "entries": [], "by_name": {}, "by_alias": {}, "by_slug": {}, "by_path": {}, "by_dir": {}, "headings": {}}
+_INDEX = {
+    "scope": None, "synced": None, "version": 0, "docs": {},
+    "by_name": {}, "by_alias": {}, "by_slug": {}, "by_path": {}, "by_dir": {}, "headings": {},
+}
+_INDEX_LOCK = threading.Lock()
+_TABLES = ("by_name", "by_alias", "by_slug", "by_path", "by_dir")
 
-# Recomputing the fingerprint walks every content root and stats every .md file.
-# _index() is consulted several times per [[link]], so a document with thousands
-# of wikilinks would otherwise trigger thousands of full-tree walks. Within this
-# window we reuse the already-built index without re-walking; edits show up after
-# at most _INDEX_TTL seconds. Override with VYASA_WIKILINKS_INDEX_TTL.
+# The note maps are kept in step with the process-wide content index: each sync
+# re-reads only the .md files whose (mtime, size) moved, and re-derives folder
+# notes only in folders that gained or lost a file. While the reload watcher
+# runs, a sync is an O(1) generation check. Without it, checking means a stat
+# walk of every content root, and _index() is consulted several times per
+# [[link]]; within this window the built maps are reused without re-walking, so
+# edits show up after at most _INDEX_TTL seconds. Override with
+# VYASA_WIKILINKS_INDEX_TTL.
 try:
     _INDEX_TTL = float(os.environ.get("VYASA_WIKILINKS_INDEX_TTL", "2.0"))
 except ValueError:
@@ -31,13 +41,28 @@ _INDEX_CHECKED_AT = 0.0
 _INDEX_GENERATION = -1
 
 
-def _fingerprint():
-    return tuple(
-        (alias, str(root.resolve()), max((p.stat().st_mtime for p in iter_visible_files(root, (".md",), True)), default=0))
-        for alias, root in get_content_mounts()
+def _index_scope() -> IndexScope:
+    from ...config import get_config
+
+    return IndexScope(
+        mounts=tuple((alias, root.resolve()) for alias, root in get_content_mounts()),
+        show_hidden=True,
+        excluded_dirs=frozenset(get_config().get_reload_excludes()),
+        suffixes=(".md",),
     )
 
 
+def _preferred_note(folder: str, names) -> str | None:
+    """`find_folder_note_file`, answered from the names the index already holds."""
+    preferred = {}
+    for name in names:
+        stem = Path(name).stem.lower()
+        kind = "index" if stem == "index" else "readme" if stem == "readme" else "named" if stem == Path(folder).name.lower() else None
+        if kind:
+            preferred[kind] = name
+    return preferred.get("index") or preferred.get("readme") or preferred.get("named")
+
+
 def _is_folder_note(path: Path) -> bool:
     preferred = find_folder_note_file(path.parent)
     return bool(preferred and preferred.resolve() == path.resolve())
@@ -53,59 +78,157 @@ def _index():
 
     generation = config_generation()
     now = time.monotonic()
-    # Skip the (expensive) fingerprint walk if we revalidated recently AND the
-    # config hasn't reloaded (a reload may swap the content roots entirely).
-    if (
-        _INDEX["fingerprint"] is not None
-        and generation == _INDEX_GENERATION
-        and (now - _INDEX_CHECKED_AT) < _INDEX_TTL
-    ):
-        return _INDEX
-    fp = _fingerprint()
-    _INDEX_CHECKED_AT = now
-    _INDEX_GENERATION = generation
-    if _INDEX["fingerprint"] == fp:
-        return _INDEX
-    entries, by_name, by_alias, by_slug, by_path, by_dir = [], {}, {}, {}, {}, {}
-    for _, root in get_content_mounts():
-        for path in iter_visible_files(root, (".md",), True):
-            slug = content_slug_for_path(path)
-            if not slug:
-                continue
-            is_folder_note = _is_folder_note(path)
-            route_slug = str(Path(slug).parent).replace("\\", "/").strip(".") if is_folder_note else slug
-            resolved = path.resolve()
-            entry = {"slug": slug, "route_slug": route_slug, "path": path}
-            entries.append(entry)
-            by_slug.setdefault(slug, entry)
-            by_slug.setdefault(route_slug, entry)
-            # by_path/by_dir let relative links resolve via dict lookup instead of
-            # touching the filesystem per [[link]] (the old hot path: 1.3M resolve()).
-            by_path.setdefault(str(resolved), entry)
-            if is_folder_note:
-                by_dir.setdefault(str(resolved.parent), entry)
-            by_name.setdefault(path.stem.casefold(), []).append(entry)
-            frontmatter, _ = parse_frontmatter(path)
-            aliases = frontmatter.get("aliases") or []
-            if isinstance(aliases, str):
-                aliases = [aliases]
-            for alias in aliases:
-                alias_text = str(alias).strip()
-                if alias_text:
-                    by_alias.setdefault(alias_text.casefold(), []).append(entry)
-    _INDEX.update(fingerprint=fp, entries=entries, by_name=by_name, by_alias=by_alias, by_slug=by_slug, by_path=by_path, by_dir=by_dir, headings={})
+    # Re-derive the scope (a config reload may swap the content roots entirely)
+    # and fall back to a full check at most once per window; in between, only a
+    # watched snapshot of the content index is consulted, and that read is O(1).
+    if _INDEX["scope"] is None or generation != _INDEX_GENERATION or (now - _INDEX_CHECKED_AT) >= _INDEX_TTL:
+        _INDEX_CHECKED_AT = now
+        _INDEX_GENERATION = generation
+        _sync(_index_scope())
+    elif content_index().covers(_INDEX["scope"]):
+        _sync(_INDEX["scope"])
     return _INDEX
 
 
+def _sync(scope: IndexScope) -> None:
+    index = content_index()
+    generation = index.generation(scope)
+    with _INDEX_LOCK:
+        if _INDEX["scope"] == scope and _INDEX["synced"] == generation:
+            return
+        if _INDEX["scope"] != scope:
+            _INDEX.update(scope=scope, docs={}, headings={}, **{table: {} for table in _TABLES})
+            _INDEX["version"] += 1
+        docs = _INDEX["docs"]
+        current = {str(entry.path): entry for entry in index.entries(scope) if entry.path.suffix.lower() == ".md"}
+        gone = [key for key in docs if key not in current]
+        changed = [entry for key, entry in current.items() if key not in docs or docs[key]["stamp"] != (entry.mtime, entry.size)]
+        # Which file is a folder's note depends only on the names beside it.
+        folders = {os.path.dirname(key) for key in gone} | {str(entry.path.parent) for entry in changed if str(entry.path) not in docs}
+        moved = False
+        for key in gone:
+            moved |= _unlink_doc(docs.pop(key))
+        fresh = []
+        for entry in changed:
+            old = docs.get(str(entry.path))
+            doc = docs[str(entry.path)] = _note_entry(entry.path, (entry.mtime, entry.size), old is not None and old["folder_note"])
+            if old is not None and set(_entry_keys(old)) == set(_entry_keys(doc)):
+                _swap_doc(old, doc)  # a body edit: every link still resolves as before
+            else:
+                if old is not None:
+                    _unlink_doc(old)
+                fresh.append(doc)
+        if folders:
+            members: dict[str, list[str]] = {}
+            for key in docs:
+                folder, name = os.path.split(key)
+                if folder in folders:
+                    members.setdefault(folder, []).append(name)
+            for folder, names in members.items():
+                preferred = _preferred_note(folder, names)
+                for name in names:
+                    doc = docs[os.path.join(folder, name)]
+                    if doc["folder_note"] != (name == preferred):
+                        moved |= _unlink_doc(doc)
+                        _set_folder_note(doc, name == preferred)
+                        fresh.append(doc)
+        for doc in fresh:
+            if not doc["linked"]:
+                _link_doc(doc)
+                moved = True
+        _INDEX["synced"] = generation
+        if moved:
+            _INDEX["version"] += 1
+
+
+def _note_entry(path: Path, stamp: tuple, folder_note: bool) -> dict:
+    frontmatter, _ = parse_frontmatter(path)
+    aliases = frontmatter.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    entry = {
+        "slug": content_slug_for_path(path),
+        "path": path,
+        "stamp": stamp,
+        "resolved": str(path.resolve()),
+        "aliases": [str(alias).strip().casefold() for alias in aliases if str(alias).strip()],
+        "linked": False,
+    }
+    _set_folder_note(entry, folder_note)
+    return entry
+
+
+def _set_folder_note(entry: dict, is_folder_note: bool) -> None:
+    entry["folder_note"] = is_folder_note
+    slug = entry["slug"]
+    entry["route_slug"] = str(Path(slug).parent).replace("\\", "/").strip(".") if is_folder_note and slug else slug
+
+
+def _entry_keys(entry: dict):
+    if not entry["slug"]:
+        return
+    yield "by_slug", entry["slug"]
+    yield "by_slug", entry["route_slug"]
+    # by_path/by_dir let relative links resolve via dict lookup instead of
+    # touching the filesystem per [[link]] (the old hot path: 1.3M resolve()).
+    yield "by_path", entry["resolved"]
+    if entry["folder_note"]:
+        yield "by_dir", os.path.dirname(entry["resolved"])
+    yield "by_name", entry["path"].stem.casefold()
+    for alias in entry["aliases"]:
+        yield "by_alias", alias
+
+
+def _note_order(entry: dict):
+    # Shallower notes win a shared slug, as they did when the maps were filled
+    # top-down from a walk.
+    return (len(entry["path"].parts), str(entry["path"]))
+
+
+def _link_doc(entry: dict) -> None:
+    for table, key in _entry_keys(entry):
+        bucket = _INDEX[table].get(key, [])
+        if not any(other is entry for other in bucket):
+            # Buckets are replaced, never mutated, so readers need no lock.
+            _INDEX[table][key] = sorted([*bucket, entry], key=_note_order)
+    entry["linked"] = True
+
+
+def _swap_doc(old: dict, new: dict) -> None:
+    for table, key in _entry_keys(old):
+        _INDEX[table][key] = sorted([new if other is old else other for other in _INDEX[table].get(key, [])], key=_note_order)
+    old["linked"], new["linked"] = False, True
+
+
+def _unlink_doc(entry: dict) -> bool:
+    if not entry["linked"]:
+        return False
+    for table, key in _entry_keys(entry):
+        bucket = [other for other in _INDEX[table].get(key, []) if other is not entry]
+        if bucket:
+            _INDEX[table][key] = bucket
+        else:
+            _INDEX[table].pop(key, None)
+    _INDEX["headings"] = {key: value for key, value in _INDEX["headings"].items() if key[0] != entry["slug"]}
+    entry["linked"] = False
+    return True
+
+
+def _first(table: str, key: str):
+    bucket = _INDEX[table].get(key)
+    return bucket[0] if bucket else None
+
+
 def _existing_note_entry(base: str):
     # The index only holds existing notes, so a slug/route-slug hit means the note
     # exists — no filesystem probing needed (covers both files and folder notes).
-    return _index()["by_slug"].get(base)
+    _index()
+    return _first("by_slug", base)
 
 
 def _relative_entry(base: str, current_path: str):
-    info = _index()
-    current = info["by_slug"].get(current_path)
+    _index()
+    current = _first("by_slug", current_path)
     if not current:
         direct = content_path_for_slug(current_path, ".md")
         if direct and direct.exists():
@@ -114,11 +237,7 @@ def _relative_entry(base: str, current_path: str):
         return None
     resolved = (current["path"].parent / base).resolve()
     md_resolved = resolved if resolved.suffix else resolved.with_suffix(".md")
-    return (
-        info["by_path"].get(str(resolved))
-        or info["by_path"].get(str(md_resolved))
-        or info["by_dir"].get(str(resolved))
-    )
+    return _first("by_path", str(resolved)) or _first("by_path", str(md_resolved)) or _first("by_dir", str(resolved))
 
 
 def _resolve_note(target: str, current_path: str | None):
@@ -144,6 +263,7 @@ def _resolve_note(target: str, current_path: str | None):
 
 def _heading_map_for_entry(entry):
     path = entry["path"]
+    record_render_dependency(path)
     key = (entry["slug"], path.stat().st_mtime)
     if key in _INDEX["headings"]:
         return _INDEX["headings"][key]
@@ -181,6 +301,10 @@ def _resolve_heading_fragment(entry, parts):
 
 
 def rewrite_wikilinks(content, current_path=None):
+    if "[[" in content:
+        # Link targets come from the note index, so a cached render is only
+        # reusable while that index is unchanged.
+        record_render_probe("wikilinks", lambda: _index()["version"])
     protected = []
     content = re.sub(
         r"(```+|~~~+)[\s\S]*?\1|(`+)([^`]*?)\2",
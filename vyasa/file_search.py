@@ -142,20 +142,25 @@ def _place_tokens(needle: str, haystack: str):
     return first
 
 
+# `_fuzzy_score` tiers, best to worst.
+_EXACT_TIER, _PREFIX_TIER, _WORDS_TIER, _SUBSEQUENCE_TIER = range(4)
+
+
 def _fuzzy_score(needle: str, haystack: str):
-    """Lower is better. Tiers, best to worst: exact match, whole-string prefix,
-    every query word present as a contiguous substring (in order), then a
-    subsequence fallback whose penalty rewards matches on word boundaries
-    (so 'ar' favours 'api routes' over 'shared')."""
+    """`(tier, score)`, or None when `needle` does not match; lower is better.
+    Tiers, best to worst: exact match, whole-string prefix, every query word
+    present as a contiguous substring (in order), then a subsequence fallback
+    whose penalty rewards matches on word boundaries (so 'ar' favours
+    'api routes' over 'shared'). Scores only order hits within a tier."""
     if not needle:
         return None
     if needle == haystack:
-        return 0
+        return _EXACT_TIER, 0
     if haystack.startswith(needle):
-        return 10 + len(haystack)
+        return _PREFIX_TIER, 10 + len(haystack)
     first = _place_tokens(needle, haystack)
     if first is not None:
-        return 20 + first + len(haystack)
+        return _WORDS_TIER, 20 + first + len(haystack)
     pos, gaps, boundary_hits = -1, 0, 0
     for char in needle:
         if char == " ":
@@ -167,7 +172,7 @@ def _fuzzy_score(needle: str, haystack: str):
         if found == 0 or haystack[found - 1] == " ":
             boundary_hits += 1
         pos = found
-    return 100 + gaps + len(haystack) - boundary_hits * 5
+    return _SUBSEQUENCE_TIER, 100 + gaps + len(haystack) - boundary_hits * 5
 
 
 def search_file_records(query, roots, suffixes, show_hidden=False, limit=40, exclude_paths=()):
@@ -181,12 +186,32 @@ def search_file_records(query, roots, suffixes, show_hidden=False, limit=40, exc
     needle = _normalize_file_search_text(trimmed)
     scored = []
     for record in records:
-        score = _fuzzy_score(needle, record.normalized_basename)
-        if score is None:
-            score = _fuzzy_score(needle, record.normalized_path)
-            if score is not None:
-                score += 50
-        if score is not None:
-            scored.append((score, record.display, record.path))
-    scored.sort(key=lambda item: (item[0], item[1]))
-    return tuple(item[2] for item in scored[:limit]), regex_error
+        match = _fuzzy_score(needle, record.normalized_basename)
+        if match is None:
+            match = _fuzzy_score(needle, record.normalized_path)
+            if match is not None:
+                match = (match[0], match[1] + 50)
+        if match is not None:
+            scored.append((*match, record.display, record.path))
+    scored.sort(key=lambda item: (item[1], item[2]))
+    # Name hits on whole words rank first, then pages whose text matches, then
+    # loose letter-subsequence name hits.
+    named = [item[3] for item in scored if item[0] < _SUBSEQUENCE_TIER]
+    loose = [item[3] for item in scored if item[0] == _SUBSEQUENCE_TIER]
+    seen = set(named)
+    found = [path for path in _content_matches(trimmed, roots, records, show_hidden, limit) if path not in seen]
+    seen.update(found)
+    return tuple([*named, *found, *(path for path in loose if path not in seen)][:limit]), regex_error
+
+
+def _content_matches(query, roots, records, show_hidden, limit):
+    """Records whose body, title or headings match `query`, best BM25 first."""
+    from .search_index import disk_search_scope, search_index
+
+    scope = disk_search_scope(roots, show_hidden)
+    if scope is None:
+        return []
+    index = search_index()
+    index.sync(scope)
+    by_path = {str(record.path): record.path for record in records if isinstance(record.path, Path)}
+    return [by_path[str(path)] for path, _ in index.search(query, limit * 4) if str(path) in by_path][:limit]
@@ -51,6 +51,9 @@ def refresh_requested_ref(path: str, request: Any) -> None:
 
 def clear_caches() -> None:
     _git_roots_with_refs.cache_clear()
+    from .content_backend import forget_git_refs
+
+    forget_git_refs()
     try:
         from . import core
 
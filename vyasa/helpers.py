@@ -253,13 +253,45 @@ def content_location(slug: str | Path, *, ref_override: str = "") -> tuple[str,
     return (body[0] if body else ""), None, ref, Path(*body[1:]) if len(body) > 1 else Path()
 
 
-def content_path_for_slug(slug: str | Path, suffix: str = "") -> Path | None:
+def _resolution_key(kind: str, slug: str | Path, suffix: str) -> tuple:
+    """Everything besides the watched tree that a slug's resolution depends on."""
+    from .config import config_generation
+    from .extensions import get_extension_runtime
+
+    return (kind, config_generation(), id(get_extension_runtime()), os.getenv("VYASA_CLI_ROOT"), str(slug), suffix)
+
+
+def _content_path_for_slug(slug: str | Path, suffix: str = "") -> Path | None:
     root, relative = content_root_and_relative(slug)
     if root is None:
         return None
     return _safe_child(root, f"{relative.as_posix()}{suffix}")
 
 
+def content_path_for_slug(slug: str | Path, suffix: str = "") -> Path | None:
+    from .resolution_cache import resolution_cache
+
+    def resolve():
+        path = _content_path_for_slug(slug, suffix)
+        return path, None if path is None else [path]
+
+    return resolution_cache().get(_resolution_key("path", slug, suffix), resolve)
+
+
+def content_file_for_slug(slug: str | Path, suffix: str = "") -> Path | None:
+    """`content_path_for_slug`, but only when it names an existing file. Misses
+    are memoized too, so repeated requests for missing files stay cheap."""
+    from .resolution_cache import resolution_cache
+
+    def resolve():
+        path = content_path_for_slug(slug, suffix)
+        if path is None:
+            return None, None
+        return (path if path.is_file() else None), [path]
+
+    return resolution_cache().get(_resolution_key("file", slug, suffix), resolve)
+
+
 def relative_content_directory(current_file):
     if current_file is None:
         return None
@@ -445,7 +477,7 @@ def _recover_simple_frontmatter(text: str) -> dict:
 def _strip_leading_frontmatter_block(text: str) -> str:
     return re.sub(r"^(---|\+\+\+)\s*\n.*?\n\1\s*\n?", "", text, count=1, flags=re.DOTALL)
 
-def should_exclude_dir(name: str, excluded: set[str]) -> bool:
+def should_exclude_dir(name: str, excluded: set[str] | frozenset[str]) -> bool:
     """Exclude exact matches plus common derived names like .venv.bak."""
     if name in excluded:
         return True
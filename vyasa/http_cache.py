@@ -0,0 +1,295 @@
+"""Strong ETags, `304 Not Modified` and cached gzip/brotli bodies for hot responses.
+
+Every navigation used to rebuild the full page (inline KG JSON included) and
+send it uncompressed, even when the browser already held identical bytes.
+`ResponseCacheMiddleware` sits just inside the session middleware and, for
+document pages, sidebar fragments and static assets:
+
+- keys each GET on everything that can change its output besides content: path
+  and query, the htmx request headers, the host and the session;
+- renders a miss under `observe_render()`, so the entry remembers every file the
+  render read (cache hits included) and hashes the body into a strong ETag;
+- serves a hit only while those files, and the app-wide `probe` value for pages
+  (config generation, content tree fingerprint, RBAC rules), still match. A hit
+  answers a matching `If-None-Match` with 304 before any handler runs, and
+  otherwise sends the body in the best encoding the client accepts. Each
+  encoding is compressed once per entry and kept.
+
+Responses that are not 200, are already encoded, set a cookie, are larger
+than `_MAX_BODY_BYTES` (attachments such as PDFs and videos keep streaming), or
+are streamed without a length pass straight through. Attachment routes under
+`/posts/` record the file they serve, so their entries follow edits like pages. Brotli is used when the
+`brotli` package is installed; gzip otherwise.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl
+
+from .extensions_builtin.markdown.render_cache import _Recorder, observe_render
+
+_MAX_ENTRIES = 256
+_MAX_BYTES = 32 * 1024 * 1024
+_MAX_BODY_BYTES = 8 * 1024 * 1024
+_MIN_COMPRESS_BYTES = 1024
+PAGE_PREFIXES = ("/posts/", "/_sidebar/posts", "/api/sidebar/tree")
+ASSET_PREFIXES = ("/static/",)
+PAGE_CACHE_CONTROL = "private, no-cache"
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+# Query flags that write debug logs or refresh git refs as a side effect.
+_UNCACHEABLE_PARAMS = frozenset({"ref", "tasks_perf", "tasks_debug"})
+_DROPPED_HEADERS = frozenset({b"content-length", b"content-encoding", b"etag", b"vary"})
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        brotli = _brotli()
+        assert brotli is not None  # preferred_encoding only offers br when it is installed
+        return brotli.compress(body, quality=8)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def preferred_encoding(accept_encoding: str) -> str:
+    """`br`, `gzip` or `identity`, from an `Accept-Encoding` header."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if accepted.get("br", wildcard) > 0 and _brotli() is not None:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return "identity"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """True when `If-None-Match` names `etag` in any of its encodings (or is `*`)."""
+    base = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        candidate = candidate.removeprefix("W/").strip('"')
+        if candidate.partition("-")[0] == base:
+            return True
+    return False
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    compressible: bool
+    _encoded: dict[str, bytes] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def from_message(cls, start: dict, body: bytes, *, default_cache_control: str | None) -> "CachedResponse":
+        headers = [(name, value) for name, value in start.get("headers", []) if name.lower() not in _DROPPED_HEADERS]
+        names = {name.lower() for name, _ in headers}
+        if default_cache_control and b"cache-control" not in names:
+            headers.append((b"cache-control", default_cache_control.encode("latin-1")))
+        content_type = next((value.decode("latin-1") for name, value in headers if name.lower() == b"content-type"), "")
+        return cls(
+            status=start["status"],
+            headers=headers,
+            body=body,
+            etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+            compressible=len(body) >= _MIN_COMPRESS_BYTES and content_type.startswith(_COMPRESSIBLE_TYPES),
+        )
+
+    def encoded(self, encoding: str) -> tuple[str, bytes]:
+        """The body in `encoding`, compressed once and kept; identity when that
+        would not be smaller."""
+        if encoding == "identity" or not self.compressible:
+            return "identity", self.body
+        with self._lock:
+            body = self._encoded.get(encoding)
+        if body is None:
+            body = _compress(self.body, encoding)
+            if len(body) >= len(self.body):
+                body = self.body
+            with self._lock:
+                self._encoded[encoding] = body
+        return ("identity", body) if body is self.body else (encoding, body)
+
+    async def send(self, send, *, if_none_match: str, accept_encoding: str) -> None:
+        encoding, body = self.encoded(preferred_encoding(accept_encoding))
+        etag = self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+        headers = [*self.headers, (b"etag", etag.encode("latin-1")), (b"vary", b"Accept-Encoding")]
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if encoding != "identity":
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": self.status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+@dataclass
+class _Entry:
+    response: CachedResponse
+    recorder: _Recorder
+    probe: object
+
+    def is_current(self, probe: object) -> bool:
+        return self.probe == probe and self.recorder.is_current()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = _MAX_ENTRIES, max_bytes: int = _MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, probe: object) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_current(probe):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._drop(key)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry.response
+
+    def put(self, key: tuple, response: CachedResponse, recorder: _Recorder, probe: object) -> None:
+        # Budget the identity body twice: compressed variants are kept alongside it.
+        size = 2 * len(response.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(response, recorder, probe)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: tuple) -> None:
+        self._bytes -= 2 * len(self._entries.pop(key).response.body)
+
+
+_response_cache = ResponseCache()
+
+
+def response_cache() -> ResponseCache:
+    return _response_cache
+
+
+def _request_key(scope, headers: dict[bytes, bytes]) -> tuple | None:
+    """Everything besides content that a cacheable response depends on, or None
+    when this request must always reach its handler."""
+    path = scope.get("path", "")
+    query = scope.get("query_string", b"").decode("latin-1")
+    if any(name in _UNCACHEABLE_PARAMS for name, _ in parse_qsl(query, keep_blank_values=True)):
+        return None
+    if path.startswith("/posts/") and "@" in path[len("/posts/"):].split("/", 1)[0]:
+        return None  # git-ref slugs resolve against refs that move without a file change
+    htmx = tuple(sorted((name, value) for name, value in headers.items() if name.startswith(b"hx-") and name != b"hx-current-url"))
+    session = json.dumps(scope.get("session") or {}, sort_keys=True, default=str)
+    return (path, query, headers.get(b"host", b""), htmx, session)
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app, probe: Callable[[], object] = lambda: None, cache: ResponseCache | None = None):
+        self.app = app
+        self.probe = probe
+        self.cache = cache or response_cache()
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        is_page = path.startswith(PAGE_PREFIXES)
+        if scope["type"] != "http" or scope.get("method") != "GET" or not (is_page or path.startswith(ASSET_PREFIXES)):
+            await self.app(scope, receive, send)
+            return
+        headers = {name.lower(): value for name, value in scope.get("headers", [])}
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+        accept_encoding = headers.get(b"accept-encoding", b"").decode("latin-1")
+        key = _request_key(scope, headers)
+        probe = self.probe() if is_page else None
+        if key is not None:
+            cached = self.cache.get(key, probe)
+            if cached is not None:
+                await cached.send(send, if_none_match=if_none_match, accept_encoding=accept_encoding)
+                return
+
+        start: dict | None = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def capture(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                sent = {name.lower(): value for name, value in message.get("headers", [])}
+                length = sent.get(b"content-length", b"")
+                if (
+                    message["status"] != 200
+                    or not length.isdigit()
+                    or int(length) > _MAX_BODY_BYTES
+                    or b"content-encoding" in sent
+                    or b"set-cookie" in sent
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        with observe_render() as observer:
+            await self.app(scope, receive, capture)
+        if start is None:
+            return
+        response = CachedResponse.from_message(
+            start, b"".join(chunks), default_cache_control=PAGE_CACHE_CONTROL if is_page else None
+        )
+        # Assets are only as fresh as the files they recorded; pages are also guarded by `probe`.
+        if key is not None and observer.cacheable and (is_page or observer.files):
+            self.cache.put(key, response, observer, probe)
+        await response.send(send, if_none_match=if_none_match, accept_encoding=accept_encoding)
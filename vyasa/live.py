@@ -4,15 +4,26 @@ Extensions push resource-change events to open pages without per-second HTTP
 polling. The change source is a transport-agnostic async generator (``watch_path``);
 ``sse_stream`` and ``serve_ws`` are the two deliveries over it. Add a new transport
 by writing another consumer of the same generator -- components never change.
+
+Subscriptions do not each start a watcher. ``PathWatchHub`` keeps one per
+process: while core's reload watcher runs it feeds its change batches in here
+(``attach`` / ``apply_changes``), and only directories it does not cover get a
+single fallback watcher thread. Changes fan out to a one-slot asyncio queue per
+subscription, so a hundred open tabs cost a hundred queue entries, not a
+hundred inotify watch sets.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
-from collections.abc import AsyncIterator, Callable
+import os
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable
 from pathlib import Path
 
+from loguru import logger
+
 from starlette.responses import StreamingResponse
 from starlette.websockets import WebSocketDisconnect
 
@@ -31,30 +42,163 @@ def file_revision(file_path: Path) -> str:
         return "0"
 
 
+class _Subscription:
+    __slots__ = ("loop", "queue")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    def notify(self) -> None:
+        self.loop.call_soon_threadsafe(self._put)
+
+    def _put(self) -> None:
+        try:
+            self.queue.put_nowait(True)
+        except asyncio.QueueFull:
+            pass  # already pending: one wake-up covers any number of changes
+
+
+class PathWatchHub:
+    """One watcher per process, fanned out to every ``watch_path`` subscriber.
+
+    Subscribers are grouped by the directory they watch (a file's parent, as
+    ``awatch`` used to watch, so atomic rename-into-place writes are seen).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_dir: dict[str, set[_Subscription]] = {}
+        self._covers: Callable[[str], bool] | None = None
+        self._thread: threading.Thread | None = None
+        self._stop: threading.Event | None = None
+        self._watched: frozenset[str] = frozenset()
+
+    def subscribe(self, file_path: Path) -> _Subscription:
+        subscription = _Subscription(asyncio.get_running_loop())
+        directory = os.path.abspath(file_path.parent)
+        with self._lock:
+            self._by_dir.setdefault(directory, set()).add(subscription)
+        self._refresh_fallback()
+        return subscription
+
+    def unsubscribe(self, file_path: Path, subscription: _Subscription) -> None:
+        directory = os.path.abspath(file_path.parent)
+        with self._lock:
+            subscribers = self._by_dir.get(directory)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_dir[directory]
+        self._refresh_fallback()
+
+    def attach(self, covers: Callable[[str], bool]) -> None:
+        """A shared watcher now feeds `apply_changes` for every directory `covers` accepts."""
+        with self._lock:
+            self._covers = covers
+        self._refresh_fallback()
+
+    def detach(self) -> None:
+        with self._lock:
+            self._covers = None
+        self._refresh_fallback()
+
+    def apply_changes(self, changes: Iterable[tuple[object, str]]) -> None:
+        """Wake the subscribers of every directory touched by a watcher change batch."""
+        directories = {os.path.dirname(os.path.abspath(path)) for _, path in changes}
+        with self._lock:
+            woken = [subscription for directory in directories for subscription in self._by_dir.get(directory, ())]
+        for subscription in woken:
+            subscription.notify()
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._by_dir.values())
+
+    def _refresh_fallback(self) -> None:
+        with self._lock:
+            covers = self._covers
+            needed = frozenset(
+                directory for directory in self._by_dir if covers is None or not _safe_covers(covers, directory)
+            )
+            if needed == self._watched and (not needed or (self._thread is not None and self._thread.is_alive())):
+                return
+            if self._stop is not None:
+                self._stop.set()  # watch() exits within its poll interval; that thread then ends
+            self._thread = self._stop = None
+            self._watched = needed
+            if not needed:
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(sorted(needed), self._stop), daemon=True)
+            self._thread.start()
+
+    def _run(self, directories: list[str], stop: threading.Event) -> None:
+        from watchfiles import watch
+
+        while not stop.is_set():
+            existing = [directory for directory in directories if os.path.isdir(directory)]
+            if not existing:
+                stop.wait(_HEARTBEAT_SECONDS)
+                continue
+            try:
+                for changes in watch(*existing, debounce=400, recursive=False, stop_event=stop):
+                    self.apply_changes(changes)
+            except OSError as exc:
+                logger.error("live path watcher failed: {}", exc)
+                stop.wait(30)
+
+
+def _safe_covers(covers: Callable[[str], bool], directory: str) -> bool:
+    try:
+        return bool(covers(directory))
+    except Exception:
+        return False
+
+
+_path_watch_hub = PathWatchHub()
+
+
+def path_watch_hub() -> PathWatchHub:
+    return _path_watch_hub
+
+
 async def watch_path(
     file_path: Path,
     *,
     revision: Callable[[Path], str] = file_revision,
+    hub: PathWatchHub | None = None,
 ) -> AsyncIterator[dict]:
     """Yield ``{"type": "change", "revision": ...}`` whenever ``file_path`` changes.
 
-    Emits a ``ready`` event first, then one ``change`` per revision transition.
-    Starlette cancels this generator when the client disconnects. Falls back to a
-    keepalive-only stream when ``watchfiles`` is unavailable.
+    Emits a ``ready`` event first, then one ``change`` per revision transition,
+    with a ``ping`` while idle. Starlette cancels this generator when the client
+    disconnects. Falls back to a keepalive-only stream when ``watchfiles`` is
+    unavailable.
     """
     last = revision(file_path)
     yield {"type": "ready", "revision": last}
     try:
-        from watchfiles import awatch
+        import watchfiles  # noqa: F401
     except ImportError:
         while True:
             await asyncio.sleep(_HEARTBEAT_SECONDS)
             yield {"type": "ping"}
-    async for _changes in awatch(str(file_path.parent)):
-        current = revision(file_path)
-        if current != last:
-            last = current
-            yield {"type": "change", "revision": current}
+    hub = hub or _path_watch_hub
+    subscription = hub.subscribe(file_path)
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(subscription.queue.get(), timeout=_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield {"type": "ping"}
+                continue
+            current = revision(file_path)
+            if current != last:
+                last = current
+                yield {"type": "change", "revision": current}
+    finally:
+        hub.unsubscribe(file_path, subscription)
 
 
 def _encode_sse(event: dict) -> str:
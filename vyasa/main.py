@@ -1,4 +1,5 @@
 from pathlib import Path
+import shutil
 import sys
 import os
 import tempfile
@@ -8,6 +9,7 @@ from importlib.metadata import PackageNotFoundError, version as pkg_version
 from .config import reload_config, theme_preset_for_working_directory
 from .extensions import refresh_extension_runtime
 from .logging import configure_logging
+from .worker_sync import WORKER_SYNC_ENV
 
 _core_app = None
 _browser_url = None
@@ -82,6 +84,8 @@ def build_command():
     parser.add_argument('-o', '--output', help='Output directory (default: ./dist)', default='dist')
     parser.add_argument('--show-hidden', action='store_true', help='Include hidden files and folders in listings')
     parser.add_argument('--feedback', action='store_true', help='Enable the feedback extension')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes for rendering pages (default: CPU count)')
+    parser.add_argument('--clean', action='store_true', help='Ignore the previous build manifest and rebuild every page')
     
     args = parser.parse_args(sys.argv[2:])  # Skip 'vyasa' and 'build'
     if args.show_hidden:
@@ -90,7 +94,7 @@ def build_command():
         os.environ['VYASA_FEEDBACK_CLI'] = 'true'
     
     try:
-        build_static_site(input_dir=args.directory, output_dir=args.output)
+        build_static_site(input_dir=args.directory, output_dir=args.output, jobs=args.jobs, clean=args.clean)
         return 0
     except Exception as e:
         print(f"Error building static site: {e}", file=sys.stderr)
@@ -112,6 +116,7 @@ def cli():
         VYASA_HOST: Server host (default: 127.0.0.1)
         VYASA_PORT: Server port (default: 5001)
         VYASA_RELOAD_SOURCE: Restart server when Vyasa source changes
+        VYASA_WORKERS: Number of server worker processes (default: 1)
         
     Configuration file:
         Create a .vyasa file (TOML format) in your blog directory
@@ -139,6 +144,7 @@ def cli():
     parser.add_argument('directory', nargs='?', help='Path to markdown files directory')
     parser.add_argument('--host', help='Server host (default: 127.0.0.1, use 0.0.0.0 for all interfaces)')
     parser.add_argument('--port', type=int, help='Server port (default: 5001)')
+    parser.add_argument('--workers', type=int, help='Number of server worker processes (default: 1)')
     parser.add_argument('--no-browser', action='store_true', help='Do not open the site in a browser')
     parser.add_argument('--user', help='Login username (overrides config/env)')
     parser.add_argument('--password', help='Login password (overrides config/env)')
@@ -180,6 +186,13 @@ def cli():
     host = args.host or config.get_host()
     port = args.port or config.get_port()
     source_reload_enabled = bool(args.reload_source or config.get_source_reload_enabled())
+    workers = max(1, args.workers or config.get_workers())
+    if workers > 1 and source_reload_enabled:
+        print("Warning: --workers is ignored with source reload; serving from one process")
+        workers = 1
+    if workers > 1 and os.name != 'posix':
+        print("Warning: multiple workers need a POSIX host; serving from one process")
+        workers = 1
     if source_reload_enabled:
         os.environ['VYASA_RELOAD'] = 'true'
     else:
@@ -208,6 +221,8 @@ def cli():
     print(f"Serving at: http://{host}:{port}")
     print(f"Browser reload enabled: {config.get_browser_reload_enabled()}")
     print(f"Source reload enabled: {source_reload_enabled}")
+    if workers > 1:
+        print(f"Workers: {workers}")
     if host == '0.0.0.0':
         print(f"Server accessible from network at: http://<your-ip>:{port}")
 
@@ -230,6 +245,13 @@ def cli():
     source_root = Path(__file__).resolve().parent
     reload_includes = ["*.py", "*.js", "*.css"]
     _ensure_logging_configured()
+    # Workers share one content watcher; the others follow its change batches
+    # over Unix sockets in this directory (see vyasa.worker_sync).
+    sync_dir = tempfile.mkdtemp(prefix="vyasa-workers-") if workers > 1 else None
+    if sync_dir:
+        os.environ[WORKER_SYNC_ENV] = sync_dir
+    else:
+        os.environ.pop(WORKER_SYNC_ENV, None)
     # Force-close lingering connections (e.g. the live-reload SSE stream) after
     # a few seconds so shutdown doesn't hang on graceful shutdown.
     try:
@@ -242,9 +264,13 @@ def cli():
             reload=source_reload_enabled,
             reload_dirs=[str(source_root)] if source_reload_enabled else None,
             reload_includes=reload_includes if source_reload_enabled else None,
+            workers=workers,
         )
     finally:
         os.environ.pop('VYASA_CLI_ROOT', None)
+        if sync_dir:
+            os.environ.pop(WORKER_SYNC_ENV, None)
+            shutil.rmtree(sync_dir, ignore_errors=True)
 
 if __name__ == "__main__":
     cli()
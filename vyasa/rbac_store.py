@@ -1,45 +1,51 @@
 import json
-from dataclasses import dataclass
+from typing import Literal, overload
 
-from fastsql import Database
+from .sqlite_pool import SQLiteDatabase, sqlite_database
 
 
-@dataclass
-class RbacConfigRow:
-    key: str
-    value: str
+def _create_rbac_schema(connection) -> None:
+    connection.execute("CREATE TABLE IF NOT EXISTS rbac_config (key VARCHAR PRIMARY KEY, value VARCHAR)")
 
 
-def get_rbac_table(root_folder, cache, create_if_missing=True):
+@overload
+def get_rbac_db(root_folder, cache, create_if_missing: Literal[True] = True) -> SQLiteDatabase: ...
+
+
+@overload
+def get_rbac_db(root_folder, cache, create_if_missing: bool) -> SQLiteDatabase | None: ...
+
+
+def get_rbac_db(root_folder, cache, create_if_missing: bool = True) -> SQLiteDatabase | None:
     if cache["db"] is None:
         db_path = root_folder / ".vyasa-rbac.db"
         if not create_if_missing and not db_path.exists():
-            return None, None
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        cache["db"] = Database(f"sqlite:///{db_path}")
-        cache["tbl"] = cache["db"].create(RbacConfigRow, pk="key", name="rbac_config")
-    return cache["db"], cache["tbl"]
+            return None
+        cache["db"] = sqlite_database(db_path, _create_rbac_schema)
+    return cache["db"]
 
 
 def load_rbac_cfg(root_folder, cache, normalize):
-    _, tbl = get_rbac_table(root_folder, cache, create_if_missing=False)
-    if tbl is None:
+    db = get_rbac_db(root_folder, cache, create_if_missing=False)
+    if db is None:
         return None
-    rows = tbl()
+    rows = db.query("SELECT key, value FROM rbac_config")
     if not rows:
         return None
     data = {}
     for row in rows:
-        data[row.key] = json.loads(row.value)
+        data[row["key"]] = json.loads(row["value"])
     return normalize(data)
 
 
 def write_rbac_cfg(root_folder, cache, cfg, normalize):
-    _, tbl = get_rbac_table(root_folder, cache)
+    db = get_rbac_db(root_folder, cache)
     cfg = normalize(cfg)
-    existing = {row.key for row in tbl()}
-    for key, value in cfg.items():
-        payload = json.dumps(value, sort_keys=True)
-        tbl.update(key=key, value=payload) if key in existing else tbl.insert(RbacConfigRow(key=key, value=payload))
-    for key in existing - set(cfg.keys()):
-        tbl.delete(key)
+    with db.transaction() as connection:
+        for key, value in cfg.items():
+            db.upsert("rbac_config", {"key": key, "value": json.dumps(value, sort_keys=True)}, conflict=("key",), connection=connection)
+        keys = list(cfg)
+        connection.execute(
+            f"DELETE FROM rbac_config WHERE key NOT IN ({', '.join('?' for _ in keys)})" if keys else "DELETE FROM rbac_config",
+            keys,
+        )
@@ -0,0 +1,118 @@
+"""Slug-to-file resolutions, positive and negative, kept current by the content watcher.
+
+`ContentTree.resolve_document` probes each enabled suffix with `exists()`, and
+the raw-markdown, static, jsx, json and download routes resolve and stat their
+path through `content_path_for_slug`, on every request. Hot documents, crawler
+traffic and 404 storms (one miss probes every suffix) therefore pay several
+syscalls per hit. This memoizes those answers, including "not found".
+
+An answer is only kept while the `_ReloadHub` watcher reports changes in every
+directory it looked at (for a missing path, its nearest existing ancestor),
+and the whole cache is dropped whenever a batch adds or removes anything in
+a covered directory; churn in excluded folders such as `.vyasa-storage` is
+ignored.
+Edits in place cannot change what a slug resolves to and leave it intact.
+Without a watcher every lookup resolves live, as before. A file created or
+deleted is seen once the watcher delivers its batch (its debounce, ~0.4s).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TypeVar, cast
+
+# watchfiles.Change.modified; kept numeric so this module never imports watchfiles.
+_CHANGE_MODIFIED = 2
+_MAX_ENTRIES = 8192
+
+_T = TypeVar("_T")
+
+
+class ResolutionCache:
+    def __init__(self, max_entries: int = _MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, object] = OrderedDict()
+        self._covers: Callable[[str], bool] | None = None
+        self._epoch = 0
+
+    # -- watcher hooks -------------------------------------------------------
+
+    def attach(self, covers: Callable[[str], bool]) -> None:
+        """A watcher (re)started, reporting changes in every directory `covers` accepts."""
+        with self._lock:
+            self._covers = covers
+            self._drop()
+
+    def detach(self) -> None:
+        with self._lock:
+            self._covers = None
+            self._drop()
+
+    def apply_changes(self, changes: Iterable[tuple[int, str]]) -> None:
+        covers = self._covers
+        if covers is None:
+            return
+        # Only a covered directory's entries can back a kept answer (see `get`).
+        if any(change != _CHANGE_MODIFIED and self._covered(covers, os.path.dirname(path)) for change, path in changes):
+            with self._lock:
+                self._drop()
+
+    # -- lookups -------------------------------------------------------------
+
+    def get(self, key: tuple, resolve: Callable[[], tuple[_T, Iterable[Path] | None]]) -> _T:
+        """The memoized answer for `key`, else `resolve()`'s. `resolve` returns
+        `(value, probed_paths)`; the value is kept only if the watcher covers
+        every probed path and no change batch arrived while it ran. Probes of
+        None mean the answer depends on more than the tree and is never kept."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return cast(_T, self._entries[key])  # stored by a resolve for this key
+            covers, epoch = self._covers, self._epoch
+        value, probes = resolve()
+        if covers is None or probes is None or not all(self._observed(covers, directory) for directory in {os.path.dirname(path) for path in probes}):
+            return value
+        with self._lock:
+            if self._epoch == epoch:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _observed(covers: Callable[[str], bool], directory: str) -> bool:
+        """True when the watcher would report a change that makes `directory`'s
+        entries appear or vanish: it watches the directory, or, when that does not
+        exist yet, its nearest existing ancestor."""
+        while not os.path.isdir(directory):
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return False
+            directory = parent
+        return ResolutionCache._covered(covers, directory)
+
+    @staticmethod
+    def _covered(covers: Callable[[str], bool], directory: str) -> bool:
+        try:
+            return bool(covers(directory))
+        except Exception:
+            return False
+
+    def _drop(self) -> None:
+        self._entries.clear()
+        self._epoch += 1
+
+
+_resolution_cache = ResolutionCache()
+
+
+def resolution_cache() -> ResolutionCache:
+    return _resolution_cache
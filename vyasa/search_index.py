@@ -0,0 +1,194 @@
+"""On-disk full-text index over markdown bodies, titles and headings.
+
+Filename search alone cannot find a page by what it says, and the gather view
+used to read every matching file on each request. This keeps one SQLite FTS5
+table per site under `.vyasa-storage/search/`, ranked with BM25 (title and
+headings weigh more than body text) and queried with prefix terms so results
+appear while the user is still typing.
+
+The index is brought up to date lazily, right before a query: the process-wide
+content index (fed by the reload watcher) says whether anything visible moved
+since the last sync, and only files whose (mtime, size) changed are re-read.
+Git-ref roots are not indexed; their search stays filename-only.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from loguru import logger
+
+from .content_index import IndexScope, content_index
+from .helpers import parse_frontmatter_text
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5("
+    "title, headings, body, raw UNINDEXED, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+)
+# bm25() column weights for (title, headings, body, raw).
+_WEIGHTS = (10.0, 4.0, 1.0, 0.0)
+_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_FENCE = re.compile(r"^(```+|~~~+).*?^\1", re.MULTILINE | re.DOTALL)
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _document_fields(path: Path, text: str) -> tuple[str, str, str]:
+    meta, body = parse_frontmatter_text(text, source=str(path))
+    headings = _HEADING.findall(_FENCE.sub("", body))
+    title = str(meta.get("title") or (headings[0] if headings else path.stem))
+    return title, "\n".join(headings), body
+
+
+def _match_expression(query: str) -> str:
+    """Every query word must appear, each as a prefix (`vya` finds `vyasa`)."""
+    return " ".join(f'"{term}"*' for term in _TERM.findall((query or "").lower()))
+
+
+class SearchIndex:
+    def __init__(self, db_path: Path | None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = self._connect(db_path)
+        self._stamps: dict[str, tuple[float, int]] = dict(
+            (path, (mtime, size)) for path, mtime, size in self._conn.execute("SELECT path, mtime, size FROM files")
+        )
+        self._synced: dict[IndexScope, int] = {}
+
+    @staticmethod
+    def _connect(db_path: Path | None) -> sqlite3.Connection:
+        if db_path is not None:
+            try:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+                return conn
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("Search index at {} unavailable ({}); keeping it in memory", db_path, exc)
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        return conn
+
+    def sync(self, scope: IndexScope) -> int:
+        """Re-index what changed in `scope` since the last sync; returns the
+        number of documents written or removed."""
+        generation = content_index().generation(scope)
+        with self._lock:
+            if self._synced.get(scope) == generation:
+                return 0
+        current = {
+            str(entry.path): entry
+            for entry in content_index().entries(scope)
+            if entry.path.suffix.lower() == ".md"
+        }
+        roots = tuple(f"{root}/" for _, root in scope.mounts)
+        with self._lock:
+            gone = [path for path in self._stamps if path not in current and path.startswith(roots)]
+            changed = [entry for path, entry in current.items() if self._stamps.get(path) != (entry.mtime, entry.size)]
+            with self._conn:
+                for path in gone:
+                    self._delete(path)
+                for entry in changed:
+                    self._write(entry.path, entry.mtime, entry.size)
+            self._synced[scope] = generation
+        return len(gone) + len(changed)
+
+    def search(self, query: str, limit: int = 40) -> list[tuple[Path, float]]:
+        """Best BM25 matches as (path, rank); lower rank is better."""
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        weights = ", ".join(str(weight) for weight in _WEIGHTS)
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    f"SELECT files.path, bm25(docs, {weights}) AS rank FROM docs JOIN files ON files.rowid = docs.rowid "
+                    "WHERE docs MATCH ? ORDER BY rank LIMIT ?",
+                    (expression, limit),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return []
+        return [(Path(path), rank) for path, rank in rows]
+
+    def raw_markdown(self, path: Path) -> str | None:
+        """Indexed source of `path`, or None when it is not (or no longer) current."""
+        key = str(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            if self._stamps.get(key) != (stat.st_mtime, stat.st_size):
+                return None
+            row = self._conn.execute(
+                "SELECT docs.raw FROM docs JOIN files ON files.rowid = docs.rowid WHERE files.path = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def __len__(self) -> int:
+        return len(self._stamps)
+
+    def _write(self, path: Path, mtime: float, size: int) -> None:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            self._delete(str(path))
+            return
+        title, headings, body = _document_fields(path, text)
+        key = str(path)
+        row = self._conn.execute("SELECT rowid FROM files WHERE path = ?", (key,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM docs WHERE rowid = ?", row)
+            self._conn.execute("UPDATE files SET mtime = ?, size = ? WHERE rowid = ?", (mtime, size, row[0]))
+            rowid = row[0]
+        else:
+            rowid = self._conn.execute("INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)", (key, mtime, size)).lastrowid
+        self._conn.execute(
+            "INSERT INTO docs (rowid, title, headings, body, raw) VALUES (?, ?, ?, ?, ?)",
+            (rowid, title, headings, body, text),
+        )
+        self._stamps[key] = (mtime, size)
+
+    def _delete(self, path: str) -> None:
+        row = self._conn.execute("SELECT rowid FROM files WHERE path = ?", (path,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM docs WHERE rowid = ?", row)
+            self._conn.execute("DELETE FROM files WHERE rowid = ?", row)
+        self._stamps.pop(path, None)
+
+
+_search_indexes: dict[str, SearchIndex] = {}
+_search_indexes_lock = threading.Lock()
+
+
+def search_index() -> SearchIndex:
+    """The site's index, stored beside other extension data in `.vyasa-storage`."""
+    from .config import get_config
+
+    db_path = get_config().get_root_folder().resolve() / ".vyasa-storage" / "search" / "index.sqlite3"
+    with _search_indexes_lock:
+        index = _search_indexes.get(str(db_path))
+        if index is None:
+            index = _search_indexes[str(db_path)] = SearchIndex(db_path)
+        return index
+
+
+def disk_search_scope(roots, show_hidden: bool = False) -> IndexScope | None:
+    """Scope covering the on-disk roots among `roots` (git-ref roots are skipped)."""
+    from .config import get_config
+
+    mounts = tuple((alias, root.resolve()) for alias, root in roots if isinstance(root, Path))
+    if not mounts:
+        return None
+    return IndexScope(
+        mounts=mounts,
+        show_hidden=bool(show_hidden),
+        excluded_dirs=frozenset(get_config().get_reload_excludes()),
+        suffixes=(".md",),
+    )
@@ -1,8 +1,18 @@
 import html
+from pathlib import Path
 
 from fasthtml.common import *
 from monsterui.all import *
 from .helpers import content_slug_for_path, content_url_for_slug, document_kind_for_suffix
+from .search_index import search_index
+
+
+def _indexed_markdown(item):
+    """Source text from the search index when it is current, else from disk."""
+    cached = search_index().raw_markdown(item) if isinstance(item, Path) else None
+    if cached is not None:
+        return cached
+    return item.read_text(encoding="utf-8") if item.exists() else ""
 
 
 def gather_search_content(query, matches, regex_error, root):
@@ -19,7 +29,7 @@ def gather_search_content(query, matches, regex_error, root):
             sections.extend([H2(rel, cls="text-xl font-semibold mb-2"), P("PDF file: ", A(rel, href=pdf_href, cls="text-blue-600 hover:underline"), cls="text-sm text-slate-600 dark:text-slate-300"), (Hr(cls="my-6 border-slate-200 dark:border-slate-800") if idx < len(matches) - 1 else None)])
             copy_parts.append(f"\n---\n\n## {rel}\n\n[PDF file]({pdf_href})\n")
             continue
-        raw_md = item.read_text(encoding="utf-8") if item.exists() else ""
+        raw_md = _indexed_markdown(item)
         sections.extend([H2(rel, cls="text-xl font-semibold mb-2"), Pre(html.escape(raw_md), cls="text-xs font-mono whitespace-pre-wrap text-slate-700 dark:text-slate-300"), (Hr(cls="my-6 border-slate-200 dark:border-slate-800") if idx < len(matches) - 1 else None)])
         copy_parts.append(f"\n---\n\n## {rel}\n\n{raw_md}\n")
     copy_text = "".join(copy_parts)
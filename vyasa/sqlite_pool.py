@@ -0,0 +1,235 @@
+"""Pooled SQLite access shared by the feedback, annotations, bookmarks and RBAC stores.
+
+The stores used to open a fresh connection (or a SQLAlchemy engine round-trip)
+per operation and upsert with a SELECT followed by INSERT/UPDATE. Under bursts
+of comments that connection churn and the extra round-trips bound write
+throughput. A `SQLiteDatabase` instead keeps one WAL-mode connection per
+thread, each with a large prepared-statement cache, and offers:
+
+- `query` / `execute` on the calling thread's connection;
+- `transaction()` for several statements in one commit;
+- `upsert()` as a single `INSERT ... ON CONFLICT DO UPDATE`;
+- `write(fn)` for group commit: concurrent writers queue their work and
+  whichever gets the write lock first commits the whole queue in one
+  transaction, each item under its own savepoint so one failure does not
+  undo the others.
+
+Use `sqlite_database(path, setup)` to share one pool per database file.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+_STATEMENT_CACHE_SIZE = 256
+
+
+class _PendingWrite:
+    __slots__ = ("fn", "done", "result", "error")
+
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any]):
+        self.fn = fn
+        self.done = False
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SQLiteDatabase:
+    def __init__(
+        self,
+        path: Path,
+        setup: Callable[[sqlite3.Connection], None] | None = None,
+        *,
+        timeout: float = 5.0,
+    ):
+        self.path = path
+        self.timeout = timeout
+        self._setup = setup
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._queue: list[_PendingWrite] = []
+        self._queue_lock = threading.Lock()
+        self._upserts: dict[tuple, str] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's pooled connection, opened (and the schema set up) on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        self._ensure_setup(connection)
+        self._local.connection = connection
+        with self._connections_lock:
+            self._prune_dead_threads()
+            self._connections[threading.get_ident()] = connection
+        return connection
+
+    def query(self, sql: str, params: Sequence | Mapping = ()) -> list[sqlite3.Row]:
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence | Mapping = ()) -> sqlite3.Row | None:
+        return self.connection().execute(sql, params).fetchone()
+
+    def execute(self, sql: str, params: Sequence | Mapping = ()) -> sqlite3.Cursor:
+        """Run one statement in its own transaction (autocommit)."""
+        connection = self.connection()
+        if connection.in_transaction:
+            return connection.execute(sql, params)
+        with self.transaction() as connection:
+            return connection.execute(sql, params)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit everything run on the yielded connection at once; nested use joins the outer transaction."""
+        connection = self.connection()
+        if connection.in_transaction:
+            yield connection
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
+    def upsert(
+        self,
+        table: str,
+        row: Mapping[str, Any],
+        conflict: Sequence[str],
+        update: Iterable[str] | None = None,
+        *,
+        connection: sqlite3.Connection | None = None,
+    ) -> None:
+        """`INSERT ... ON CONFLICT(conflict) DO UPDATE` for `row` (all non-key columns by default),
+        on `connection` when given (e.g. inside `write`), else in its own transaction."""
+        columns = tuple(row)
+        updates = tuple(update) if update is not None else tuple(column for column in columns if column not in conflict)
+        key = (table, columns, tuple(conflict), updates)
+        sql = self._upserts.get(key)
+        if sql is None:
+            action = (
+                "DO UPDATE SET " + ", ".join(f"{column} = excluded.{column}" for column in updates)
+                if updates
+                else "DO NOTHING"
+            )
+            sql = self._upserts[key] = (
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT({', '.join(conflict)}) {action}"
+            )
+        params = tuple(row[column] for column in columns)
+        if connection is not None:
+            connection.execute(sql, params)
+        else:
+            self.execute(sql, params)
+
+    def write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run `fn(connection)` in a group commit with any other writes queued meanwhile."""
+        connection = self.connection()
+        if connection.in_transaction:
+            return fn(connection)  # already inside `transaction()`: join it
+        pending = _PendingWrite(fn)
+        with self._queue_lock:
+            self._queue.append(pending)
+        with self._write_lock:
+            if not pending.done:
+                with self._queue_lock:
+                    batch, self._queue = self._queue, []
+                self._commit_batch(batch)
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def close(self) -> None:
+        """Close every pooled connection; threads reopen lazily on next use."""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _commit_batch(self, batch: list[_PendingWrite]) -> None:
+        connection = self.connection()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+        except BaseException as exc:
+            for pending in batch:
+                pending.error, pending.done = exc, True
+            return
+        try:
+            for pending in batch:
+                connection.execute("SAVEPOINT vyasa_write")
+                try:
+                    pending.result = pending.fn(connection)
+                except Exception as exc:
+                    connection.execute("ROLLBACK TO vyasa_write")
+                    pending.error = exc
+                connection.execute("RELEASE vyasa_write")
+            connection.commit()
+        except BaseException as exc:
+            if connection.in_transaction:
+                connection.rollback()
+            for pending in batch:
+                if pending.error is None:
+                    pending.error = exc
+            raise
+        finally:
+            for pending in batch:
+                pending.done = True
+
+    def _ensure_setup(self, connection: sqlite3.Connection) -> None:
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            if self._setup is not None:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    self._setup(connection)
+                except BaseException:
+                    connection.rollback()
+                    raise
+                connection.commit()
+            self._initialized = True
+
+    def _prune_dead_threads(self) -> None:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._connections if ident not in alive]:
+            self._connections.pop(ident).close()
+
+
+_databases: dict[str, SQLiteDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def sqlite_database(path: Path, setup: Callable[[sqlite3.Connection], None] | None = None) -> SQLiteDatabase:
+    """The process-wide pool for `path` (the first caller's `setup` creates the schema)."""
+    key = str(Path(path).resolve())
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = SQLiteDatabase(Path(path), setup)
+        return database
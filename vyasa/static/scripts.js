@@ -1,4 +1,5 @@
 import { createMomentumRunner, ensureFloatingActions, ensureShortcutHelp, headingMarkdownCopyValue, isEditableShortcutEvent, registerFloatingActionSync, registerMarkdownHydrator, shortcutsSuspended, syncFloatingActions } from '/static/page_shell.js';
+import { initVirtualTrees } from '/static/sidebar_tree.js';
 
 function switchTab(tabsId, index) {
     const container = document.querySelector(`.tabs-container[data-tabs-id="${tabsId}"]`);
@@ -2415,6 +2416,7 @@ document.addEventListener('DOMContentLoaded', () => {
     window.__vyasaInitSearchClearButtons?.(document);
     ensurePdfFocusState();
     initTabPanelHeights(document);
+    initVirtualTrees(document);
     normalizeCriticalTextColors(document);
     recordStyleProbe('domcontentloaded');
     [100, 500, 1500].forEach((ms) => setTimeout(() => recordStyleProbe(`t+${ms}`), ms));
@@ -2452,6 +2454,7 @@ document.body.addEventListener('htmx:afterSwap', (event) => {
     window.__vyasaInitSearchClearButtons?.(event.target);
     ensurePdfFocusState();
     initTabPanelHeights(event.target || document);
+    initVirtualTrees(event.target || document);
     if (event.target.id === 'posts-sidebar') {
         window.__vyasaPendingPostsSidebarState = null;
     }
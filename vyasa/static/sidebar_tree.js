@@ -0,0 +1,140 @@
+// Virtualized posts-tree branch for folders too large to send as server-rendered
+// rows. The server embeds the folder's first level as JSON (see
+// `_virtual_branch` in sidebar_routes.py); deeper folders come from
+// /api/sidebar/tree when expanded. Only the rows in and just around the scroll
+// viewport exist in the DOM, so a folder of thousands of notes costs a few dozen
+// nodes.
+
+const ROW_HEIGHT = 28;
+const OVERSCAN = 8;
+const VIEWPORT_ROWS = 24;
+const LINK_CLASSES = 'vyasa-tree-link inline-flex items-center min-w-0 whitespace-nowrap vyasa-tree-row vyasa-tree-row-shell post-link';
+
+function levelRows(entries, depth) {
+    return entries.map((entry) => ({ entry, depth, open: false, loading: false }));
+}
+
+async function fetchLevel(src, path) {
+    try {
+        const response = await fetch(`${src}?path=${encodeURIComponent(path)}`, { headers: { Accept: 'application/json' } });
+        if (!response.ok) return [];
+        return (await response.json()).entries || [];
+    } catch (error) {
+        return [];
+    }
+}
+
+function iconSpan(name) {
+    const span = document.createElement('span');
+    span.className = 'w-4 mr-2 flex items-center justify-center shrink-0';
+    const icon = document.createElement('uk-icon');
+    icon.setAttribute('icon', name);
+    icon.className = 'text-current w-4 h-4';
+    span.append(icon);
+    return span;
+}
+
+function entryLink(entry, label) {
+    const link = document.createElement('a');
+    link.className = LINK_CLASSES;
+    link.href = entry.href;
+    link.dataset.path = entry.slug;
+    link.setAttribute('hx-get', entry.href);
+    link.setAttribute('hx-target', '#main-content');
+    link.setAttribute('hx-push-url', 'true');
+    link.setAttribute('hx-swap', 'outerHTML show:window:top settle:0.1s');
+    link.append(label);
+    return link;
+}
+
+function rowElement(row, index, onToggle) {
+    const { entry, depth } = row;
+    const element = document.createElement('div');
+    element.className = 'vyasa-virtual-tree-row flex items-center';
+    element.style.cssText = `position:absolute;left:0;right:0;top:${index * ROW_HEIGHT}px;height:${ROW_HEIGHT}px;padding-left:${depth * 16}px;`;
+    const label = document.createElement('span');
+    label.className = 'whitespace-nowrap';
+    label.title = entry.title;
+    label.textContent = entry.title;
+    if (entry.kind !== 'folder') {
+        const gap = document.createElement('span');
+        gap.className = 'w-4 mr-2 shrink-0';
+        const link = entryLink(entry, label);
+        link.prepend(gap, iconSpan(entry.icon));
+        element.append(link);
+        return element;
+    }
+    const toggle = document.createElement('button');
+    toggle.type = 'button';
+    toggle.className = 'vyasa-virtual-tree-toggle flex items-center shrink-0 mr-2';
+    toggle.setAttribute('aria-expanded', String(row.open));
+    toggle.setAttribute('aria-label', `${row.open ? 'Collapse' : 'Expand'} ${entry.title}`);
+    const chevron = document.createElement('span');
+    chevron.className = 'folder-chevron';
+    if (row.open) chevron.style.transform = 'rotate(45deg)';
+    toggle.append(chevron);
+    toggle.addEventListener('click', (event) => {
+        event.preventDefault();
+        onToggle(row);
+    });
+    element.append(toggle, iconSpan('folder'));
+    element.append(entry.href ? entryLink(entry, label) : label);
+    return element;
+}
+
+export function mountVirtualTree(container) {
+    if (container.dataset.virtualTreeReady === 'true') return;
+    container.dataset.virtualTreeReady = 'true';
+    const payload = JSON.parse(container.querySelector('script[type="application/json"]')?.textContent || '{}');
+    const src = container.dataset.treeSrc || '/api/sidebar/tree';
+    let rows = levelRows(payload.entries || [], 0);
+
+    const viewport = document.createElement('div');
+    viewport.className = 'vyasa-virtual-tree-viewport';
+    viewport.style.cssText = `position:relative;overflow-y:auto;max-height:${VIEWPORT_ROWS * ROW_HEIGHT}px;`;
+    const spacer = document.createElement('div');
+    spacer.style.position = 'relative';
+    viewport.append(spacer);
+    container.append(viewport);
+
+    let frame = 0;
+    const render = () => {
+        frame = 0;
+        spacer.style.height = `${rows.length * ROW_HEIGHT}px`;
+        const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        const last = Math.min(rows.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+        spacer.replaceChildren(...rows.slice(first, last).map((row, offset) => rowElement(row, first + offset, toggle)));
+        window.htmx?.process(spacer);
+    };
+    const schedule = () => {
+        if (!frame) frame = window.requestAnimationFrame(render);
+    };
+
+    async function toggle(row) {
+        const index = rows.indexOf(row);
+        if (index < 0 || row.loading) return;
+        if (row.open) {
+            let end = index + 1;
+            while (end < rows.length && rows[end].depth > row.depth) end += 1;
+            rows.splice(index + 1, end - index - 1);
+            row.open = false;
+            schedule();
+            return;
+        }
+        row.loading = true;
+        const children = await fetchLevel(src, row.entry.slug);
+        row.loading = false;
+        const at = rows.indexOf(row);
+        if (at < 0 || row.open) return;
+        rows.splice(at + 1, 0, ...levelRows(children, row.depth + 1));
+        row.open = true;
+        schedule();
+    }
+
+    viewport.addEventListener('scroll', schedule, { passive: true });
+    render();
+}
+
+export function initVirtualTrees(root = document) {
+    root.querySelectorAll?.('[data-virtual-tree="true"]').forEach(mountVirtualTree);
+}
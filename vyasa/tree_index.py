@@ -0,0 +1,157 @@
+"""Persistent index of ordered folder listings and document titles.
+
+Each `ContentTree` level used to `iterdir` the folder, probe it again for
+folder notes and index files, re-read the `.vyasa` chain to filter and order
+the result, and parse every document's frontmatter for its title: on every
+request that built a new tree, and from scratch after every restart. This
+keeps both results in one SQLite file under `.vyasa-storage/tree/`, so they
+survive restarts and are shared by every worker:
+
+- a listing is keyed by the tree's scope (mounts and visibility knobs) and the
+  folder, and stamped with the folder's mtime, the mtimes of its own and the
+  root's `.vyasa`, and those of its `.kg` children (whose `kg.schema` decides
+  whether they are documents). Adding, removing or renaming an entry moves the
+  folder's mtime; editing a `.vyasa` moves its own. Folders sorted by `mtime`
+  or `created` depend on every child's stat and are always listed live;
+- a title is keyed by path and abbreviations and stamped with (mtime, size).
+
+Stamps younger than `_RACY_SECONDS` are never stored. Filesystem timestamps are
+coarser than the edits that can follow a read, so a folder changed twice within
+one tick would otherwise look unchanged (git's "racy clean" rule).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from .sqlite_pool import sqlite_database
+
+def _create_schema(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS listings (scope TEXT NOT NULL, folder TEXT NOT NULL, stamp TEXT NOT NULL, "
+        "paths TEXT NOT NULL, PRIMARY KEY (scope, folder))"
+    )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS titles (path TEXT NOT NULL, abbreviations TEXT NOT NULL, mtime REAL NOT NULL, "
+        "size INTEGER NOT NULL, title TEXT NOT NULL, PRIMARY KEY (path, abbreviations))"
+    )
+
+
+_RACY_SECONDS = 2.0
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def folder_stamp(folder: Path, root: Path) -> tuple[int, int, int]:
+    """What a folder's listing depends on besides its `.kg` children: its own
+    mtime and those of its and the root's `.vyasa`. Raises OSError when the
+    folder is gone."""
+    return (folder.stat().st_mtime_ns, _mtime_ns(folder / ".vyasa"), _mtime_ns(root / ".vyasa"))
+
+
+def listing_scope(root: Path, mounts, show_hidden: bool, excluded_dirs, suffixes, ignore_primary_root: bool) -> str:
+    """Stable key for everything besides the folder itself that shapes a listing."""
+    raw = json.dumps(
+        [str(root), [[alias, str(path)] for alias, path in mounts], bool(show_hidden), sorted(excluded_dirs), list(suffixes), bool(ignore_primary_root)]
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+def _settled(*mtimes_ns: int) -> bool:
+    return time.time_ns() - max(mtimes_ns, default=0) >= _RACY_SECONDS * 1e9
+
+
+class TreeIndex:
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._db = sqlite_database(db_path, _create_schema)
+        try:
+            # Create the file up front: it usually sits inside the content root,
+            # whose mtime stamps the root's listing.
+            self._db.connection()
+        except (sqlite3.Error, OSError) as exc:
+            logger.warning("Tree index at {} unavailable ({}); listings and titles are recomputed", db_path, exc)
+        # Decoded rows, so repeat lookups skip SQLite and JSON parsing.
+        self._listings: dict[tuple[str, str], tuple[list, list[str]]] = {}
+        self._titles: dict[tuple[str, str], tuple[float, int, str]] = {}
+
+    def listing(self, scope: str, folder: Path, stamp: tuple[int, int, int]) -> list[Path] | None:
+        """The stored ordered children of `folder`, or None when missing or stale."""
+        key = (scope, str(folder))
+        cached = self._listings.get(key)
+        if cached is None:
+            row = self._read("SELECT stamp, paths FROM listings WHERE scope = ? AND folder = ?", key)
+            if row is None:
+                return None
+            cached = self._listings[key] = (json.loads(row[0]), json.loads(row[1]))
+        stored, paths = cached
+        if stored[:3] != list(stamp) or any(_mtime_ns(Path(pack)) != mtime for pack, mtime in stored[3]):
+            return None
+        return [Path(path) for path in paths]
+
+    def store_listing(self, scope: str, folder: Path, stamp: tuple[int, int, int], paths: list[Path], packs: list[Path]) -> None:
+        pack_stamps = [[str(pack), _mtime_ns(pack)] for pack in packs]
+        if not _settled(*stamp, *(mtime for _, mtime in pack_stamps)):
+            return
+        stored = [*stamp, pack_stamps]
+        names = [str(path) for path in paths]
+        self._listings[(scope, str(folder))] = (stored, names)
+        self._write("listings", {"scope": scope, "folder": str(folder), "stamp": json.dumps(stored), "paths": json.dumps(names)}, ("scope", "folder"))
+
+    def title(self, path: Path, mtime: float, size: int, abbreviations=None) -> str | None:
+        key = (str(path), json.dumps(abbreviations))
+        cached = self._titles.get(key)
+        if cached is None:
+            row = self._read("SELECT mtime, size, title FROM titles WHERE path = ? AND abbreviations = ?", key)
+            if row is None:
+                return None
+            cached = self._titles[key] = tuple(row)
+        return cached[2] if cached[:2] == (mtime, size) else None
+
+    def store_title(self, path: Path, mtime: float, size: int, abbreviations, title: str) -> None:
+        if not _settled(int(mtime * 1e9)):
+            return
+        key = (str(path), json.dumps(abbreviations))
+        self._titles[key] = (mtime, size, title)
+        self._write("titles", {"path": key[0], "abbreviations": key[1], "mtime": mtime, "size": size, "title": title}, ("path", "abbreviations"))
+
+    def _read(self, sql: str, params) -> sqlite3.Row | None:
+        try:
+            return self._db.query_one(sql, params)
+        except (sqlite3.Error, OSError):
+            return None
+
+    def _write(self, table: str, row: dict, conflict: tuple[str, ...]) -> None:
+        # Another worker may hold the write lock; the in-memory copy still serves this one.
+        try:
+            self._db.upsert(table, row, conflict)
+        except (sqlite3.Error, OSError) as exc:
+            logger.debug("tree index write skipped: {}", exc)
+
+
+_tree_indexes: dict[str, TreeIndex] = {}
+_tree_indexes_lock = threading.Lock()
+
+
+def tree_index() -> TreeIndex:
+    """The site's index, stored beside other data in `.vyasa-storage`."""
+    from .config import get_config
+
+    db_path = get_config().get_root_folder().resolve() / ".vyasa-storage" / "tree" / "index.sqlite3"
+    with _tree_indexes_lock:
+        index = _tree_indexes.get(str(db_path))
+        if index is None:
+            index = _tree_indexes[str(db_path)] = TreeIndex(db_path)
+        return index
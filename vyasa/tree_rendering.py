@@ -1,4 +1,5 @@
 import time
+from pathlib import Path
 from urllib.parse import quote
 
 from fasthtml.common import A, Button, Details, Li, Span, Summary, Ul
@@ -139,3 +140,71 @@ def build_post_tree_render(folder, roles=None, max_depth=None, active_parts=(),
         items.append(Li(_decorate_row(link, slug, title, row_decorators)))
     logger.debug(f"[DEBUG] build_post_tree for {content_slug_for_path(folder, strip_suffix=False) or '.'} completed in {(time.time() - start_time) * 1000:.2f}ms")
     return items
+
+
+def visible_folder_paths(paths, roles=None, *, slug_for_path, is_allowed_fn, rbac_rules):
+    """Folders (resolved path strings) holding a `.vyasa` or a document `roles` may
+    read, at any depth. One pass over the content index instead of probing each
+    folder's descendants as `folder_has_visible_descendant` does."""
+    visible = set()
+    for path in paths:
+        if path.name != ".vyasa":
+            slug = slug_for_path(path)
+            if not slug or not is_allowed_fn(f"/posts/{slug}", roles or [], rbac_rules):
+                continue
+        for parent in path.parents:
+            key = str(parent)
+            if key in visible:
+                break  # ancestors were marked with it
+            visible.add(key)
+    return frozenset(visible)
+
+
+@traced("tree")
+def build_post_tree_level_render(folder, roles=None, *, root, show_hidden, excluded_dirs, get_nav_entries, effective_abbreviations, should_exclude_dir_fn, slug_to_title_fn, find_folder_note_file_fn, is_allowed_fn, rbac_rules, title_for_path, visible_folders):
+    """One level of the posts tree as JSON-ready rows, visibility resolved.
+
+    The rows `build_post_tree_render(max_depth=0)` would draw, minus the markup:
+    titles come from the content index rather than a frontmatter parse per row,
+    and folders are kept or dropped by a `visible_folder_paths` lookup.
+    """
+    rows = []
+    try:
+        entries = get_nav_entries(folder, root, show_hidden, excluded_dirs)
+        abbreviations = effective_abbreviations(root, folder)
+    except (OSError, PermissionError):
+        return rows
+    folder_note_file = find_folder_note_file_fn(folder)
+    for item in entries:
+        if item.is_dir() and not is_document_path(item):
+            if should_exclude_dir_fn(item.name, excluded_dirs) or (not show_hidden and item.name.startswith(".")):
+                continue
+            rel_folder = content_slug_for_path(item, strip_suffix=False)
+            if not rel_folder:
+                continue
+            # Git-ref mounts and symlinked folders are not in the index; keep them like the HTML tree does.
+            indexed = isinstance(item, Path) and not item.is_symlink()
+            if indexed and str(item.resolve()) not in visible_folders:
+                continue
+            note_file = find_folder_note_file_fn(item)
+            note_slug = content_slug_for_path(note_file) if note_file else None
+            note_allowed = bool(note_slug and is_allowed_fn(f"/posts/{note_slug}", roles or [], rbac_rules))
+            title = slug_to_title_fn(item.name, abbreviations=abbreviations)
+            href = content_url_for_slug(note_slug) if note_slug and note_allowed else ""
+            rows.append({"kind": "folder", "slug": rel_folder, "title": title, "href": href, "icon": "folder"})
+            continue
+        if item.suffix not in enabled_document_suffixes():
+            continue
+        if folder_note_file and item.resolve() == folder_note_file.resolve():
+            continue
+        slug = content_slug_for_path(item)
+        if not slug or not is_allowed_fn(f"/posts/{slug}", roles or [], rbac_rules):
+            continue
+        rows.append({
+            "kind": item.suffix.lstrip("."),
+            "slug": slug,
+            "title": title_for_path(item),
+            "href": content_url_for_slug(slug),
+            "icon": document_icon_for_path(item),
+        })
+    return rows
@@ -20,4 +20,4 @@ def get_tree_entries(folder: Path, root: Path, show_hidden: bool, excluded_dirs:
         mounts=runtime_mounts,
         ignore_primary_root=folder == root and root == runtime_root and cfg.get_ignore_cwd_as_root(),
     )
-    return [entry.path for entry in tree.list_entries_for_path(folder)]
+    return tree.list_paths_for_path(folder)
@@ -0,0 +1,209 @@
+"""Change broadcast between the worker processes of `vyasa --workers N`.
+
+With several uvicorn workers every process has its own content index,
+fingerprint-keyed lru_caches and live-reload subscribers. Running the
+`_ReloadHub` watcher in each of them would multiply the watch set by N (the
+inotify exhaustion the hub exists to avoid), and a worker without one falls
+back to a full rescan on every fingerprint read. Instead one worker, whichever
+holds the `watcher` lock, runs the watcher and sends each change batch as a
+datagram to a Unix socket per worker. Followers apply the batch exactly as the
+leader does, so the same edit moves every worker's index to a new generation
+and every cache keyed on it misses together. The lock is an `flock`, released
+by the kernel when its holder exits, so a surviving worker takes over.
+
+A follower binds its socket before it scans, so nothing published during the
+scan is lost. Every datagram carries its sender and a sequence number, and
+the leader records the last one it published in `watcher.seq`. A follower
+that sees a gap, a new sender, or a recorded number it never received (a
+send that failed or timed out) stops following so its hub re-attaches and
+rescans.
+
+`claim` also serves one-per-deployment jobs such as the in-process git fetcher.
+The CLI creates the shared directory and passes it in `VYASA_WORKER_SYNC`; a
+single-process server never touches this module.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import socket
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from loguru import logger
+
+WORKER_SYNC_ENV = "VYASA_WORKER_SYNC"
+WATCHER_LOCK = "watcher"
+_SEQUENCE_FILE = "watcher.seq"
+# Well under the default Unix datagram limit on Linux and macOS.
+_MAX_DATAGRAM = 48_000
+_POLL_SECONDS = 1.0
+_SEND_TIMEOUT = 2.0
+
+
+def _datagrams(changes: Iterable[tuple[object, str]]) -> Iterator[bytes]:
+    """JSON-encode a change batch, split so each datagram stays under the size limit."""
+    chunk: list[str] = []
+    size = 2
+    for change, path in changes:
+        item = json.dumps([int(change), str(path)])
+        if chunk and size + len(item) + 1 > _MAX_DATAGRAM:
+            yield ("[" + ",".join(chunk) + "]").encode()
+            chunk, size = [], 2
+        chunk.append(item)
+        size += len(item) + 1
+    if chunk:
+        yield ("[" + ",".join(chunk) + "]").encode()
+
+
+class WorkerSync:
+    def __init__(self, directory: Path, name: str | None = None):
+        self.directory = Path(directory)
+        self.socket_path = self.directory / f"{name or f'worker-{os.getpid()}'}.sock"
+        self._claims: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._receiver: socket.socket | None = None
+        self._heard: tuple[str, int] | None = None  # last (sender, sequence) applied
+
+    def claim(self, name: str) -> bool:
+        """Take the deployment-wide lock `name` if no other worker holds it.
+
+        Held until `release` or process exit; claiming a lock this worker
+        already holds returns True.
+        """
+        import fcntl  # POSIX only; the CLI never enables workers elsewhere
+
+        with self._lock:
+            if name in self._claims:
+                return True
+            fd = os.open(self.directory / f"{name}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._claims[name] = fd
+            return True
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            fd = self._claims.pop(name, None)
+        if fd is not None:
+            os.close(fd)  # closing the only descriptor drops the flock
+
+    def publish(self, changes: Iterable[tuple[object, str]]) -> int:
+        """Send a watcher change batch to every other worker; returns how many received it."""
+        peers = [peer for peer in self.directory.glob("*.sock") if peer != self.socket_path]
+        sender_name = self.socket_path.stem
+        datagrams = []
+        for chunk in _datagrams(changes):
+            self._sequence += 1
+            datagrams.append(f'{{"sender":{json.dumps(sender_name)},"seq":{self._sequence},"changes":'.encode() + chunk + b"}")
+        delivered = 0
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.settimeout(_SEND_TIMEOUT)
+            for peer in peers:
+                try:
+                    for datagram in datagrams:
+                        sender.sendto(datagram, str(peer))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    peer.unlink(missing_ok=True)  # its worker exited without cleaning up
+                    continue
+                except OSError as exc:
+                    logger.warning("worker sync: could not notify {}: {}", peer.name, exc)
+                    continue
+                delivered += 1
+        # After sending, so a follower that reads it has every delivered datagram queued.
+        self._record_sequence(sender_name)
+        return delivered
+
+    def listen(self) -> socket.socket:
+        """Bind this worker's socket, if not bound yet. Call before scanning:
+        batches published from then on queue up until `follow` reads them."""
+        if self._receiver is None:
+            receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.socket_path.unlink(missing_ok=True)
+            receiver.bind(str(self.socket_path))
+            receiver.settimeout(_POLL_SECONDS)
+            self._receiver = receiver
+            self._heard = self._published()  # anything earlier predates the scan
+        return self._receiver
+
+    def close(self) -> None:
+        if self._receiver is not None:
+            self._receiver.close()
+            self._receiver = None
+            self.socket_path.unlink(missing_ok=True)
+        self._heard = None
+
+    def follow(self, stop: threading.Event, lead: str = WATCHER_LOCK) -> Iterator[list[list]]:
+        """Yield change batches published by other workers.
+
+        Returns when `stop` is set, when this worker claims `lead` (its holder
+        exited) and should start watching itself, or when a batch was missed.
+        The caller should then re-attach, rescanning. The socket stays bound
+        across a missed batch, so the rescan loses nothing either.
+        """
+        receiver = self.listen()
+        while not stop.is_set():
+            if self.claim(lead):
+                self.close()
+                return
+            try:
+                datagram = receiver.recv(_MAX_DATAGRAM * 2)
+            except socket.timeout:
+                published = self._published()
+                behind = published is not None and (self._heard is None or self._missed(*published))
+                if not behind or select.select([receiver], [], [], 0)[0]:
+                    continue
+                logger.info("worker sync: a batch from {} never arrived; rescanning", published[0])
+                self._heard = published
+                return
+            message = json.loads(datagram)
+            missed = self._missed(message["sender"], message["seq"] - 1)
+            if self._heard is None or missed or message["seq"] > self._heard[1]:
+                self._heard = (message["sender"], message["seq"])
+            if missed:
+                logger.info("worker sync: missed a batch from {}; rescanning", message["sender"])
+                return
+            yield message["changes"]
+
+    def _missed(self, sender: str, sequence: int) -> bool:
+        """Whether (sender, sequence) was published but never applied here."""
+        if self._heard is None:
+            return False
+        heard_sender, heard_sequence = self._heard
+        return sender != heard_sender or sequence > heard_sequence
+
+    def _published(self) -> tuple[str, int] | None:
+        try:
+            sender, sequence = (self.directory / _SEQUENCE_FILE).read_text().split()
+            return sender, int(sequence)
+        except (OSError, ValueError):
+            return None
+
+    def _record_sequence(self, sender: str) -> None:
+        path = self.directory / _SEQUENCE_FILE
+        temp = path.with_name(f"{path.name}.{os.getpid()}")
+        try:
+            temp.write_text(f"{sender} {self._sequence}")
+            os.replace(temp, path)
+        except OSError as exc:
+            logger.warning("worker sync: could not record the batch sequence: {}", exc)
+
+_worker_sync: WorkerSync | None = None
+
+
+def worker_sync() -> WorkerSync | None:
+    """This worker's handle on the shared sync directory, or None when serving single-process."""
+    global _worker_sync
+    directory = os.environ.get(WORKER_SYNC_ENV)
+    if not directory:
+        return None
+    if _worker_sync is None or _worker_sync.directory != Path(directory):
+        _worker_sync = WorkerSync(Path(directory))
+    return _worker_sync
@@ -0,0 +1,296 @@
+"""Uncommitted paths of working clones, maintained incrementally.
+
+The sidebar's uncommitted dots and the draft banner on every page asked
+`porcelain.status` for the whole tree: every tracked file stat-compared
+against the index, the working tree walked for untracked files. That ran
+whenever a five-second bucket expired, stalling whichever request came first
+by seconds on large repositories. A `WorktreeStatus` takes that full scan
+once and then keeps its dirty set current from:
+
+- the `_ReloadHub` watcher's change batches: only the reported paths are
+  re-checked, against the index's stat data, and a file is re-hashed only when
+  its stat no longer matches its index entry;
+- the git index and HEAD, re-stat'ed at most every `_GIT_RECHECK_SECONDS`:
+  after `git add`, a commit or a checkout, only the index entries that changed
+  and the paths that differ between the old and new HEAD trees are re-checked.
+
+Paths the watcher does not cover (hidden or excluded folders) keep whatever
+the last full scan said; only content paths are ever displayed. Editing a
+`.gitignore` or (re)starting the watcher takes a new full scan. Without a
+watcher, `paths()` scans in full as before, at most every `max_age` seconds.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import os
+import stat as stat_module
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from .content_backend import RootClass, _file_stamp, _root_stamp, _root_repo, _status_paths
+
+if TYPE_CHECKING:
+    from dulwich.index import ConflictedIndexEntry, IndexEntry
+    from dulwich.objects import ObjectID
+
+_GIT_RECHECK_SECONDS = 1.0
+
+
+def _entry_stat_matches(entry, st: os.stat_result, index_mtime_ns: int) -> bool:
+    """git's stat check: the index entry still describes the file. A file
+    modified in the same tick the index was written is never trusted (it may
+    have changed again after being hashed), so it is re-hashed instead."""
+    mtime = entry.mtime if isinstance(entry.mtime, tuple) else (int(entry.mtime), 0)
+    if st.st_mtime_ns >= index_mtime_ns:
+        return False
+    return entry.size == st.st_size & 0xFFFFFFFF and tuple(mtime) == divmod(st.st_mtime_ns, 1_000_000_000)
+
+
+class WorktreeStatus:
+    """Dirty set of one working clone; see the module docstring."""
+
+    def __init__(self, rc: RootClass):
+        self.rc = rc
+        self.root = rc.path
+        self._lock = threading.Lock()
+        self._dirty: set[str] | None = None  # None until the first full scan
+        self._snapshot: frozenset[str] = frozenset()
+        self._pending: set[str] = set()
+        self._scanned_at = 0.0
+        self._checked_at = 0.0
+        self._entries: dict[str, IndexEntry | ConflictedIndexEntry] = {}
+        self._entry_keys: list[str] = []
+        self._index_stamp: tuple | None = None
+        self._head_stamp: tuple | None = None
+        self._head_tree: ObjectID | None = None
+        self._ignore = None
+
+    def note(self, rels: Iterable[str]) -> None:
+        """Queue paths the watcher reported, for the next `paths()`."""
+        with self._lock:
+            if self._dirty is not None:
+                self._pending.update(rels)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._dirty = None
+            self._pending.clear()
+
+    def paths(self, *, live: bool, max_age: float = 0.0) -> frozenset[str]:
+        with self._lock:
+            now = time.monotonic()
+            if self._dirty is None or (not live and now - self._scanned_at >= max_age):
+                self._full_scan(now)
+            elif live:
+                try:
+                    self._refresh(now, self._dirty)
+                except Exception as exc:
+                    logger.debug("incremental git status for {} failed ({}); rescanning", self.root, exc)
+                    self._full_scan(now)
+            return self._snapshot
+
+    # -- full and incremental scans ----------------------------------------
+
+    def _full_scan(self, now: float) -> None:
+        self._pending.clear()
+        self._scanned_at = self._checked_at = now
+        try:
+            # Git state first: anything that moves it during the scan is caught by the next check.
+            self._head_stamp = _root_stamp(self.rc)
+            self._head_tree = self._current_head_tree()
+            self._load_index()
+            self._ignore = None
+            dirty = _status_paths(self.rc)
+        except Exception:
+            dirty = set()
+        self._dirty = set(dirty)
+        self._snapshot = frozenset(self._dirty)
+
+    def _refresh(self, now: float, dirty: set[str]) -> None:
+        changed, self._pending = self._pending, set()
+        if now - self._checked_at >= _GIT_RECHECK_SECONDS:
+            self._checked_at = now
+            changed |= self._git_changes()
+        if not changed:
+            return
+        if any(rel.rsplit("/", 1)[-1] == ".gitignore" for rel in changed):
+            self._full_scan(now)
+            return
+        for rel in self._expand(changed, dirty):
+            if self._is_dirty(rel):
+                dirty.add(rel)
+            else:
+                dirty.discard(rel)
+        if dirty != self._snapshot:
+            self._snapshot = frozenset(dirty)
+
+    def _git_changes(self) -> set[str]:
+        """Paths whose HEAD-tree or index entry moved since the last check."""
+        changed: set[str] = set()
+        head_stamp = _root_stamp(self.rc)
+        if head_stamp != self._head_stamp:
+            self._head_stamp = head_stamp
+            tree = self._current_head_tree()
+            if tree != self._head_tree:
+                from dulwich.diff_tree import tree_changes
+
+                repo = _root_repo(self.root)
+                for change in tree_changes(repo.object_store, self._head_tree, tree):
+                    changed.update(entry.path.decode() for entry in (change.old, change.new) if entry is not None and entry.path)
+                self._head_tree = tree
+        if _file_stamp(self.rc.git_dir / "index") != self._index_stamp:
+            previous = self._entries
+            self._load_index()
+            changed.update(rel for rel in previous.keys() | self._entries.keys() if previous.get(rel) != self._entries.get(rel))
+        return changed
+
+    def _current_head_tree(self) -> ObjectID | None:
+        from dulwich.objects import Commit
+
+        repo = _root_repo(self.root)
+        try:
+            commit = repo[repo.head()]
+        except KeyError:
+            return None  # unborn branch
+        return commit.tree if isinstance(commit, Commit) else None
+
+    def _load_index(self) -> None:
+        self._index_stamp = _file_stamp(self.rc.git_dir / "index")
+        entries: dict[str, IndexEntry | ConflictedIndexEntry] = {}
+        if self._index_stamp is not None:
+            for path, entry in _root_repo(self.root).open_index().items():
+                entries[path.decode()] = entry
+        self._entries = entries
+        self._entry_keys = sorted(entries)
+
+    def _expand(self, rels: set[str], dirty: set[str]) -> Iterator[str]:
+        """Each changed path, and for a folder (or a path that may have been
+        one) every file under it on disk, in the index or already dirty."""
+        seen: set[str] = set()
+        for rel in rels:
+            prefix = rel + "/"
+            found = [rel]
+            start = bisect.bisect_left(self._entry_keys, prefix)
+            for key in itertools.islice(self._entry_keys, start, None):
+                if not key.startswith(prefix):
+                    break
+                found.append(key)
+            found.extend(path for path in dirty if path.startswith(prefix))
+            folder = self.root / rel
+            if folder.is_dir() and not folder.is_symlink():
+                for current, dirs, files in os.walk(folder):
+                    dirs[:] = [name for name in dirs if name != ".git"]
+                    base = Path(current).relative_to(self.root).as_posix()
+                    found.extend(f"{base}/{name}" for name in files)
+            for path in found:
+                if path not in seen:
+                    seen.add(path)
+                    yield path
+
+    def _is_dirty(self, rel: str) -> bool:
+        from dulwich.errors import NotTreeError
+        from dulwich.index import ConflictedIndexEntry, blob_from_path_and_stat
+        from dulwich.object_store import tree_lookup_path
+
+        full = self.root / rel
+        try:
+            st = os.lstat(full)
+        except OSError:
+            st = None
+        if st is not None and stat_module.S_ISDIR(st.st_mode):
+            st = None  # a folder is never a dirty path itself; its files are expanded
+        entry = self._entries.get(rel)
+        head_sha = None
+        if self._head_tree is not None:
+            repo = _root_repo(self.root)
+            try:
+                mode, sha = tree_lookup_path(repo.object_store.__getitem__, self._head_tree, rel.encode())
+                head_sha = None if stat_module.S_ISDIR(mode) else sha  # a folder in HEAD: its files are expanded
+            except (KeyError, NotTreeError):
+                head_sha = None
+        if entry is None:
+            if head_sha is not None:
+                return True  # staged deletion
+            return st is not None and not self._ignored(rel)
+        if isinstance(entry, ConflictedIndexEntry) or entry.sha != head_sha:
+            return True  # conflicted or staged
+        if st is None:
+            return True  # deleted, not staged
+        if stat_module.S_ISDIR(entry.mode) or (entry.mode & 0o170000) == 0o160000:
+            return False  # submodule: judged by its recorded commit only
+        if _entry_stat_matches(entry, st, self._index_stamp[0] if self._index_stamp else 0):
+            return False
+        return blob_from_path_and_stat(os.fsencode(full), st).id != entry.sha
+
+    def _ignored(self, rel: str) -> bool:
+        if self._ignore is None:
+            from dulwich.ignore import IgnoreFilterManager
+
+            self._ignore = IgnoreFilterManager.from_repo(_root_repo(self.root))
+        return bool(self._ignore.is_ignored(rel))
+
+
+class WorktreeStatuses:
+    """One `WorktreeStatus` per working clone, fed by the `_ReloadHub`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trackers: dict[Path, WorktreeStatus] = {}
+        self._live = False
+
+    # -- watcher hooks -------------------------------------------------------
+
+    def attach(self) -> None:
+        """A watcher (re)started. Every tracker rescans once: changes made
+        while no watch was in place were never reported."""
+        with self._lock:
+            self._live = True
+            trackers = list(self._trackers.values())
+        for tracker in trackers:
+            tracker.invalidate()
+
+    def detach(self) -> None:
+        with self._lock:
+            self._live = False
+
+    def apply_changes(self, changes: Iterable[tuple[object, str]]) -> None:
+        with self._lock:
+            if not self._live:
+                return
+            trackers = list(self._trackers.values())
+        for tracker in trackers:
+            rels = []
+            for _, path in changes:
+                try:
+                    rel = Path(path).relative_to(tracker.root).as_posix()
+                except ValueError:
+                    continue
+                if rel != "." and ".git" not in rel.split("/"):
+                    rels.append(rel)
+            if rels:
+                tracker.note(rels)
+
+    # -- lookups -------------------------------------------------------------
+
+    def paths(self, rc: RootClass, max_age: float = 0.0) -> frozenset[str]:
+        with self._lock:
+            tracker = self._trackers.get(rc.path)
+            if tracker is None:
+                tracker = self._trackers[rc.path] = WorktreeStatus(rc)
+            tracker.rc = rc
+            live = self._live
+        return tracker.paths(live=live, max_age=max_age)
+
+
+_worktree_statuses = WorktreeStatuses()
+
+
+def worktree_statuses() -> WorktreeStatuses:
+    return _worktree_statuses